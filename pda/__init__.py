@@ -21,6 +21,8 @@ import logging
 from typing import NamedTuple, Literal
 
 from .client import *
+from .cache import *
+from .dispatcher import *
 from .appinfo import *
 from .user import *
 from .emoji import *
@@ -48,6 +50,8 @@ from .enums import *
 from .embeds import *
 from .mentions import *
 from .shard import *
+from .gateway import ResumeState, GatewayTraffic
+from .cluster import *
 from .player import *
 from .webhook import *
 from .voice_client import *
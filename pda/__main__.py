@@ -286,6 +286,87 @@ def add_newcog_args(subparser):
     parser.add_argument('--hide-commands', help='whether to hide all commands in the cog', action='store_true')
     parser.add_argument('--full', help='add all special methods as well', action='store_true')
 
+def bench_gateway(parser, args):
+    from pda.bench import gateway
+
+    if args.rounds < 1:
+        parser.error('--rounds must be at least 1')
+    if args.recording is not None and not Path(args.recording).is_file():
+        parser.error(f'could not find the recording {args.recording}')
+    try:
+        gateway.main(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+def bench_encoding(parser, args):
+    from pda.bench import encoding
+
+    if args.rounds < 1:
+        parser.error('--rounds must be at least 1')
+    if args.recording is not None and not Path(args.recording).is_file():
+        parser.error(f'could not find the recording {args.recording}')
+    try:
+        encoding.main(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+def bench_http(parser, args):
+    from pda.bench import http
+
+    if args.requests < 1 or args.concurrency < 1 or args.channels < 1 or args.guilds < 1 or args.connections < 1:
+        parser.error('--requests, --concurrency, --channels, --guilds and --connections must be at least 1')
+    try:
+        http.main(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+def add_bench_args(subparser):
+    parser = subparser.add_parser('bench', help='benchmarks the library without connecting to Discord')
+    parser.set_defaults(func=lambda parser, args: parser.print_help(), parser=parser)
+    benchmarks = parser.add_subparsers(dest='benchmark', title='benchmarks')
+
+    gateway = benchmarks.add_parser('gateway', help='replays gateway events through the websocket, state and dispatch')
+    gateway.set_defaults(func=bench_gateway, parser=gateway)
+    gateway.add_argument('--recording', help='a file of one gateway payload per line to replay instead of a synthetic session', metavar='<file>')
+    gateway.add_argument('--guilds', help='the number of guilds (default: 10)', type=int, default=10, metavar='<n>')
+    gateway.add_argument('--members', help='the number of members per guild (default: 2000)', type=int, default=2000, metavar='<n>')
+    gateway.add_argument('--channels', help='the number of channels per guild (default: 50)', type=int, default=50, metavar='<n>')
+    gateway.add_argument('--events', help='the number of events after connecting (default: 20000)', type=int, default=20000, metavar='<n>')
+    gateway.add_argument('--mix', help='the event mix (default: message_create=0.35,presence_update=0.55,typing_start=0.1)', metavar='<type=weight,...>')
+    gateway.add_argument('--seed', help='the seed of the synthetic session (default: 0)', type=int, default=0, metavar='<n>')
+    gateway.add_argument('--rounds', help='how many times to replay the events, the fastest counts (default: 3)', type=int, default=3, metavar='<n>')
+    gateway.add_argument('--no-handlers', help='do not register event handlers', action='store_true', dest='no_handlers')
+    gateway.add_argument('--lazy-dispatch', help='skip parsing events nothing listens to', action='store_true', dest='lazy_dispatch')
+    gateway.add_argument('--tracemalloc', help='replay once more under tracemalloc to measure the peak allocated memory', action='store_true')
+    gateway.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    encoding = benchmarks.add_parser('encoding', help='compares decoding gateway events sent as JSON and as ETF')
+    encoding.set_defaults(func=bench_encoding, parser=encoding)
+    encoding.add_argument('--recording', help='a file of one gateway payload per line to decode instead of a synthetic session', metavar='<file>')
+    encoding.add_argument('--guilds', help='the number of guilds (default: 1)', type=int, default=1, metavar='<n>')
+    encoding.add_argument('--members', help='the number of members per guild (default: 5000)', type=int, default=5000, metavar='<n>')
+    encoding.add_argument('--channels', help='the number of channels per guild (default: 100)', type=int, default=100, metavar='<n>')
+    encoding.add_argument('--events', help='the number of events after connecting (default: 2000)', type=int, default=2000, metavar='<n>')
+    encoding.add_argument('--mix', help='the event mix (default: message_create=0.35,presence_update=0.55,typing_start=0.1)', metavar='<type=weight,...>')
+    encoding.add_argument('--seed', help='the seed of the synthetic session (default: 0)', type=int, default=0, metavar='<n>')
+    encoding.add_argument('--rounds', help='how many times to decode the events, the fastest counts (default: 5)', type=int, default=5, metavar='<n>')
+    encoding.add_argument('--json', help='print the results as JSON', action='store_true')
+
+    http = benchmarks.add_parser('http', help='sends requests through the HTTP client to a local mock of the REST API')
+    http.set_defaults(func=bench_http, parser=http)
+    http.add_argument('--requests', help='the number of requests (default: 2000)', type=int, default=2000, metavar='<n>')
+    http.add_argument('--concurrency', help='the number of requests in flight at once (default: 100)', type=int, default=100, metavar='<n>')
+    http.add_argument('--channels', help='the number of channels the requests are spread over (default: 100)', type=int, default=100, metavar='<n>')
+    http.add_argument('--guilds', help='the number of guilds the member requests are spread over (default: 20)', type=int, default=20, metavar='<n>')
+    http.add_argument('--connections', help='the connection pool size (default: 100)', type=int, default=100, metavar='<n>')
+    http.add_argument('--mix', help='the request mix (default: send_message=0.4,edit_message=0.15,get_member=0.2,get_channel=0.1,interaction_response=0.15)', metavar='<type=weight,...>')
+    http.add_argument('--seed', help='the seed of the request mix (default: 0)', type=int, default=0, metavar='<n>')
+    http.add_argument('--bucket-limit', help='the requests allowed per bucket window (default: 5)', type=int, default=5, metavar='<n>', dest='bucket_limit')
+    http.add_argument('--bucket-window', help='the length of a bucket window in seconds (default: 1.0)', type=float, default=1.0, metavar='<seconds>', dest='bucket_window')
+    http.add_argument('--global-limit', help='the requests allowed per second, 0 disables it (default: 500)', type=int, default=500, metavar='<n>', dest='global_limit')
+    http.add_argument('--latency', help='the seconds the mock takes to respond (default: 0)', type=float, default=0.0, metavar='<seconds>')
+    http.add_argument('--json', help='print the results as JSON', action='store_true')
+
 def parse_args():
     parser = argparse.ArgumentParser(prog='discord', description='Tools for helping with pda.py')
     parser.add_argument('-v', '--version', action='store_true', help='shows the library version')
@@ -294,11 +375,12 @@ def parse_args():
     subparser = parser.add_subparsers(dest='subcommand', title='subcommands')
     add_newbot_args(subparser)
     add_newcog_args(subparser)
+    add_bench_args(subparser)
     return parser, parser.parse_args()
 
 def main():
     parser, args = parse_args()
-    args.func(parser, args)
+    args.func(getattr(args, 'parser', parser), args)
 
 if __name__ == '__main__':
     main()
@@ -26,7 +26,7 @@ from __future__ import annotations
 
 import io
 import os
-from typing import Any, Literal, Optional, TYPE_CHECKING, Tuple, Union
+from typing import Any, AsyncIterator, Literal, Optional, TYPE_CHECKING, Tuple, Union
 from .errors import DiscordException
 from .errors import InvalidArgument
 from . import utils
@@ -73,22 +73,78 @@ class AssetMixin:
         if self._state is None:
             raise DiscordException('Invalid state (no ConnectionState provided)')
 
-        return await self._state.http.get_from_cdn(self.url)
+        return await self._state.http.get_asset_from_cdn(self.url)
 
-    async def save(self, fp: Union[str, bytes, os.PathLike, io.BufferedIOBase], *, seek_begin: bool = True) -> int:
+    def stream(self, *, chunk_size: int = 65536, offset: int = 0) -> AsyncIterator[bytes]:
+        """Downloads the content of this asset in chunks, without keeping all of it in memory.
+
+        .. versionadded:: 2.0
+
+        Example
+        --------
+
+        .. code-block:: python3
+
+            async for chunk in asset.stream():
+                fp.write(chunk)
+
+        Parameters
+        ----------
+        chunk_size: :class:`int`
+            The maximum size of each chunk in bytes.
+        offset: :class:`int`
+            The byte to start downloading from, to resume a partial download.
+            If the offset is at or past the end, nothing is downloaded.
+
+        Raises
+        ------
+        DiscordException
+            There was no internal connection state.
+        HTTPException
+            Downloading the asset failed.
+        NotFound
+            The asset was deleted.
+
+        Yields
+        -------
+        :class:`bytes`
+            A chunk of the content of the asset.
+        """
+        if self._state is None:
+            raise DiscordException('Invalid state (no ConnectionState provided)')
+
+        return self._state.http.stream_from_cdn(self.url, chunk_size=chunk_size, offset=offset)
+
+    async def save(
+        self,
+        fp: Union[str, bytes, os.PathLike, io.BufferedIOBase, int],
+        *,
+        seek_begin: bool = True,
+        chunk_size: Optional[int] = None,
+        resume: bool = False,
+    ) -> int:
         """|coro|
 
         Saves this asset into a file-like object.
 
+        .. versionchanged:: 2.0
+            Added ``chunk_size`` and ``resume`` and support for file descriptors.
+
         Parameters
         ----------
-        fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
-            The file-like object to save this attachment to or the filename
-            to use. If a filename is passed then a file is created with that
-            filename and used instead.
+        fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`, :class:`int`]
+            The file-like object to save this attachment to, the filename
+            to use or a file descriptor. If a filename is passed then a file
+            is created with that filename and used instead.
         seek_begin: :class:`bool`
             Whether to seek to the beginning of the file after saving is
             successfully done.
+        chunk_size: Optional[:class:`int`]
+            If given, the asset is streamed into ``fp`` in chunks of this size
+            instead of being read into memory first. See :meth:`stream`.
+        resume: :class:`bool`
+            Whether to keep what ``fp`` already holds and only download the rest,
+            e.g. after an interrupted download. This streams the asset.
 
         Raises
         ------
@@ -105,6 +161,11 @@ class AssetMixin:
             The number of bytes written.
         """
 
+        if chunk_size is not None or resume or isinstance(fp, int):
+            chunk_size = chunk_size or 65536
+            stream = lambda offset: self.stream(chunk_size=chunk_size, offset=offset)
+            return await utils._save_stream(fp, stream, seek_begin=seek_begin, resume=resume)
+
         data = await self.read()
         if isinstance(fp, io.BufferedIOBase):
             written = fp.write(data)
@@ -0,0 +1,127 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from .. import etf, utils
+from .gateway import Compressor, SyntheticSession, load_recording, parse_mix
+
+__all__ = ()
+
+# Compares decoding the same gateway events sent as JSON and as ETF, both
+# zlib-stream compressed. Only decompression and decoding are measured.
+
+ZLIB_SUFFIX = b'\x00\x00\xff\xff'
+
+
+def _is_snowflake_key(key: str) -> bool:
+    return key == 'id' or key.endswith('_id') or key == 'roles'
+
+
+def to_etf_payload(obj: Any, key: str = '') -> Any:
+    """Turns snowflakes into integers, which is how the gateway sends them over ETF."""
+    if isinstance(obj, dict):
+        return {k: to_etf_payload(v, k) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [to_etf_payload(v, key) for v in obj]
+    if isinstance(obj, str) and _is_snowflake_key(key) and obj.isdigit():
+        return int(obj)
+    return obj
+
+
+def _encode_etf(payload: Dict[str, Any]) -> bytes:
+    return etf.dumps(to_etf_payload(payload))
+
+
+def decode(frames: List[bytes], loads: Callable[[bytes], Any]) -> float:
+    decompressor = zlib.decompressobj()
+    start = time.perf_counter()
+    for frame in frames:
+        if not frame.endswith(ZLIB_SUFFIX):
+            raise ValueError('frame does not end a zlib-stream message')
+        loads(decompressor.decompress(frame))
+    return time.perf_counter() - start
+
+
+def run(*, session: Optional[SyntheticSession] = None, recording: Optional[str] = None, rounds: int = 5) -> Dict[str, Any]:
+    """Decodes a session in both encodings and returns the measurements.
+
+    Each encoding is decoded ``rounds`` times, of which the fastest counts.
+    """
+    if recording is not None:
+        connect, stream = load_recording(recording)
+    else:
+        session = session or SyntheticSession()
+        connect, stream = session.connect(), session.stream()
+    payloads = connect + stream
+
+    results: Dict[str, Any] = {
+        'events': len(payloads),
+        'decoder': 'orjson' if utils.HAS_ORJSON else 'json',
+    }
+    for name, encode, loads in (('json', None, utils._from_json), ('etf', _encode_etf, etf.loads)):
+        compressor = Compressor() if encode is None else Compressor(encode)
+        frames = compressor.frames(payloads)
+        best = min(decode(frames, loads) for _ in range(rounds))
+        results[name] = {
+            'bytes': sum(map(len, frames)),
+            'seconds': best,
+            'events_per_second': len(frames) / best if best else 0.0,
+        }
+
+    results['etf_time_ratio'] = results['etf']['seconds'] / results['json']['seconds'] if results['json']['seconds'] else 0.0
+    return results
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [f'{results["events"]} events, JSON decoder: {results["decoder"]}']
+    for name in ('json', 'etf'):
+        result = results[name]
+        lines.append(
+            f'{name + "+zlib":<10} {result["bytes"] / 1e6:8.2f} MB on the wire {result["seconds"] * 1e3:10.1f} ms '
+            f'{result["events_per_second"]:12.0f} events/s'
+        )
+    lines.append(f'etf takes {results["etf_time_ratio"]:.2f}x the time of json')
+    return '\n'.join(lines)
+
+
+def main(args: Any) -> None:
+    session = SyntheticSession(
+        guilds=args.guilds,
+        members=args.members,
+        channels=args.channels,
+        events=args.events,
+        mix=parse_mix(args.mix) if args.mix else None,
+        seed=args.seed,
+    )
+    results = run(session=session, recording=args.recording, rounds=args.rounds)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_results(results))
@@ -0,0 +1,434 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .. import utils
+from ..client import Client
+from ..flags import Intents
+from ..gateway import DiscordWebSocket, GatewayTraffic
+
+__all__ = ()
+
+# The gateway → state → dispatch pipeline is fed zlib-stream compressed frames
+# through a DiscordWebSocket whose socket never sends anything anywhere.
+
+DEFAULT_MIX = {'MESSAGE_CREATE': 0.35, 'PRESENCE_UPDATE': 0.55, 'TYPING_START': 0.1}
+
+_EPOCH = 175928847299117063
+
+
+def _snowflake(n: int) -> str:
+    return str(_EPOCH + n * 4194304)
+
+
+def _user(n: int) -> Dict[str, Any]:
+    return {'id': _snowflake(n), 'username': f'user{n}', 'discriminator': f'{n % 10000:04}', 'avatar': None, 'public_flags': 0}
+
+
+def _guild_id(guild: int) -> str:
+    return _snowflake(guild * 100000)
+
+
+def _channel_id(guild: int, channel: int) -> str:
+    return _snowflake(guild * 100000 + 100 + channel)
+
+
+def _member_id(guild: int, member: int) -> int:
+    return guild * 100000 + 1000 + member
+
+
+def _activity(n: int) -> Dict[str, Any]:
+    return {'name': f'game {n % 50}', 'type': 0, 'created_at': 1625000000000 + n, 'id': 'ec0b28a579ecb4bd'}
+
+
+def _presence(guild: int, member: int, n: int) -> Dict[str, Any]:
+    status = ('online', 'idle', 'dnd')[n % 3]
+    return {
+        'user': {'id': _snowflake(_member_id(guild, member))},
+        'guild_id': _guild_id(guild),
+        'status': status,
+        'activities': [_activity(n)] if n % 2 else [],
+        'client_status': {'desktop': status},
+    }
+
+
+class SyntheticSession:
+    """Generates the gateway payloads of a bot in ``guilds`` guilds of ``members`` members each.
+
+    The session starts with READY and a GUILD_CREATE per guild, followed by
+    ``events`` events picked at random according to ``mix``.
+    """
+
+    def __init__(self, *, guilds: int = 10, members: int = 2000, channels: int = 50, events: int = 20000, mix: Optional[Dict[str, float]] = None, seed: int = 0):
+        self.guilds = guilds
+        self.members = members
+        self.channels = channels
+        self.events = events
+        self.mix = mix or DEFAULT_MIX
+        self.seed = seed
+
+    def ready(self) -> Dict[str, Any]:
+        return {
+            'op': 0,
+            's': 1,
+            't': 'READY',
+            'd': {
+                'v': 9,
+                'user': {**_user(1), 'bot': True, 'verified': True, 'mfa_enabled': False, 'flags': 0},
+                'guilds': [{'id': _guild_id(g), 'unavailable': True} for g in range(self.guilds)],
+                'session_id': 'b' * 32,
+                'application': {'id': _snowflake(1), 'flags': 0},
+                '_trace': ['["gateway-prd-main-bench",{"micros":0}]'],
+            },
+        }
+
+    def guild_create(self, guild: int) -> Dict[str, Any]:
+        members = self.members
+        return {
+            'op': 0,
+            's': guild + 2,
+            't': 'GUILD_CREATE',
+            'd': {
+                'id': _guild_id(guild),
+                'name': f'benchmark {guild}',
+                'unavailable': False,
+                'member_count': members,
+                'large': members > 250,
+                'owner_id': _snowflake(_member_id(guild, 0)),
+                'features': [],
+                'emojis': [],
+                'stickers': [],
+                'threads': [],
+                'voice_states': [],
+                'stage_instances': [],
+                'roles': [
+                    {'id': _snowflake(guild * 100000 + 10 + i), 'name': f'role{i}', 'permissions': '104324673', 'position': i, 'color': 0, 'hoist': False, 'managed': False, 'mentionable': False}
+                    for i in range(20)
+                ],
+                'channels': [
+                    {'id': _channel_id(guild, i), 'type': 0, 'name': f'channel-{i}', 'position': i, 'parent_id': None, 'topic': 'a channel', 'nsfw': False, 'permission_overwrites': []}
+                    for i in range(self.channels)
+                ],
+                'members': [
+                    {'user': _user(_member_id(guild, i)), 'roles': [_snowflake(guild * 100000 + 10 + i % 20)], 'joined_at': '2021-01-01T00:00:00+00:00', 'nick': None, 'deaf': False, 'mute': False}
+                    for i in range(members)
+                ],
+                # about a third of the members are online
+                'presences': [_presence(guild, i, i) for i in range(0, members, 3)],
+            },
+        }
+
+    def _event(self, kind: str, n: int, rng: random.Random) -> Dict[str, Any]:
+        guild = rng.randrange(self.guilds)
+        member = rng.randrange(self.members)
+        if kind == 'MESSAGE_CREATE':
+            return {
+                'id': _snowflake(10**7 + n),
+                'channel_id': _channel_id(guild, rng.randrange(self.channels)),
+                'guild_id': _guild_id(guild),
+                'author': _user(_member_id(guild, member)),
+                'member': {'roles': [], 'joined_at': '2021-01-01T00:00:00+00:00', 'nick': None, 'deaf': False, 'mute': False},
+                'content': f'message number {n} with some text in it',
+                'timestamp': '2021-01-01T00:00:00+00:00',
+                'edited_timestamp': None,
+                'tts': False,
+                'mention_everyone': False,
+                'mentions': [],
+                'mention_roles': [],
+                'attachments': [],
+                'embeds': [],
+                'pinned': False,
+                'type': 0,
+            }
+        if kind == 'PRESENCE_UPDATE':
+            return _presence(guild, member, n)
+        if kind == 'TYPING_START':
+            return {
+                'channel_id': _channel_id(guild, rng.randrange(self.channels)),
+                'guild_id': _guild_id(guild),
+                'user_id': _snowflake(_member_id(guild, member)),
+                'timestamp': 1625000000 + n,
+                'member': {'user': _user(_member_id(guild, member)), 'roles': [], 'joined_at': '2021-01-01T00:00:00+00:00', 'deaf': False, 'mute': False},
+            }
+        raise ValueError(f'unsupported event type {kind!r} in the mix')
+
+    def connect(self) -> List[Dict[str, Any]]:
+        return [self.ready()] + [self.guild_create(g) for g in range(self.guilds)]
+
+    def stream(self, round: int = 0) -> List[Dict[str, Any]]:
+        rng = random.Random(self.seed + round)
+        kinds, weights = zip(*self.mix.items())
+        seq = self.guilds + 2 + round * self.events
+        return [
+            {'op': 0, 's': seq + n, 't': kind, 'd': self._event(kind, n, rng)}
+            for n, kind in enumerate(rng.choices(kinds, weights, k=self.events))
+        ]
+
+
+def load_recording(path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Loads a recording of one gateway payload per line, such as the messages
+    passed to :func:`on_socket_raw_receive` on an uncompressed connection.
+
+    Everything up to the last GUILD_CREATE that directly follows READY is
+    the connect phase, the rest is the stream.
+    """
+    with open(path, encoding='utf-8') as fp:
+        payloads = [json.loads(line) for line in fp if line.strip()]
+
+    split = 0
+    for index, payload in enumerate(payloads):
+        if payload.get('t') in ('READY', 'GUILD_CREATE') or payload.get('op') != 0:
+            split = index + 1
+        else:
+            break
+    return payloads[:split], payloads[split:]
+
+
+def _encode_json(payload: Dict[str, Any]) -> bytes:
+    return utils._to_json(payload).encode('utf-8')
+
+
+class Compressor:
+    # one zlib stream for the whole connection, like the gateway's zlib-stream
+    def __init__(self, encode: Callable[[Dict[str, Any]], bytes] = _encode_json) -> None:
+        self._compressor = zlib.compressobj()
+        self._encode = encode
+
+    def frames(self, payloads: Iterable[Dict[str, Any]]) -> List[bytes]:
+        compressor = self._compressor
+        encode = self._encode
+        return [compressor.compress(encode(payload)) + compressor.flush(zlib.Z_SYNC_FLUSH) for payload in payloads]
+
+
+class FakeSocket:
+    # stands in for the aiohttp websocket, nothing is ever received from it
+    closed = False
+    close_code = None
+
+    async def send_str(self, data: str) -> None:
+        pass
+
+    async def send_bytes(self, data: bytes) -> None:
+        pass
+
+    async def close(self, *, code: int = 1000, message: bytes = b'') -> bool:
+        self.closed = True
+        return True
+
+
+def attach(client: Client) -> DiscordWebSocket:
+    # the parts of DiscordWebSocket.from_client that do not need a connection
+    ws = DiscordWebSocket(FakeSocket(), loop=client.loop)
+    state = client._connection
+    ws.token = 'bench'
+    ws._connection = state
+    ws._discord_parsers = state.parsers
+    ws._dispatch = client.dispatch
+    ws.gateway = 'wss://gateway.invalid'
+    ws.call_hooks = state.call_hooks
+    ws._initial_identify = True
+    ws.shard_id = None
+    ws.shard_count = None
+    ws._traffic = client._gateway_traffic.setdefault(None, GatewayTraffic())
+    ws._max_heartbeat_timeout = state.heartbeat_timeout
+    client.ws = ws
+    return ws
+
+
+async def replay(ws: DiscordWebSocket, frames: List[bytes]) -> float:
+    # The event loop runs once per frame, as it does between two receives,
+    # so the tasks of the dispatched handlers run as part of the replay.
+    start = time.perf_counter()
+    for frame in frames:
+        await ws.received_message(frame)
+        await asyncio.sleep(0)
+    return time.perf_counter() - start
+
+
+def peak_rss() -> Optional[int]:
+    """Returns the peak resident set size of the process in bytes, if it can be measured."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes everywhere but macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+async def run(
+    *,
+    session: Optional[SyntheticSession] = None,
+    recording: Optional[str] = None,
+    rounds: int = 3,
+    handlers: bool = True,
+    trace: bool = False,
+    **options: Any,
+) -> Dict[str, Any]:
+    """Replays a session and returns the measurements.
+
+    The connect phase is replayed once, the stream ``rounds`` times, of which
+    the fastest counts. With ``trace`` the stream is replayed once more under
+    :mod:`tracemalloc` to measure the peak memory it allocates.
+    """
+    if recording is not None:
+        connect, stream = load_recording(recording)
+        streams = [stream] * (rounds + trace)
+    else:
+        session = session or SyntheticSession()
+        connect = session.connect()
+        streams = [session.stream(r) for r in range(rounds + trace)]
+
+    options.setdefault('intents', Intents.all())
+    options.setdefault('chunk_guilds_at_startup', False)
+    options.setdefault('guild_ready_timeout', 0.01)
+    client = Client(**options)
+    if handlers:
+        async def handler(*args: Any) -> None:
+            pass
+
+        for event in ('on_message', 'on_presence_update', 'on_typing', 'on_guild_available'):
+            setattr(client, event, handler)
+
+    # everything is compressed up front so only decompression is measured
+    compressor = Compressor()
+    connect_frames = compressor.frames(connect)
+    stream_frames = [compressor.frames(stream) for stream in streams]
+    ws = attach(client)
+
+    connect_time = await replay(ws, connect_frames)
+    if any(payload.get('t') == 'READY' for payload in connect):
+        await asyncio.wait_for(client.wait_until_ready(), timeout=30.0)
+
+    results: Dict[str, Any] = {
+        'decoder': 'orjson' if utils.HAS_ORJSON else 'json',
+        'connect': {
+            'events': len(connect_frames),
+            'seconds': connect_time,
+            'events_per_second': len(connect_frames) / connect_time if connect_time else 0.0,
+        },
+        'guilds': len(client._connection._guilds),
+        'members': sum(guild.member_count or 0 for guild in client.guilds),
+        'cached_members': sum(len(guild._members) for guild in client.guilds),
+    }
+
+    best = float('inf')
+    blocks = 0
+    collections = [0, 0, 0]
+    for frames in stream_frames[:rounds]:
+        gc_before = [stat['collections'] for stat in gc.get_stats()]
+        blocks_before = sys.getallocatedblocks()
+        elapsed = await replay(ws, frames)
+        blocks = sys.getallocatedblocks() - blocks_before
+        collections = [stat['collections'] - before for stat, before in zip(gc.get_stats(), gc_before)]
+        best = min(best, elapsed)
+
+    events = len(stream_frames[0]) if stream_frames else 0
+    results['stream'] = {
+        'events': events,
+        'seconds': best,
+        'events_per_second': events / best if best else 0.0,
+        'retained_blocks': blocks,
+        'gc_collections': collections,
+    }
+
+    if trace:
+        tracemalloc.start()
+        try:
+            await replay(ws, stream_frames[-1])
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        results['stream']['traced_peak_bytes'] = peak
+
+    traffic = client.gateway_traffic
+    results['received_bytes'] = traffic.received
+    results['decompressed_bytes'] = traffic.decompressed
+    results['peak_rss_bytes'] = peak_rss()
+    await client.close()
+    return results
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for entry in value.split(','):
+        kind, _, weight = entry.partition('=')
+        mix[kind.strip().upper()] = float(weight or 1)
+    return mix
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    connect = results['connect']
+    stream = results['stream']
+    mb = 1024 * 1024
+    lines = [
+        f'JSON decoder: {results["decoder"]}',
+        f'guilds: {results["guilds"]}, members: {results["members"]} ({results["cached_members"]} cached)',
+        f'connect: {connect["events"]:>8} events {connect["seconds"] * 1e3:10.1f} ms {connect["events_per_second"]:12.0f} events/s',
+        f'stream:  {stream["events"]:>8} events {stream["seconds"] * 1e3:10.1f} ms {stream["events_per_second"]:12.0f} events/s',
+        f'retained blocks: {stream["retained_blocks"]}, gc collections (gen 0/1/2): {"/".join(map(str, stream["gc_collections"]))}',
+    ]
+    if 'traced_peak_bytes' in stream:
+        lines.append(f'traced peak during the stream: {stream["traced_peak_bytes"] / mb:.2f} MiB')
+    lines.append(f'received: {results["received_bytes"] / mb:.2f} MiB, decompressed: {results["decompressed_bytes"] / mb:.2f} MiB')
+    if results['peak_rss_bytes'] is not None:
+        lines.append(f'peak RSS: {results["peak_rss_bytes"] / mb:.1f} MiB')
+    return '\n'.join(lines)
+
+
+def main(args: Any) -> None:
+    session = SyntheticSession(
+        guilds=args.guilds,
+        members=args.members,
+        channels=args.channels,
+        events=args.events,
+        mix=parse_mix(args.mix) if args.mix else None,
+        seed=args.seed,
+    )
+    results = asyncio.run(
+        run(
+            session=session,
+            recording=args.recording,
+            rounds=args.rounds,
+            handlers=not args.no_handlers,
+            trace=args.tracemalloc,
+            lazy_dispatch=args.lazy_dispatch,
+        )
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_results(results))
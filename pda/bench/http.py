@@ -0,0 +1,225 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+from ..errors import HTTPException
+from ..http import HTTPClient, RequestStats
+from .mock import MockDiscord
+
+__all__ = ()
+
+# HTTPClient.request is driven against MockDiscord, so the ratelimit
+# handling can be measured without touching Discord.
+
+DEFAULT_MIX = {
+    'send_message': 0.4,
+    'edit_message': 0.15,
+    'get_member': 0.2,
+    'get_channel': 0.1,
+    'interaction_response': 0.15,
+}
+
+_EPOCH = 175928847299117063
+
+# (client, rng, channels, guilds)
+_Request = Callable[[HTTPClient, random.Random, int, int], Awaitable[Any]]
+
+
+def _snowflake(n: int) -> int:
+    return _EPOCH + n * 4194304
+
+
+def _channel(rng: random.Random, channels: int) -> int:
+    return _snowflake(100 + rng.randrange(channels))
+
+
+async def _send_message(http: HTTPClient, rng: random.Random, channels: int, guilds: int) -> Any:
+    return await http.send_message(_channel(rng, channels), 'benchmark message')
+
+
+async def _edit_message(http: HTTPClient, rng: random.Random, channels: int, guilds: int) -> Any:
+    return await http.edit_message(_channel(rng, channels), _snowflake(10**6 + rng.randrange(10**6)), content='edited')
+
+
+async def _get_member(http: HTTPClient, rng: random.Random, channels: int, guilds: int) -> Any:
+    return await http.get_member(_snowflake(rng.randrange(guilds)), _snowflake(1000 + rng.randrange(10**5)))
+
+
+async def _get_channel(http: HTTPClient, rng: random.Random, channels: int, guilds: int) -> Any:
+    return await http.get_channel(_channel(rng, channels))
+
+
+async def _interaction_response(http: HTTPClient, rng: random.Random, channels: int, guilds: int) -> Any:
+    # every interaction is answered once, like the real thing
+    interaction_id = _snowflake(10**7 + rng.randrange(10**9))
+    return await http.create_interaction_response(
+        interaction_id,
+        f'token{interaction_id}',
+        # CHANNEL_MESSAGE_WITH_SOURCE
+        type=4,  # type: ignore
+        data={'content': 'pong'},
+    )
+
+
+REQUESTS: Dict[str, _Request] = {
+    'send_message': _send_message,
+    'edit_message': _edit_message,
+    'get_member': _get_member,
+    'get_channel': _get_channel,
+    'interaction_response': _interaction_response,
+}
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def run(
+    *,
+    requests: int = 2000,
+    concurrency: int = 100,
+    channels: int = 100,
+    guilds: int = 20,
+    mix: Optional[Dict[str, float]] = None,
+    connections: int = 100,
+    seed: int = 0,
+    **mock_options: Any,
+) -> Dict[str, Any]:
+    """Sends ``requests`` requests picked according to ``mix`` through a :class:`HTTPClient`,
+    ``concurrency`` at a time, and returns the measurements.
+
+    The keyword arguments left over are passed to :class:`~pda.bench.mock.MockDiscord`.
+    """
+    mix = mix or DEFAULT_MIX
+    for kind in mix:
+        if kind not in REQUESTS:
+            raise ValueError(f'unsupported request type {kind!r} in the mix, expected one of {", ".join(REQUESTS)}')
+
+    rng = random.Random(seed)
+    kinds, weights = zip(*mix.items())
+    todo = iter(rng.choices(kinds, weights, k=requests))
+    latencies: Dict[str, List[float]] = {kind: [] for kind in kinds}
+    errors: Dict[str, int] = {}
+
+    async def worker() -> None:
+        for kind in todo:
+            start = time.perf_counter()
+            try:
+                await REQUESTS[kind](http, rng, channels, guilds)
+            except HTTPException as exc:
+                key = f'{kind} {exc.status}'
+                errors[key] = errors.get(key, 0) + 1
+            latencies[kind].append(time.perf_counter() - start)
+
+    async with MockDiscord(**mock_options) as mock:
+        http = HTTPClient(aiohttp.TCPConnector(limit=connections), loop=asyncio.get_running_loop())
+        try:
+            await http.static_login('bench')
+            mock.requests = 0
+            # the login does not count
+            stats = http.stats = RequestStats()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+        finally:
+            await http.close()
+
+    everything = [latency for values in latencies.values() for latency in values]
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'requests_per_second': requests / elapsed if elapsed else 0.0,
+        'attempts': stats.requests,
+        'ratelimited': stats.ratelimited,
+        'global_ratelimited': stats.global_ratelimited,
+        'ratelimit_wait_seconds': stats.ratelimit_wait,
+        'server_requests': mock.requests,
+        'server_429s': mock.ratelimited,
+        'errors': errors,
+        'latency': {
+            kind: {'p50': _percentile(values, 50), 'p99': _percentile(values, 99), 'count': len(values)}
+            for kind, values in [('all', everything), *latencies.items()]
+        },
+    }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for entry in value.split(','):
+        kind, _, weight = entry.partition('=')
+        mix[kind.strip().lower()] = float(weight or 1)
+    return mix
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [
+        f'{results["requests"]} requests, {results["concurrency"]} at a time: {results["seconds"] * 1e3:.1f} ms, '
+        f'{results["requests_per_second"]:.0f} requests/s',
+        f'attempts: {results["attempts"]}, 429s: {results["ratelimited"]} ({results["global_ratelimited"]} global), '
+        f'server saw {results["server_requests"]} requests and sent {results["server_429s"]} 429s',
+        f'waiting on ratelimits: {results["ratelimit_wait_seconds"]:.2f} s in total, '
+        f'{results["ratelimit_wait_seconds"] / max(results["attempts"], 1) * 1e3:.2f} ms per attempt',
+        'latency:',
+    ]
+    for kind, latency in results['latency'].items():
+        lines.append(f'  {kind:<22} {latency["count"]:>7} {latency["p50"] * 1e3:9.2f} ms p50 {latency["p99"] * 1e3:9.2f} ms p99')
+    for key, count in results['errors'].items():
+        lines.append(f'error {key}: {count}')
+    return '\n'.join(lines)
+
+
+def main(args: Any) -> None:
+    results = asyncio.run(
+        run(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            channels=args.channels,
+            guilds=args.guilds,
+            mix=parse_mix(args.mix) if args.mix else None,
+            connections=args.connections,
+            seed=args.seed,
+            bucket_limit=args.bucket_limit,
+            bucket_window=args.bucket_window,
+            global_limit=args.global_limit or None,
+            latency=args.latency,
+        )
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_results(results))
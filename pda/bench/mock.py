@@ -0,0 +1,352 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from aiohttp import web
+
+from ..http import Route
+
+__all__ = ()
+
+_Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+_EPOCH = 175928847299117063
+
+# Interaction responses do not count towards the global ratelimit
+_GLOBAL_EXEMPT = ('/interactions/', '/webhooks/')
+# the route parameters Discord keeps separate ratelimit buckets for
+_MAJOR_PARAMETERS = ('channel_id', 'guild_id', 'webhook_id', 'webhook_token', 'interaction_id', 'interaction_token')
+
+
+def _json_response(payload: Any, *, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    # Discord sends the content type without a charset, which is what HTTPClient expects
+    response = web.Response(body=json.dumps(payload).encode('utf-8'), status=status, headers=headers)
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+
+class _Bucket:
+    __slots__ = ('remaining', 'reset_at')
+
+    def __init__(self) -> None:
+        self.remaining: int = 0
+        self.reset_at: float = 0.0
+
+
+class MockDiscord:
+    """An in-process stand-in for the Discord REST API.
+
+    Every route has its own ratelimit bucket per major parameter, allowing
+    ``bucket_limit`` requests per ``bucket_window`` seconds, and all requests
+    but interaction responses share a global limit of ``global_limit`` requests
+    per second. Responses carry the same ``X-RateLimit-*`` headers Discord sends
+    and exceeding a limit returns the same 429s, with ``Retry-After``.
+
+    While used as an async context manager, :class:`~pda.http.Route` points at
+    the mock instead of Discord.
+    """
+
+    def __init__(
+        self,
+        *,
+        bucket_limit: int = 5,
+        bucket_window: float = 5.0,
+        global_limit: Optional[int] = 50,
+        latency: float = 0.0,
+        host: str = '127.0.0.1',
+    ) -> None:
+        self.bucket_limit: int = bucket_limit
+        self.bucket_window: float = bucket_window
+        self.global_limit: Optional[int] = global_limit
+        self.latency: float = latency
+        self.host: str = host
+        self.port: Optional[int] = None
+
+        self.requests: int = 0
+        self.ratelimited: int = 0
+        self.global_ratelimited: int = 0
+
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._global: _Bucket = _Bucket()
+        self._ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self._base: Optional[str] = None
+
+        self.app = app = web.Application(middlewares=[self._ratelimit])
+        app.router.add_get('/api/v8/users/@me', self.get_me)
+        app.router.add_get('/api/v8/gateway', self.get_gateway)
+        app.router.add_get('/api/v8/gateway/bot', self.get_gateway)
+
+        app.router.add_get('/api/v8/channels/{channel_id}', self.get_channel)
+        app.router.add_patch('/api/v8/channels/{channel_id}', self.edit_channel)
+        app.router.add_post('/api/v8/channels/{channel_id}/typing', self.no_content)
+        app.router.add_get('/api/v8/channels/{channel_id}/messages', self.get_messages)
+        app.router.add_post('/api/v8/channels/{channel_id}/messages', self.create_message)
+        app.router.add_get('/api/v8/channels/{channel_id}/messages/{message_id}', self.get_message)
+        app.router.add_patch('/api/v8/channels/{channel_id}/messages/{message_id}', self.edit_message)
+        app.router.add_delete('/api/v8/channels/{channel_id}/messages/{message_id}', self.no_content)
+
+        app.router.add_get('/api/v8/guilds/{guild_id}/members', self.get_members)
+        app.router.add_get('/api/v8/guilds/{guild_id}/members/{user_id}', self.get_member)
+        app.router.add_patch('/api/v8/guilds/{guild_id}/members/{user_id}', self.edit_member)
+        app.router.add_delete('/api/v8/guilds/{guild_id}/members/{user_id}', self.no_content)
+
+        app.router.add_post('/api/v8/interactions/{interaction_id}/{interaction_token}/callback', self.no_content)
+        app.router.add_post('/api/v8/webhooks/{webhook_id}/{webhook_token}', self.create_followup)
+        app.router.add_get('/api/v8/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}', self.get_webhook_message)
+        app.router.add_patch('/api/v8/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}', self.edit_webhook_message)
+        app.router.add_delete('/api/v8/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}', self.no_content)
+
+    @property
+    def url(self) -> str:
+        """The base URL of the API, the equivalent of ``https://discord.com/api/v8``."""
+        return f'http://{self.host}:{self.port}/api/v8'
+
+    async def start(self) -> None:
+        self._runner = runner = web.AppRunner(self.app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # type: ignore
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> MockDiscord:
+        await self.start()
+        self._base = Route.BASE
+        Route.BASE = self.url
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        if self._base is not None:
+            Route.BASE = self._base
+            self._base = None
+        await self.close()
+
+    # ratelimits
+
+    def _take(self, bucket: _Bucket, limit: int, window: float, now: float) -> Optional[float]:
+        # returns the seconds until the bucket resets if it is exhausted
+        if bucket.reset_at <= now:
+            bucket.reset_at = now + window
+            bucket.remaining = limit
+        if bucket.remaining == 0:
+            return bucket.reset_at - now
+        bucket.remaining -= 1
+        return None
+
+    def _too_many_requests(self, retry_after: float, *, is_global: bool, headers: Dict[str, str]) -> web.Response:
+        headers['Retry-After'] = str(math.ceil(retry_after))
+        headers['Via'] = '1.1 google'
+        headers['X-RateLimit-Scope'] = 'global' if is_global else 'user'
+        if is_global:
+            headers['X-RateLimit-Global'] = 'true'
+        payload = {'message': 'You are being rate limited.', 'retry_after': round(retry_after, 3), 'global': is_global}
+        return _json_response(payload, status=429, headers=headers)
+
+    @web.middleware
+    async def _ratelimit(self, request: web.Request, handler: _Handler) -> web.StreamResponse:
+        self.requests += 1
+        route = request.match_info.route
+        resource = route.resource
+        if resource is None:
+            return await handler(request)
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        path = resource.canonical
+        if self.global_limit is not None and not path.startswith(_GLOBAL_EXEMPT, len('/api/v8')):
+            retry_after = self._take(self._global, self.global_limit, 1.0, now)
+            if retry_after is not None:
+                self.ratelimited += 1
+                self.global_ratelimited += 1
+                return self._too_many_requests(retry_after, is_global=True, headers={})
+
+        route_key = f'{request.method} {path}'
+        bucket_hash = hashlib.sha1(route_key.encode('utf-8')).hexdigest()[:16]
+        info = request.match_info
+        major = ':'.join(info.get(key, '') for key in _MAJOR_PARAMETERS)
+        try:
+            bucket = self._buckets[bucket_hash, major]
+        except KeyError:
+            bucket = self._buckets[bucket_hash, major] = _Bucket()
+
+        retry_after = self._take(bucket, self.bucket_limit, self.bucket_window, now)
+        reset_after = bucket.reset_at - now
+        headers = {
+            'X-RateLimit-Limit': str(self.bucket_limit),
+            'X-RateLimit-Remaining': str(bucket.remaining),
+            'X-RateLimit-Reset': f'{time.time() + reset_after:.3f}',
+            'X-RateLimit-Reset-After': f'{reset_after:.3f}',
+            'X-RateLimit-Bucket': bucket_hash,
+        }
+        if retry_after is not None:
+            self.ratelimited += 1
+            return self._too_many_requests(retry_after, is_global=False, headers=headers)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    # payloads
+
+    def _snowflake(self) -> str:
+        return str(_EPOCH + next(self._ids) * 4194304)
+
+    @staticmethod
+    def _user(user_id: str) -> Dict[str, Any]:
+        return {'id': user_id, 'username': f'user{user_id[-4:]}', 'discriminator': user_id[-4:], 'avatar': None, 'public_flags': 0}
+
+    def _message(self, channel_id: str, message_id: Optional[str] = None, **fields: Any) -> Dict[str, Any]:
+        payload = {
+            'id': message_id or self._snowflake(),
+            'channel_id': channel_id,
+            'author': self._user(str(_EPOCH)),
+            'content': '',
+            'timestamp': '2021-01-01T00:00:00+00:00',
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'pinned': False,
+            'type': 0,
+        }
+        payload.update((key, value) for key, value in fields.items() if key in payload)
+        return payload
+
+    def _member(self, user_id: str) -> Dict[str, Any]:
+        return {
+            'user': self._user(user_id),
+            'roles': [],
+            'joined_at': '2021-01-01T00:00:00+00:00',
+            'nick': None,
+            'deaf': False,
+            'mute': False,
+        }
+
+    def _channel(self, channel_id: str, **fields: Any) -> Dict[str, Any]:
+        payload = {
+            'id': channel_id,
+            'type': 0,
+            'guild_id': str(_EPOCH),
+            'name': 'general',
+            'position': 0,
+            'parent_id': None,
+            'topic': None,
+            'nsfw': False,
+            'permission_overwrites': [],
+        }
+        payload.update((key, value) for key, value in fields.items() if key in payload)
+        return payload
+
+    @staticmethod
+    async def _body(request: web.Request) -> Dict[str, Any]:
+        # multipart bodies are streamed through, only payload_json is kept
+        if request.content_type.startswith('multipart/'):
+            payload: Dict[str, Any] = {}
+            reader = await request.multipart()
+            async for part in reader:  # type: ignore
+                if part.name == 'payload_json':
+                    payload = json.loads(await part.text())
+                else:
+                    while await part.read_chunk():
+                        pass
+            return payload
+
+        if request.can_read_body:
+            return await request.json()
+        return {}
+
+    # routes
+
+    async def no_content(self, request: web.Request) -> web.Response:
+        await request.read()
+        return web.Response(status=204)
+
+    async def get_me(self, request: web.Request) -> web.Response:
+        return _json_response({**self._user(str(_EPOCH)), 'bot': True, 'verified': True, 'mfa_enabled': False, 'flags': 0})
+
+    async def get_gateway(self, request: web.Request) -> web.Response:
+        limit = {'total': 1000, 'remaining': 1000, 'reset_after': 0, 'max_concurrency': 1}
+        return _json_response({'url': 'wss://gateway.invalid', 'shards': 1, 'session_start_limit': limit})
+
+    async def get_channel(self, request: web.Request) -> web.Response:
+        return _json_response(self._channel(request.match_info['channel_id']))
+
+    async def edit_channel(self, request: web.Request) -> web.Response:
+        return _json_response(self._channel(request.match_info['channel_id'], **await self._body(request)))
+
+    async def get_messages(self, request: web.Request) -> web.Response:
+        channel_id = request.match_info['channel_id']
+        limit = min(int(request.query.get('limit', 50)), 100)
+        return _json_response([self._message(channel_id) for _ in range(limit)])
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        return _json_response(self._message(request.match_info['channel_id'], **await self._body(request)))
+
+    async def get_message(self, request: web.Request) -> web.Response:
+        info = request.match_info
+        return _json_response(self._message(info['channel_id'], info['message_id']))
+
+    async def edit_message(self, request: web.Request) -> web.Response:
+        info = request.match_info
+        return _json_response(self._message(info['channel_id'], info['message_id'], **await self._body(request)))
+
+    async def get_members(self, request: web.Request) -> web.Response:
+        limit = min(int(request.query.get('limit', 1)), 1000)
+        return _json_response([self._member(self._snowflake()) for _ in range(limit)])
+
+    async def get_member(self, request: web.Request) -> web.Response:
+        return _json_response(self._member(request.match_info['user_id']))
+
+    async def edit_member(self, request: web.Request) -> web.Response:
+        await self._body(request)
+        return _json_response(self._member(request.match_info['user_id']))
+
+    async def create_followup(self, request: web.Request) -> web.Response:
+        return _json_response(self._message(self._snowflake(), **await self._body(request)))
+
+    async def get_webhook_message(self, request: web.Request) -> web.Response:
+        return _json_response(self._message(self._snowflake()))
+
+    async def edit_webhook_message(self, request: web.Request) -> web.Response:
+        return _json_response(self._message(self._snowflake(), **await self._body(request)))
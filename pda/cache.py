@@ -0,0 +1,647 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+import time
+import itertools
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+    runtime_checkable,
+)
+
+if TYPE_CHECKING:
+    from .message import Message
+
+__all__ = (
+    'CacheStore',
+    'DictCacheStore',
+    'LRUCacheStore',
+    'AssetCache',
+)
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+CacheFactory = Callable[[], 'CacheStore[Any, Any]']
+
+
+@runtime_checkable
+class CacheStore(Protocol[K, V]):
+    """A protocol that details the operations the library needs from an entity cache.
+
+    The internal caches of :class:`Client` (users, guilds, emojis, stickers,
+    private channels and messages) are all stored in objects implementing this
+    protocol, and can be swapped out through the ``cache_backends`` parameter of
+    :class:`Client`.
+
+    The following implement this protocol:
+
+    - :class:`~pda.DictCacheStore`
+    - :class:`~pda.LRUCacheStore`
+
+    .. versionadded:: 2.0
+
+    .. container:: operations
+
+        .. describe:: len(x)
+
+            Returns the number of entries currently stored.
+    """
+
+    __slots__ = ()
+
+    def get(self, key: K, default: Any = None) -> Optional[V]:
+        """Returns the value stored under ``key`` or ``default`` if it is not stored."""
+        raise NotImplementedError
+
+    def put(self, key: K, value: V) -> None:
+        """Stores ``value`` under ``key``, replacing any previous value."""
+        raise NotImplementedError
+
+    def evict(self, key: K) -> Optional[V]:
+        """Removes the value stored under ``key`` and returns it, if any."""
+        raise NotImplementedError
+
+    def values(self) -> Iterator[V]:
+        """Returns an iterator over every stored value."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Removes every stored value."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class DictCacheStore(Dict[K, V]):
+    """The default :class:`CacheStore`, an unbounded :class:`dict`.
+
+    Since this is a :class:`dict` subclass, lookups are as fast as
+    regular dictionary lookups.
+
+    .. versionadded:: 2.0
+    """
+
+    __slots__ = ()
+
+    put = dict.__setitem__
+
+    def evict(self, key: K) -> Optional[V]:
+        return self.pop(key, None)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} len={len(self)}>'
+
+
+class LRUCacheStore(Generic[K, V]):
+    """A bounded :class:`CacheStore` that evicts the least recently used entry.
+
+    Both reading and writing an entry count as using it.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    max_size: Optional[:class:`int`]
+        The maximum number of entries to keep. Once exceeded, the least
+        recently used entry is evicted. ``None`` means unbounded.
+    ttl: Optional[:class:`float`]
+        The number of seconds an entry may go unused before it expires.
+        ``None`` means entries never expire.
+
+    Attributes
+    -----------
+    max_size: Optional[:class:`int`]
+        The maximum number of entries to keep.
+    ttl: Optional[:class:`float`]
+        The number of seconds an entry may go unused before it expires.
+    """
+
+    __slots__ = ('max_size', 'ttl', '_data')
+
+    def __init__(self, max_size: Optional[int] = None, *, ttl: Optional[float] = None) -> None:
+        if max_size is not None and max_size <= 0:
+            raise ValueError('max_size must be greater than 0')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be greater than 0')
+
+        self.max_size: Optional[int] = max_size
+        self.ttl: Optional[float] = ttl
+        # key -> (value, last used); ordered from least to most recently used
+        self._data: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} len={len(self)} max_size={self.max_size} ttl={self.ttl}>'
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key) is not None
+
+    def _expire(self) -> None:
+        if self.ttl is None:
+            return
+
+        # Entries are kept in order of use so the expired ones are always at the front.
+        deadline = time.monotonic() - self.ttl
+        data = self._data
+        while data:
+            key = next(iter(data))
+            if data[key][1] > deadline:
+                break
+            del data[key]
+
+    def get(self, key: K, default: Any = None) -> Optional[V]:
+        try:
+            value, last_used = self._data[key]
+        except KeyError:
+            return default
+
+        now = time.monotonic()
+        if self.ttl is not None and now - last_used >= self.ttl:
+            del self._data[key]
+            return default
+
+        self._data[key] = (value, now)
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+
+        if self.max_size is not None and len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def evict(self, key: K) -> Optional[V]:
+        try:
+            value, _ = self._data.pop(key)
+        except KeyError:
+            return None
+        return value
+
+    def values(self) -> Iterator[V]:
+        self._expire()
+        return (value for value, _ in list(self._data.values()))
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class MessageCache:
+    """The default :class:`CacheStore` for messages, bounded and indexed by message ID.
+
+    Messages are kept in insertion order so the oldest message is evicted
+    first once :attr:`max_messages` is exceeded. Lookup, insertion, eviction
+    and removal are all constant time.
+
+    If ``max_messages_per_channel`` is given then each channel is additionally
+    capped, evicting that channel's oldest message first so a single busy
+    channel cannot evict every other channel's messages.
+    """
+
+    __slots__ = ('max_messages', 'max_messages_per_channel', '_messages', '_channels')
+
+    def __init__(self, max_messages: int, *, max_messages_per_channel: Optional[int] = None) -> None:
+        self.max_messages: int = max_messages
+        self.max_messages_per_channel: Optional[int] = max_messages_per_channel
+        self._messages: OrderedDict[int, Message] = OrderedDict()
+        # channel_id -> ordered message IDs, only maintained when there is a per-channel cap
+        self._channels: Dict[int, OrderedDict[int, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages.values())
+
+    def __reversed__(self) -> Iterator[Message]:
+        return reversed(self._messages.values())
+
+    def __contains__(self, message: Any) -> bool:
+        return getattr(message, 'id', None) in self._messages
+
+    def __getitem__(self, idx: int) -> Message:
+        # Positional access is only used by Client.cached_messages so
+        # it is fine for this to be linear.
+        size = len(self._messages)
+        if idx < 0:
+            idx += size
+        if not 0 <= idx < size:
+            raise IndexError('message cache index out of range')
+
+        if idx > size // 2:
+            return next(itertools.islice(reversed(self._messages.values()), size - idx - 1, None))
+        return next(itertools.islice(self._messages.values(), idx, None))
+
+    def index(self, value: Any, *args: Any) -> int:
+        return list(self._messages.values()).index(value, *args)
+
+    def count(self, value: Any) -> int:
+        return int(value in self)
+
+    def get(self, message_id: Optional[int], default: Any = None) -> Optional[Message]:
+        return self._messages.get(message_id, default)  # type: ignore
+
+    def put(self, message_id: int, message: Message) -> None:
+        if message_id in self._messages:
+            self.evict(message_id)
+
+        self._messages[message_id] = message
+
+        limit = self.max_messages_per_channel
+        if limit is not None:
+            channel_id = message.channel.id
+            try:
+                bucket = self._channels[channel_id]
+            except KeyError:
+                bucket = self._channels[channel_id] = OrderedDict()
+
+            bucket[message_id] = None
+            if len(bucket) > limit:
+                oldest, _ = bucket.popitem(last=False)
+                self._messages.pop(oldest, None)
+
+        if len(self._messages) > self.max_messages:
+            _, evicted = self._messages.popitem(last=False)
+            self._untrack(evicted)
+
+    def evict(self, message_id: int) -> Optional[Message]:
+        message = self._messages.pop(message_id, None)
+        if message is not None:
+            self._untrack(message)
+        return message
+
+    def values(self) -> Iterator[Message]:
+        return iter(self._messages.values())
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._channels.clear()
+
+    def _untrack(self, message: Message) -> None:
+        if self.max_messages_per_channel is None:
+            return
+
+        channel_id = message.channel.id
+        bucket = self._channels.get(channel_id)
+        if bucket is not None:
+            bucket.pop(message.id, None)
+            if not bucket:
+                del self._channels[channel_id]
+
+
+class _CachedAsset:
+    __slots__ = ('data', 'etag', 'validated_at')
+
+    def __init__(self, data: bytes, etag: Optional[str], validated_at: float) -> None:
+        self.data: bytes = data
+        self.etag: Optional[str] = etag
+        self.validated_at: float = validated_at
+
+
+class AssetCache:
+    """A two tier cache for files downloaded from the Discord CDN.
+
+    Passed to :class:`Client` as ``asset_cache`` to stop :meth:`Asset.read`,
+    :meth:`Emoji.read`, :meth:`PartialEmoji.read` and :meth:`Sticker.read`
+    from downloading the same file again. Attachments are never cached.
+
+    Entries are keyed by URL, which includes the asset's hash and the requested
+    size and format, so a changed avatar or icon is never served from the cache.
+    Recently used files are kept in memory. If a ``directory`` is given, every
+    file is also written to disk, where it survives restarts. Files on disk are
+    stored under the SHA-256 of their contents so identical files, such as the
+    same emoji in several guilds, are only stored once.
+
+    Once an entry is older than ``max_age`` it is revalidated with the CDN
+    using its ``ETag``, which only downloads the file again if it changed.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    max_memory: :class:`int`
+        The maximum number of bytes to keep in memory. Files larger than
+        this are never kept in memory.
+    directory: Optional[Union[:class:`str`, :class:`os.PathLike`]]
+        The directory to store files in. It is created if it does not
+        exist. ``None`` disables the disk tier.
+    max_disk: :class:`int`
+        The maximum number of bytes to store on disk. Once exceeded, the
+        least recently used files are deleted. Files larger than this
+        are never stored on disk.
+    max_age: :class:`float`
+        The number of seconds an entry is used without revalidating it.
+
+    Attributes
+    -----------
+    max_memory: :class:`int`
+        The maximum number of bytes to keep in memory.
+    directory: Optional[:class:`str`]
+        The directory files are stored in, if any.
+    max_disk: :class:`int`
+        The maximum number of bytes to store on disk.
+    max_age: :class:`float`
+        The number of seconds an entry is used without revalidating it.
+    hits: :class:`int`
+        The number of reads served without downloading the file,
+        including successful revalidations.
+    misses: :class:`int`
+        The number of reads that had to download the file.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_memory: int = 32 * 1024 * 1024,
+        directory: Optional[Union[str, os.PathLike]] = None,
+        max_disk: int = 512 * 1024 * 1024,
+        max_age: float = 3600.0,
+    ) -> None:
+        if max_memory < 0:
+            raise ValueError('max_memory cannot be negative')
+        if max_disk <= 0:
+            raise ValueError('max_disk must be greater than 0')
+        if max_age < 0:
+            raise ValueError('max_age cannot be negative')
+
+        self.max_memory: int = max_memory
+        self.directory: Optional[str] = None if directory is None else os.fspath(directory)
+        self.max_disk: int = max_disk
+        self.max_age: float = max_age
+        self.hits: int = 0
+        self.misses: int = 0
+        # url -> entry; ordered from least to most recently used
+        self._memory: OrderedDict[str, _CachedAsset] = OrderedDict()
+        self._memory_size: int = 0
+        # the disk tier is only touched from executor threads
+        self._disk_lock: threading.Lock = threading.Lock()
+        self._disk_size: int = 0
+        # blob -> number of index entries referring to it, loaded on first write
+        self._references: Optional[Dict[str, int]] = None
+
+        if self.directory is not None:
+            os.makedirs(os.path.join(self.directory, 'index'), exist_ok=True)
+            os.makedirs(os.path.join(self.directory, 'blobs'), exist_ok=True)
+
+    def __repr__(self) -> str:
+        return (
+            f'<{self.__class__.__name__} memory_size={self._memory_size} '
+            f'max_memory={self.max_memory} directory={self.directory!r}>'
+        )
+
+    @property
+    def memory_size(self) -> int:
+        """:class:`int`: The number of bytes currently kept in memory."""
+        return self._memory_size
+
+    def clear(self) -> None:
+        """Drops every file kept in memory.
+
+        Files on disk are left alone, delete the directory to remove them.
+        """
+        self._memory.clear()
+        self._memory_size = 0
+
+    def _is_fresh(self, entry: _CachedAsset) -> bool:
+        return time.time() - entry.validated_at < self.max_age
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def get(self, url: str) -> Optional[_CachedAsset]:
+        entry = self._memory.get(url)
+        if entry is not None:
+            self._memory.move_to_end(url)
+            return entry
+
+        if self.directory is None:
+            return None
+
+        entry = await self._run(self._read_disk, url)
+        if entry is not None:
+            self._remember(url, entry)
+        return entry
+
+    async def put(self, url: str, data: bytes, etag: Optional[str]) -> None:
+        entry = _CachedAsset(data, etag, time.time())
+        self._remember(url, entry)
+        if self.directory is not None and len(data) <= self.max_disk:
+            await self._run(self._write_disk, url, entry)
+
+    async def revalidated(self, url: str, entry: _CachedAsset) -> None:
+        entry.validated_at = time.time()
+        if self.directory is not None and len(entry.data) <= self.max_disk:
+            await self._run(self._update_index, url, entry)
+
+    def _remember(self, url: str, entry: _CachedAsset) -> None:
+        size = len(entry.data)
+        if size > self.max_memory:
+            return
+
+        old = self._memory.pop(url, None)
+        if old is not None:
+            self._memory_size -= len(old.data)
+
+        self._memory[url] = entry
+        self._memory_size += size
+        while self._memory_size > self.max_memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted.data)
+
+    # disk tier, these run in the default executor
+
+    @staticmethod
+    def _blob_key(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _index_path(self, url: str) -> str:
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, 'index', name)  # type: ignore
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.directory, 'blobs', key)  # type: ignore
+
+    @staticmethod
+    def _replace(path: str, data: bytes) -> None:
+        # written to a temporary file first so readers never see a partial file
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as fp:
+            fp.write(data)
+        os.replace(tmp, path)
+
+    def _read_disk(self, url: str) -> Optional[_CachedAsset]:
+        index = self._index_path(url)
+        with self._disk_lock:
+            try:
+                with open(index, 'rb') as fp:
+                    meta = json.loads(fp.read())
+                with open(self._blob_path(meta['blob']), 'rb') as fp:
+                    data = fp.read()
+            except FileNotFoundError:
+                return None
+            except (ValueError, KeyError, TypeError):
+                # a corrupted index is treated as a miss and overwritten later
+                return None
+
+            # the index modification time is when it was last used, for eviction
+            os.utime(index)
+            return _CachedAsset(data, meta.get('etag'), meta.get('validated_at', 0.0))
+
+    @staticmethod
+    def _index_blob(path: str) -> Optional[str]:
+        try:
+            with open(path, 'rb') as fp:
+                blob = json.loads(fp.read()).get('blob')
+        except (OSError, ValueError, AttributeError):
+            return None
+        return blob if isinstance(blob, str) else None
+
+    def _load(self) -> None:
+        # Counts which blobs the index refers to and how large they are, once.
+        # Blobs nothing refers to, such as those left behind by a crash
+        # between writing a blob and its index, are deleted.
+        if self._references is not None:
+            return
+
+        references: Dict[str, int] = {}
+        with os.scandir(os.path.join(self.directory, 'index')) as it:  # type: ignore
+            for item in it:
+                if item.name.endswith('.tmp'):
+                    continue
+                blob = self._index_blob(item.path)
+                if blob is not None:
+                    references[blob] = references.get(blob, 0) + 1
+
+        total = 0
+        with os.scandir(os.path.join(self.directory, 'blobs')) as it:  # type: ignore
+            for item in it:
+                if item.name.endswith('.tmp'):
+                    continue
+                try:
+                    if item.name in references:
+                        total += item.stat().st_size
+                    else:
+                        os.remove(item.path)
+                except FileNotFoundError:
+                    pass
+
+        self._references = references
+        self._disk_size = total
+
+    def _set_index(self, url: str, entry: _CachedAsset, blob: str) -> None:
+        path = self._index_path(url)
+        old = self._index_blob(path)
+        meta = {'url': url, 'blob': blob, 'etag': entry.etag, 'validated_at': entry.validated_at}
+        self._replace(path, json.dumps(meta).encode('utf-8'))
+
+        if old != blob:
+            references = self._references
+            references[blob] = references.get(blob, 0) + 1  # type: ignore
+            if old is not None:
+                # the URL now has different contents
+                self._release(old)
+
+    def _release(self, blob: str) -> None:
+        references = self._references
+        count = references.get(blob, 0) - 1  # type: ignore
+        if count > 0:
+            references[blob] = count  # type: ignore
+            return
+
+        references.pop(blob, None)  # type: ignore
+        path = self._blob_path(blob)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self._disk_size -= size
+
+    def _update_index(self, url: str, entry: _CachedAsset) -> None:
+        blob = self._blob_key(entry.data)
+        with self._disk_lock:
+            self._load()
+            self._set_index(url, entry, blob)
+
+    def _write_disk(self, url: str, entry: _CachedAsset) -> None:
+        blob = self._blob_key(entry.data)
+        path = self._blob_path(blob)
+        with self._disk_lock:
+            self._load()
+            if not os.path.exists(path):
+                self._replace(path, entry.data)
+                self._disk_size += len(entry.data)
+
+            self._set_index(url, entry, blob)
+            if self._disk_size > self.max_disk:
+                self._evict()
+
+    def _evict(self) -> None:
+        # frees down to 90% of the limit so that it runs rarely
+        target = self.max_disk * 9 // 10
+        indexes: List[Tuple[float, str]] = []
+        with os.scandir(os.path.join(self.directory, 'index')) as it:  # type: ignore
+            for item in it:
+                if item.name.endswith('.tmp'):
+                    continue
+                try:
+                    indexes.append((item.stat().st_mtime, item.path))
+                except FileNotFoundError:
+                    pass
+
+        indexes.sort()
+        for _, index in indexes:
+            if self._disk_size <= target:
+                break
+
+            blob = self._index_blob(index)
+            try:
+                os.remove(index)
+            except FileNotFoundError:
+                continue
+            if blob is not None:
+                self._release(blob)
@@ -25,11 +25,13 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import io
 import logging
+import os
 import signal
 import sys
 import traceback
-from typing import Any, Callable, Coroutine, Dict, Generator, List, Optional, Sequence, TYPE_CHECKING, Tuple, TypeVar, Union
+from typing import Any, Callable, Coroutine, Dict, Generator, Iterable, List, Optional, Sequence, TYPE_CHECKING, Tuple, TypeVar, Union
 
 import aiohttp
 
@@ -50,7 +52,9 @@ from .activity import ActivityTypes, BaseActivity, create_activity
 from .voice_client import VoiceClient
 from .http import HTTPClient
 from .state import ConnectionState
-from . import utils
+from .cache import MessageCache
+from .dispatcher import EventDispatcher, EventMetrics, EventPolicy
+from . import utils, snapshot
 from .utils import MISSING
 from .object import Object
 from .backoff import ExponentialBackoff
@@ -63,6 +67,7 @@ from .threads import Thread
 from .sticker import GuildSticker, StandardSticker, StickerPack, _sticker_factory
 
 if TYPE_CHECKING:
+    from .cache import AssetCache
     from .abc import SnowflakeTime, PrivateChannel, GuildChannel, Snowflake
     from .channel import DMChannel
     from .message import Message
@@ -109,6 +114,135 @@ def _cleanup_loop(loop: asyncio.AbstractEventLoop) -> None:
         _log.info('Closing the event loop.')
         loop.close()
 
+
+# the keyword arguments accepted by Client.wait_for to index a waiter
+_WAITER_KEYS = ('guild_id', 'channel_id', 'author_id', 'user_id', 'message_id')
+
+
+def _event_key(name: str, args: Tuple[Any, ...]) -> Optional[int]:
+    # Resolves e.g. channel_id from the first event argument that exposes it,
+    # either directly (raw events) or through the related model (message.channel).
+    from .member import Member
+    from .message import Message
+    from .user import BaseUser
+
+    attr = name[:-3]
+    for arg in args:
+        for obj in (arg, getattr(arg, 'message', None)):
+            if obj is None:
+                continue
+
+            value = getattr(obj, name, None)
+            if value is not None:
+                return value
+
+            related = getattr(obj, attr, None)
+            if related is not None:
+                return getattr(related, 'id', None)
+
+        if name == 'user_id' and isinstance(arg, (BaseUser, Member)):
+            return arg.id
+        if name == 'message_id' and isinstance(arg, Message):
+            return arg.id
+
+    return None
+
+
+class _EventWaiters:
+    """The pending :meth:`Client.wait_for` futures of a single event.
+
+    Waiters without keys are checked on every dispatch, keyed waiters are
+    bucketed by the values of their keys so only the bucket matching the
+    dispatched arguments has its predicates run.
+    """
+
+    __slots__ = ('unkeyed', 'keyed', '_where')
+
+    def __init__(self) -> None:
+        self.unkeyed: Dict[asyncio.Future, Callable[..., bool]] = {}
+        # key names -> key values -> waiters
+        self.keyed: Dict[Tuple[str, ...], Dict[Tuple[int, ...], Dict[asyncio.Future, Callable[..., bool]]]] = {}
+        # future -> (key names, key values), or None when unkeyed
+        self._where: Dict[asyncio.Future, Optional[Tuple[Tuple[str, ...], Tuple[int, ...]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def add(self, future: asyncio.Future, check: Callable[..., bool], keys: Dict[str, int]) -> None:
+        if keys:
+            names = tuple(sorted(keys))
+            values = tuple(keys[name] for name in names)
+            self.keyed.setdefault(names, {}).setdefault(values, {})[future] = check
+            self._where[future] = (names, values)
+        else:
+            self.unkeyed[future] = check
+            self._where[future] = None
+
+    def discard(self, future: asyncio.Future) -> bool:
+        try:
+            where = self._where.pop(future)
+        except KeyError:
+            return False
+
+        if where is None:
+            del self.unkeyed[future]
+            return True
+
+        names, values = where
+        buckets = self.keyed[names]
+        bucket = buckets[values]
+        del bucket[future]
+        if not bucket:
+            del buckets[values]
+            if not buckets:
+                del self.keyed[names]
+        return True
+
+    def _run(self, bucket: Dict[asyncio.Future, Callable[..., bool]], args: Tuple[Any, ...]) -> None:
+        for future, condition in list(bucket.items()):
+            if future.done():
+                self.discard(future)
+                continue
+
+            try:
+                result = condition(*args)
+            except Exception as exc:
+                future.set_exception(exc)
+                self.discard(future)
+            else:
+                if result:
+                    if len(args) == 0:
+                        future.set_result(None)
+                    elif len(args) == 1:
+                        future.set_result(args[0])
+                    else:
+                        future.set_result(args)
+                    self.discard(future)
+
+    def dispatch(self, args: Tuple[Any, ...]) -> None:
+        if self.unkeyed:
+            self._run(self.unkeyed, args)
+
+        if not self.keyed:
+            return
+
+        resolved: Dict[str, Optional[int]] = {}
+        for names, buckets in list(self.keyed.items()):
+            values = []
+            for name in names:
+                try:
+                    value = resolved[name]
+                except KeyError:
+                    value = resolved[name] = _event_key(name, args)
+                if value is None:
+                    break
+                values.append(value)
+            else:
+                bucket = buckets.get(tuple(values))
+                if bucket:
+                    self._run(bucket, args)
+
+
 class Client:
     r"""Represents a client connection that connects to pda.
     This class is used to interact with the Discord WebSocket and API.
@@ -123,6 +257,27 @@ class Client:
 
         .. versionchanged:: 1.3
             Allow disabling the message cache and change the default size to ``1000``.
+    max_messages_per_channel: Optional[:class:`int`]
+        The maximum number of messages to store per channel in the internal message cache.
+        Once a channel exceeds this, its oldest cached message is evicted so that a single
+        busy channel cannot evict every other channel's messages. Defaults to ``None``
+        which means only :attr:`max_messages` applies.
+
+        .. versionadded:: 2.0
+    cache_backends: Optional[Dict[:class:`str`, Callable[[], :class:`CacheStore`]]]
+        A mapping of cache name to a callable that returns a new :class:`CacheStore`,
+        used to swap out the store backing that internal cache. The valid cache names
+        are ``users``, ``guilds``, ``emojis``, ``stickers``, ``private_channels`` and
+        ``messages``. The callable is called every time the cache is (re)created, e.g.
+        on ``READY``. Caches that are not given use the library defaults.
+
+        For example, to keep at most 10000 users that have been used in the last hour: ::
+
+            client = pda.Client(cache_backends={
+                'users': lambda: pda.LRUCacheStore(10000, ttl=3600),
+            })
+
+        .. versionadded:: 2.0
     loop: Optional[:class:`asyncio.AbstractEventLoop`]
         The :class:`asyncio.AbstractEventLoop` to use for asynchronous operations.
         Defaults to ``None``, in which case the default event loop is used via
@@ -191,6 +346,60 @@ class Client:
         this is ``False`` then those events will not be dispatched (due to performance considerations).
         To enable these events, this must be set to ``True``. Defaults to ``False``.
 
+        .. versionadded:: 2.0
+    lazy_dispatch: :class:`bool`
+        Whether to skip parsing gateway events that nothing is listening to. When enabled,
+        events such as :func:`on_typing` or :func:`on_presence_update` are only parsed if
+        an event handler, listener or :meth:`wait_for` call is registered for them.
+        Presence updates with no listeners still update the member cache, unless no members
+        are cached due to :class:`MemberCacheFlags`. Defaults to ``False``.
+
+        Listeners must be registered through :meth:`event`, :meth:`wait_for` or, for
+        :class:`~pda.ext.commands.Bot`, :meth:`~pda.ext.commands.Bot.add_listener`, or be
+        defined in a subclass for them to be picked up.
+
+        .. versionadded:: 2.0
+    gateway_encoding: :class:`str`
+        The encoding to receive gateway events in, either ``'json'`` (the default)
+        or ``'etf'``. The Erlang Term Format is about a third smaller on the wire and
+        delivers snowflakes as integers, but it is decoded in pure Python and is
+        slower to decode than JSON. Compare them with ``python -m pda bench encoding``.
+
+        .. versionadded:: 2.0
+    event_policy: Optional[:class:`EventPolicy`]
+        How to execute event handlers, such as limiting how many run at once.
+        If neither this nor ``event_policies`` is given, every handler runs in
+        its own task as soon as its event is dispatched.
+
+        .. versionadded:: 2.0
+    event_policies: Dict[:class:`str`, :class:`EventPolicy`]
+        A mapping of event name, without the ``on_`` prefix, to the policy for
+        that event's handlers, e.g. ``{'presence_update': EventPolicy(max_concurrency=4)}``.
+        Each policy keeps its own limits and queue. Events not in the mapping
+        use ``event_policy``.
+
+        .. versionadded:: 2.0
+    http_cache_ttl: Dict[:class:`str`, :class:`float`]
+        A mapping of API route to the number of seconds its responses are cached for,
+        for example ``{'/guilds/{guild_id}/members/{member_id}': 5.0}`` to cache
+        :meth:`Guild.fetch_member` for five seconds. Only the following routes are
+        supported, and their cached responses are dropped as soon as the gateway
+        reports a change or the client edits or deletes what they describe:
+
+        - ``/guilds/{guild_id}/members/{member_id}``
+        - ``/users/{user_id}``
+        - ``/channels/{channel_id}``
+        - ``/channels/{channel_id}/messages/{message_id}``
+
+        Identical ``GET`` requests made while one is already in flight always share
+        its response, whether they are cached or not.
+
+        .. versionadded:: 2.0
+    asset_cache: Optional[:class:`AssetCache`]
+        The cache to keep assets downloaded from the CDN in, such as avatars and
+        emojis read through :meth:`Asset.read` or :meth:`Emoji.read`. Attachments
+        are never cached. Defaults to ``None``, which downloads them every time.
+
         .. versionadded:: 2.0
 
     Attributes
@@ -209,7 +418,7 @@ class Client:
         # self.ws is set in the connect method
         self.ws: DiscordWebSocket = None  # type: ignore
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
-        self._listeners: Dict[str, List[Tuple[asyncio.Future, Callable[..., bool]]]] = {}
+        self._listeners: Dict[str, _EventWaiters] = {}
         self.shard_id: Optional[int] = options.get('shard_id')
         self.shard_count: Optional[int] = options.get('shard_count')
 
@@ -217,7 +426,17 @@ class Client:
         proxy: Optional[str] = options.pop('proxy', None)
         proxy_auth: Optional[aiohttp.BasicAuth] = options.pop('proxy_auth', None)
         unsync_clock: bool = options.pop('assume_unsync_clock', True)
-        self.http: HTTPClient = HTTPClient(connector, proxy=proxy, proxy_auth=proxy_auth, unsync_clock=unsync_clock, loop=self.loop)
+        http_cache_ttl: Optional[Dict[str, float]] = options.pop('http_cache_ttl', None)
+        asset_cache: Optional[AssetCache] = options.pop('asset_cache', None)
+        self.http: HTTPClient = HTTPClient(
+            connector,
+            proxy=proxy,
+            proxy_auth=proxy_auth,
+            unsync_clock=unsync_clock,
+            loop=self.loop,
+            cache_ttl=http_cache_ttl,
+            asset_cache=asset_cache,
+        )
 
         self._handlers: Dict[str, Callable] = {
             'ready': self._handle_ready
@@ -228,6 +447,16 @@ class Client:
         }
 
         self._enable_debug_events: bool = options.pop('enable_debug_events', False)
+        self._gateway_encoding: str = options.pop('gateway_encoding', 'json')
+        if self._gateway_encoding not in ('json', 'etf'):
+            raise ValueError(f"gateway_encoding must be 'json' or 'etf', not {self._gateway_encoding!r}")
+        event_policy: Optional[EventPolicy] = options.pop('event_policy', None)
+        event_policies: Dict[str, EventPolicy] = options.pop('event_policies', {})
+        self._event_dispatcher: Optional[EventDispatcher] = None
+        if event_policy is not None or event_policies:
+            self._event_dispatcher = EventDispatcher(self, event_policy, event_policies)
+        # shard_id: bytes received by that shard
+        self._gateway_traffic: Dict[Optional[int], GatewayTraffic] = {}
         self._connection: ConnectionState = self._get_state(**options)
         self._connection.shard_count = self.shard_count
         self._closed: bool = False
@@ -260,6 +489,132 @@ class Client:
         ws = self.ws
         return float('nan') if not ws else ws.latency
 
+    @property
+    def gateway_traffic(self) -> GatewayTraffic:
+        """:class:`GatewayTraffic`: The number of bytes received from the gateway,
+        both as received and decompressed, summed over every shard.
+
+        .. versionadded:: 2.0
+        """
+        traffic = GatewayTraffic()
+        for shard_traffic in self._gateway_traffic.values():
+            traffic.received += shard_traffic.received
+            traffic.decompressed += shard_traffic.decompressed
+        return traffic
+
+    @property
+    def event_metrics(self) -> Dict[Optional[str], EventMetrics]:
+        """Dict[Optional[:class:`str`], :class:`EventMetrics`]: The execution metrics of
+        the event handlers, keyed by the event names passed to ``event_policies``.
+        The handlers of every other event are under the ``None`` key.
+
+        This is empty if neither ``event_policy`` nor ``event_policies`` was passed.
+
+        .. versionadded:: 2.0
+        """
+        if self._event_dispatcher is None:
+            return {}
+        return self._event_dispatcher.metrics()
+
+    def export_resume_states(self) -> List[ResumeState]:
+        """Returns the state needed to RESUME the current gateway sessions.
+
+        Passing these to :meth:`connect` (or :meth:`start`) in a new process
+        makes the shards RESUME their sessions instead of IDENTIFYing again,
+        skipping the READY and GUILD_CREATE events and any member chunking.
+
+        Sessions only stay resumable for a short while after disconnecting, and
+        closing with :meth:`close` invalidates them unless ``resumable=True`` is passed.
+
+        .. note::
+
+            A resumed session does not replay the state received before the restart,
+            so the cache starts out empty.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        List[:class:`ResumeState`]
+            The resume state of every connected shard.
+        """
+        state = self.ws.resume_state() if self.ws is not None else None
+        return [state] if state is not None else []
+
+    def save_cache_snapshot(self, fp: Union[str, os.PathLike, io.BufferedIOBase]) -> None:
+        """Saves the guilds in the internal cache to a snapshot.
+
+        The snapshot contains every available guild along with its channels,
+        roles, emojis and cached members. It can be loaded by another process
+        through :meth:`load_cache_snapshot` to avoid chunking every guild again.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        fp: Union[:class:`str`, :class:`os.PathLike`, :class:`io.BufferedIOBase`]
+            The file to save the snapshot to. This is either a path or
+            a file-like object opened in binary mode.
+        """
+        data = snapshot.dump(self._connection)
+        if isinstance(fp, io.IOBase):
+            fp.write(data)
+        else:
+            with open(fp, 'wb') as f:
+                f.write(data)
+
+    def load_cache_snapshot(self, fp: Union[str, os.PathLike, io.BufferedIOBase]) -> List[Guild]:
+        """Loads a snapshot created by :meth:`save_cache_snapshot` into the internal cache.
+
+        This must be called before connecting. The loaded guilds are reconciled with
+        the GUILD_CREATE events received while connecting: if a guild's member count
+        has not changed then the members from the snapshot are kept and the guild is
+        not chunked again, otherwise it is chunked as usual. Loaded guilds whose
+        GUILD_CREATE has not been received by the time the client is ready are
+        removed, and built from scratch if it is received later.
+
+        When sessions are resumed through ``resume_states`` no GUILD_CREATE events are
+        received, so the loaded guilds are used as they are and kept up to date by the
+        events received afterwards.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        fp: Union[:class:`str`, :class:`os.PathLike`, :class:`io.BufferedIOBase`]
+            The file to load the snapshot from. This is either a path or
+            a file-like object opened in binary mode.
+
+        Raises
+        -------
+        ClientException
+            The client is already ready or the snapshot was saved by a different bot.
+        ValueError
+            The file is not a valid snapshot.
+
+        Returns
+        --------
+        List[:class:`.Guild`]
+            The guilds that were loaded.
+        """
+        if self.is_ready():
+            raise ClientException('Cache snapshots must be loaded before connecting.')
+
+        if isinstance(fp, io.IOBase):
+            raw = fp.read()
+        else:
+            with open(fp, 'rb') as f:
+                raw = f.read()
+
+        data = snapshot.load(raw)
+        user_id = self._connection.self_id
+        if user_id is not None and data['user_id'] != str(user_id):
+            raise ClientException('This cache snapshot was saved by a different bot.')
+
+        guilds = self._connection._load_snapshot(data)
+        _log.info('Loaded %d guilds from the cache snapshot.', len(guilds))
+        return guilds
+
     def is_ws_ratelimited(self) -> bool:
         """:class:`bool`: Whether the websocket is currently rate limited.
 
@@ -301,7 +656,12 @@ class Client:
 
         .. versionadded:: 1.1
         """
-        return utils.SequenceProxy(self._connection._messages or [])
+        messages = self._connection._messages
+        if messages is None:
+            return utils.SequenceProxy([])
+        if isinstance(messages, MessageCache):
+            return utils.SequenceProxy(messages)
+        return utils.SequenceProxy(list(messages.values()))
 
     @property
     def private_channels(self) -> List[PrivateChannel]:
@@ -357,43 +717,28 @@ class Client:
             except asyncio.CancelledError:
                 pass
 
-    def _schedule_event(self, coro: Callable[..., Coroutine[Any, Any, Any]], event_name: str, *args: Any, **kwargs: Any) -> asyncio.Task:
+    def _schedule_event(self, coro: Callable[..., Coroutine[Any, Any, Any]], event_name: str, *args: Any, **kwargs: Any) -> Optional[asyncio.Task]:
+        if self._event_dispatcher is not None:
+            # None when the handler was queued or dropped
+            return self._event_dispatcher.schedule(coro, event_name, args, kwargs)
+
         wrapped = self._run_event(coro, event_name, *args, **kwargs)
         # Schedules the task
         return asyncio.create_task(wrapped, name=f'pda.py: {event_name}')
 
+    def _has_listeners(self, event: str) -> bool:
+        return hasattr(self, 'on_' + event) or bool(self._listeners.get(event))
+
     def dispatch(self, event: str, *args: Any, **kwargs: Any) -> None:
         _log.debug('Dispatching event %s', event)
         method = 'on_' + event
 
         listeners = self._listeners.get(event)
         if listeners:
-            removed = []
-            for i, (future, condition) in enumerate(listeners):
-                if future.cancelled():
-                    removed.append(i)
-                    continue
-
-                try:
-                    result = condition(*args)
-                except Exception as exc:
-                    future.set_exception(exc)
-                    removed.append(i)
-                else:
-                    if result:
-                        if len(args) == 0:
-                            future.set_result(None)
-                        elif len(args) == 1:
-                            future.set_result(args[0])
-                        else:
-                            future.set_result(args)
-                        removed.append(i)
-
-            if len(removed) == len(listeners):
+            listeners.dispatch(args)
+            if not listeners:
                 self._listeners.pop(event)
-            else:
-                for idx in reversed(removed):
-                    del listeners[idx]
+                self._connection._update_lazy_parsers()
 
         try:
             coro = getattr(self, method)
@@ -473,7 +818,7 @@ class Client:
         data = await self.http.static_login(token.strip())
         self._connection.user = ClientUser(state=self._connection, data=data)
 
-    async def connect(self, *, reconnect: bool = True) -> None:
+    async def connect(self, *, reconnect: bool = True, resume_states: Optional[Iterable[ResumeState]] = None) -> None:
         """|coro|
 
         Creates a websocket connection and lets the websocket listen
@@ -488,6 +833,12 @@ class Client:
             failure or a specific failure on Discord's part. Certain
             disconnects that lead to bad state will not be handled (such as
             invalid sharding payloads or bad tokens).
+        resume_states: Optional[Iterable[:class:`ResumeState`]]
+            The states previously returned by :meth:`export_resume_states`.
+            Shards with a state RESUME their session instead of IDENTIFYing,
+            falling back to IDENTIFY if the session is no longer valid.
+
+            .. versionadded:: 2.0
 
         Raises
         -------
@@ -499,21 +850,35 @@ class Client:
         """
 
         backoff = ExponentialBackoff()
-        ws_params = {
+        ws_params: Dict[str, Any] = {
             'initial': True,
             'shard_id': self.shard_id,
         }
+
+        for state in resume_states or ():
+            if state.shard_id == self.shard_id:
+                _log.info('Restoring session %s from a previous process.', state.session_id)
+                ws_params.update(
+                    gateway=state.gateway,
+                    session=state.session_id,
+                    sequence=state.sequence,
+                    resume=True,
+                    restored=True,
+                )
+                break
+
         while not self.is_closed():
             try:
                 coro = DiscordWebSocket.from_client(self, **ws_params)
                 self.ws = await asyncio.wait_for(coro, timeout=60.0)
-                ws_params['initial'] = False
+                ws_params.update(initial=False, restored=False)
                 while True:
                     await self.ws.poll_event()
             except ReconnectWebSocket as e:
                 _log.info('Got a request to %s the websocket.', e.op)
                 self.dispatch('disconnect')
-                ws_params.update(sequence=self.ws.sequence, resume=e.resume, session=self.ws.session_id)
+                gateway = self.ws.resume_gateway if e.resume else None
+                ws_params.update(sequence=self.ws.sequence, resume=e.resume, session=self.ws.session_id, gateway=gateway)
                 continue
             except (OSError,
                     HTTPException,
@@ -535,7 +900,13 @@ class Client:
 
                 # If we get connection reset by peer then try to RESUME
                 if isinstance(exc, OSError) and exc.errno in (54, 10054):
-                    ws_params.update(sequence=self.ws.sequence, initial=False, resume=True, session=self.ws.session_id)
+                    ws_params.update(
+                        sequence=self.ws.sequence,
+                        initial=False,
+                        resume=True,
+                        session=self.ws.session_id,
+                        gateway=self.ws.resume_gateway,
+                    )
                     continue
 
                 # We should only get this when an unhandled close code happens,
@@ -555,12 +926,25 @@ class Client:
                 # Always try to RESUME the connection
                 # If the connection is not RESUME-able then the gateway will invalidate the session.
                 # This is apparently what the official Discord client does.
-                ws_params.update(sequence=self.ws.sequence, resume=True, session=self.ws.session_id)
-
-    async def close(self) -> None:
+                ws_params.update(
+                    sequence=self.ws.sequence,
+                    resume=True,
+                    session=self.ws.session_id,
+                    gateway=self.ws.resume_gateway,
+                )
+
+    async def close(self, *, resumable: bool = False) -> None:
         """|coro|
 
         Closes the connection to pda.
+
+        Parameters
+        -----------
+        resumable: :class:`bool`
+            Whether to keep the gateway session valid so that it can be
+            resumed by another process through :meth:`export_resume_states`.
+
+            .. versionadded:: 2.0
         """
         if self._closed:
             return
@@ -575,7 +959,8 @@ class Client:
                 pass
 
         if self.ws is not None and self.ws.open:
-            await self.ws.close(code=1000)
+            # Discord invalidates the session when closing with 1000
+            await self.ws.close(code=4000 if resumable else 1000)
 
         await self.http.close()
         self._ready.clear()
@@ -592,7 +977,13 @@ class Client:
         self._connection.clear()
         self.http.recreate()
 
-    async def start(self, token: str, *, reconnect: bool = True) -> None:
+    async def start(
+        self,
+        token: str,
+        *,
+        reconnect: bool = True,
+        resume_states: Optional[Iterable[ResumeState]] = None,
+    ) -> None:
         """|coro|
 
         A shorthand coroutine for :meth:`login` + :meth:`connect`.
@@ -603,7 +994,7 @@ class Client:
             An unexpected keyword argument was received.
         """
         await self.login(token)
-        await self.connect(reconnect=reconnect)
+        await self.connect(reconnect=reconnect, resume_states=resume_states)
 
     def run(self, *args: Any, **kwargs: Any) -> None:
         """A blocking call that abstracts away the event loop
@@ -915,6 +1306,7 @@ class Client:
         *,
         check: Optional[Callable[..., bool]] = None,
         timeout: Optional[float] = None,
+        **keys: Any,
     ) -> Any:
         """|coro|
 
@@ -936,6 +1328,11 @@ class Client:
 
         This function returns the **first event that meets the requirements**.
 
+        Waiters can also be keyed by the IDs the event refers to, such as
+        ``channel_id`` or ``author_id``. Keyed waiters are indexed so that
+        their ``check`` is only called for events that match every key, which
+        keeps dispatching cheap when many waiters are pending at once.
+
         Examples
         ---------
 
@@ -971,6 +1368,9 @@ class Client:
                     else:
                         await channel.send('\N{THUMBS UP SIGN}')
 
+        Waiting for the next message of the same author in the same channel: ::
+
+            msg = await client.wait_for('message', channel_id=message.channel.id, author_id=message.author.id)
 
         Parameters
         ------------
@@ -983,11 +1383,20 @@ class Client:
         timeout: Optional[:class:`float`]
             The number of seconds to wait before timing out and raising
             :exc:`asyncio.TimeoutError`.
+        \*\*keys
+            The IDs the event must refer to. Supported keys are ``guild_id``,
+            ``channel_id``, ``author_id``, ``user_id`` and ``message_id``.
+            Each value may be an ID or an object with an ``id`` attribute.
+            Events whose arguments do not expose a key never match it.
+
+            .. versionadded:: 2.0
 
         Raises
         -------
         asyncio.TimeoutError
             If a timeout is provided and it was reached.
+        TypeError
+            An unsupported key was passed.
 
         Returns
         --------
@@ -997,6 +1406,10 @@ class Client:
             :ref:`event reference <discord-api-events>`.
         """
 
+        for key in keys:
+            if key not in _WAITER_KEYS:
+                raise TypeError(f'wait_for() got an unexpected keyword argument {key!r}')
+
         future = self.loop.create_future()
         if check is None:
             def _check(*args):
@@ -1007,12 +1420,25 @@ class Client:
         try:
             listeners = self._listeners[ev]
         except KeyError:
-            listeners = []
+            listeners = _EventWaiters()
             self._listeners[ev] = listeners
 
-        listeners.append((future, check))
+        listeners.add(future, check, {key: getattr(value, 'id', value) for key, value in keys.items()})
+        future.add_done_callback(lambda fut: self._remove_waiter(ev, fut))
+        self._connection._update_lazy_parsers()
         return asyncio.wait_for(future, timeout)
 
+    def _remove_waiter(self, event: str, future: asyncio.Future) -> None:
+        # timed out and cancelled waiters would otherwise sit in a bucket
+        # that may never be dispatched again
+        listeners = self._listeners.get(event)
+        if listeners is None or not listeners.discard(future):
+            return
+
+        if not listeners:
+            del self._listeners[event]
+            self._connection._update_lazy_parsers()
+
     # event registration
 
     def event(self, coro: Coro) -> Coro:
@@ -1041,6 +1467,7 @@ class Client:
             raise TypeError('event registered must be a coroutine function')
 
         setattr(self, coro.__name__, coro)
+        self._connection._update_lazy_parsers()
         _log.debug('%s has successfully been registered as an event', coro.__name__)
         return coro
 
@@ -0,0 +1,503 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING, TypeVar
+
+from .errors import ClientException
+from .http import HTTPClient
+from .shard import IdentifyCoordinator, LocalIdentifyCoordinator
+from . import utils
+
+if TYPE_CHECKING:
+    from .shard import AutoShardedClient
+
+    T = TypeVar('T')
+    ClientFactory = Callable[..., AutoShardedClient]
+    ClusterHandler = Callable[..., Any]
+
+__all__ = (
+    'Cluster',
+    'ClusterLauncher',
+    'ClusterIdentifyCoordinator',
+)
+
+_log = logging.getLogger(__name__)
+
+
+class _Op:
+    identify = 'identify'
+    request = 'request'
+    response = 'response'
+    broadcast = 'broadcast'
+
+
+class Cluster:
+    """Represents the cluster a worker process of a :class:`ClusterLauncher` runs.
+
+    This is available through :attr:`AutoShardedClient.cluster` inside worker
+    processes and is used to talk to the other clusters.
+
+    Every cluster answers the ``get_guild`` and ``latencies`` requests by default,
+    more can be registered through :meth:`handler`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ------------
+    id: :class:`int`
+        The ID of this cluster, starting at ``0``.
+    count: :class:`int`
+        The number of clusters.
+    shard_count: :class:`int`
+        The total number of shards across every cluster.
+    shard_ids: List[:class:`int`]
+        The shard IDs this cluster runs.
+    client: Optional[:class:`AutoShardedClient`]
+        The client running in this cluster.
+    """
+
+    def __init__(self, cluster_id: int, assignments: List[List[int]], shard_count: int, conn: Connection) -> None:
+        self.id: int = cluster_id
+        self.count: int = len(assignments)
+        self.shard_count: int = shard_count
+        self.shard_ids: List[int] = assignments[cluster_id]
+        self.client: Optional[AutoShardedClient] = None
+        self._conn: Connection = conn
+        self._clusters_by_shard: Dict[int, int] = {
+            shard_id: index for index, shard_ids in enumerate(assignments) for shard_id in shard_ids
+        }
+        self._nonces = itertools.count()
+        self._pending: Dict[int, asyncio.Future[Any]] = {}
+        self._handlers: Dict[str, ClusterHandler] = {
+            'get_guild': self._handle_get_guild,
+            'latencies': self._handle_latencies,
+        }
+
+    def __repr__(self) -> str:
+        return f'<Cluster id={self.id} count={self.count} shard_ids={self.shard_ids}>'
+
+    def _attach(self, client: AutoShardedClient) -> None:
+        self.client = client
+        client.cluster = self
+        client.loop.add_reader(self._conn.fileno(), self._read)
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        self._conn.send(payload)
+
+    def _read(self) -> None:
+        try:
+            while self._conn.poll():
+                self._handle(self._conn.recv())
+        except (EOFError, OSError):
+            _log.warning('Cluster %s lost its connection to the launcher, closing.', self.id)
+            # the reader is only added once the client is attached
+            client = self.client  # type: ignore
+            client.loop.remove_reader(self._conn.fileno())
+            if not client.is_closed():
+                client.loop.create_task(client.close())
+
+    def _handle(self, payload: Dict[str, Any]) -> None:
+        op = payload['op']
+        if op == _Op.response or op == _Op.identify:
+            future = self._pending.pop(payload['nonce'], None)
+            if future is None or future.done():
+                return
+
+            error = payload.get('error')
+            if error is not None:
+                future.set_exception(ClientException(error))
+            else:
+                future.set_result(payload.get('data'))
+        elif op == _Op.request:
+            self.client.loop.create_task(self._respond(payload))  # type: ignore
+        elif op == _Op.broadcast:
+            self.client.dispatch('cluster_message', payload['name'], payload['data'], payload['source'])  # type: ignore
+
+    async def _respond(self, payload: Dict[str, Any]) -> None:
+        response = {'op': _Op.response, 'nonce': payload['nonce'], 'target': payload['source']}
+        name = payload['name']
+        try:
+            handler = self._handlers[name]
+        except KeyError:
+            response['error'] = f'Cluster {self.id} has no handler named {name!r}'
+        else:
+            try:
+                response['data'] = await utils.maybe_coroutine(handler, *payload['args'])
+            except Exception as exc:
+                _log.exception('Cluster %s failed to handle request %r', self.id, name)
+                response['error'] = f'Cluster {self.id} failed to handle {name!r}: {exc!r}'
+
+        self._send(response)
+
+    async def _wait(self, payload: Dict[str, Any], timeout: Optional[float]) -> Any:
+        nonce = next(self._nonces)
+        payload['nonce'] = nonce
+        payload['source'] = self.id
+        future = self.client.loop.create_future()  # type: ignore
+        self._pending[nonce] = future
+        self._send(payload)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending.pop(nonce, None)
+
+    def handler(self, name: str = utils.MISSING) -> Callable[[T], T]:
+        """A decorator that registers a function answering requests from other clusters.
+
+        The function can be a regular function or a coroutine and receives the
+        arguments given to :meth:`request`. Its return value must be picklable.
+
+        Parameters
+        ------------
+        name: :class:`str`
+            The name of the request. Defaults to the function's name.
+        """
+
+        def decorator(func: T) -> T:
+            self._handlers[func.__name__ if name is utils.MISSING else name] = func  # type: ignore
+            return func
+
+        return decorator
+
+    def cluster_for_shard(self, shard_id: int) -> int:
+        """Returns the ID of the cluster running the given shard ID."""
+        return self._clusters_by_shard[shard_id]
+
+    def cluster_for_guild(self, guild_id: int) -> int:
+        """Returns the ID of the cluster that receives events for the given guild ID."""
+        return self._clusters_by_shard[(guild_id >> 22) % self.shard_count]
+
+    async def request(self, cluster_id: int, name: str, *args: Any, timeout: Optional[float] = 10.0) -> Any:
+        """|coro|
+
+        Sends a request to another cluster and waits for its answer.
+
+        Parameters
+        ------------
+        cluster_id: :class:`int`
+            The cluster to send the request to. Requests to this cluster
+            are handled locally.
+        name: :class:`str`
+            The name of the request, as registered with :meth:`handler`.
+        \\*args
+            The arguments to pass to the handler. These must be picklable.
+        timeout: Optional[:class:`float`]
+            The number of seconds to wait for an answer.
+
+        Raises
+        -------
+        ClientException
+            The other cluster failed to handle the request.
+        asyncio.TimeoutError
+            The other cluster did not answer in time.
+        """
+        if cluster_id == self.id:
+            return await utils.maybe_coroutine(self._handlers[name], *args)
+
+        payload = {'op': _Op.request, 'target': cluster_id, 'name': name, 'args': args}
+        return await self._wait(payload, timeout)
+
+    async def request_all(self, name: str, *args: Any, timeout: Optional[float] = 10.0) -> List[Any]:
+        """|coro|
+
+        Sends a request to every cluster, including this one, and returns
+        their answers ordered by cluster ID.
+        """
+        coros = [self.request(cluster_id, name, *args, timeout=timeout) for cluster_id in range(self.count)]
+        return await asyncio.gather(*coros)
+
+    def broadcast(self, name: str, data: Any = None) -> None:
+        """Sends a message to every other cluster.
+
+        The other clusters receive it through the :func:`on_cluster_message` event.
+
+        Parameters
+        ------------
+        name: :class:`str`
+            The name of the message.
+        data: Any
+            The data to send along with it. This must be picklable.
+        """
+        self._send({'op': _Op.broadcast, 'name': name, 'data': data, 'source': self.id})
+
+    async def get_guild(self, guild_id: int, *, timeout: Optional[float] = 10.0) -> Optional[Dict[str, Any]]:
+        """|coro|
+
+        Looks up a guild in the cache of the cluster it belongs to.
+
+        Since guilds cannot be shared between processes, this returns a
+        :class:`dict` with the guild's ``id``, ``name``, ``shard_id``,
+        ``member_count``, ``owner_id`` and ``unavailable`` keys, or
+        ``None`` if the guild is not cached.
+        """
+        return await self.request(self.cluster_for_guild(guild_id), 'get_guild', guild_id, timeout=timeout)
+
+    async def latencies(self, *, timeout: Optional[float] = 10.0) -> List[Tuple[int, float]]:
+        """|coro|
+
+        Returns the ``(shard_id, latency)`` pairs of every shard across every cluster.
+        """
+        results = await self.request_all('latencies', timeout=timeout)
+        return sorted(itertools.chain.from_iterable(results))
+
+    def _handle_get_guild(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        guild = self.client.get_guild(guild_id)  # type: ignore
+        if guild is None:
+            return None
+
+        return {
+            'id': guild.id,
+            'name': guild.name,
+            'shard_id': guild.shard_id,
+            'member_count': guild.member_count,
+            'owner_id': guild.owner_id,
+            'unavailable': guild.unavailable,
+        }
+
+    def _handle_latencies(self) -> List[Tuple[int, float]]:
+        return self.client.latencies  # type: ignore
+
+    async def identify(self, shard_id: int, max_concurrency: int) -> None:
+        # identifies are coordinated by the launcher, which never times out
+        await self._wait({'op': _Op.identify, 'shard_id': shard_id, 'max_concurrency': max_concurrency}, None)
+
+
+class ClusterIdentifyCoordinator(IdentifyCoordinator):
+    """An :class:`IdentifyCoordinator` that shares the IDENTIFY limit between
+    every cluster of a :class:`ClusterLauncher`.
+
+    This is set up automatically for clients created by a :class:`ClusterLauncher`.
+
+    .. versionadded:: 2.0
+    """
+
+    def __init__(self, cluster: Cluster) -> None:
+        self.cluster: Cluster = cluster
+
+    async def acquire(self, shard_id: int, max_concurrency: int) -> None:
+        await self.cluster.identify(shard_id, max_concurrency)
+
+
+def _run_cluster(
+    factory: ClientFactory,
+    token: str,
+    cluster_id: int,
+    assignments: List[List[int]],
+    shard_count: int,
+    conn: Connection,
+) -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    cluster = Cluster(cluster_id, assignments, shard_count, conn)
+    client = factory(
+        shard_ids=cluster.shard_ids,
+        shard_count=shard_count,
+        identify_coordinator=ClusterIdentifyCoordinator(cluster),
+        loop=loop,
+    )
+    cluster._attach(client)
+    client.run(token)
+
+
+class ClusterLauncher:
+    """Runs the shards of a bot across multiple processes.
+
+    Each cluster is a worker process running an :class:`AutoShardedClient`
+    with its own subset of the shards. The launcher process acts as the
+    hub between them over :func:`multiprocessing.Pipe` connections: it
+    coordinates IDENTIFYs across every cluster and routes requests and
+    broadcasts between clusters. See :class:`Cluster` for what is available
+    inside the worker processes.
+
+    .. versionadded:: 2.0
+
+    Example: ::
+
+        def create_client(**options):
+            client = pda.AutoShardedClient(intents=pda.Intents.default(), **options)
+
+            @client.event
+            async def on_ready():
+                print(f'Cluster {client.cluster.id} is ready')
+
+            return client
+
+        if __name__ == '__main__':
+            pda.ClusterLauncher(create_client, token, clusters=4).run()
+
+    Parameters
+    ------------
+    factory: Callable[..., :class:`AutoShardedClient`]
+        Creates the client of a cluster. It is called inside the worker process
+        with the ``shard_ids``, ``shard_count``, ``identify_coordinator`` and ``loop``
+        keyword arguments which must be passed on to the client. Unless the
+        ``context`` is ``'fork'`` this must be picklable, e.g. a module level function.
+    token: :class:`str`
+        The bot token.
+    clusters: :class:`int`
+        The number of worker processes to spread the shards across.
+    shard_count: Optional[:class:`int`]
+        The total number of shards. Defaults to the number Discord recommends.
+    context: :class:`str`
+        The :mod:`multiprocessing` start method to use. Defaults to ``'spawn'``.
+
+    Attributes
+    ------------
+    assignments: List[List[:class:`int`]]
+        The shard IDs of every cluster, indexed by cluster ID.
+        This is filled in once the launcher starts.
+    """
+
+    def __init__(
+        self,
+        factory: ClientFactory,
+        token: str,
+        *,
+        clusters: int,
+        shard_count: Optional[int] = None,
+        context: str = 'spawn',
+    ) -> None:
+        if clusters <= 0:
+            raise ClientException('clusters must be greater than 0.')
+
+        self.factory: ClientFactory = factory
+        self.token: str = token
+        self.clusters: int = clusters
+        self.shard_count: Optional[int] = shard_count
+        self.assignments: List[List[int]] = []
+        self._context = multiprocessing.get_context(context)
+        self._coordinator: LocalIdentifyCoordinator = LocalIdentifyCoordinator()
+        self._connections: Dict[int, Connection] = {}
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+
+    async def _fetch_shard_count(self) -> int:
+        http = HTTPClient()
+        try:
+            await http.static_login(self.token)
+            shard_count, _, _ = await http.get_bot_gateway()
+        finally:
+            await http.close()
+        return shard_count
+
+    def _assign(self, shard_count: int) -> List[List[int]]:
+        # contiguous ranges, spread as evenly as possible
+        base, extra = divmod(shard_count, self.clusters)
+        assignments = []
+        start = 0
+        for index in range(self.clusters):
+            end = start + base + (index < extra)
+            assignments.append(list(range(start, end)))
+            start = end
+        return assignments
+
+    def _send(self, cluster_id: int, payload: Dict[str, Any]) -> None:
+        conn = self._connections.get(cluster_id)
+        if conn is None:
+            return
+
+        try:
+            conn.send(payload)
+        except (BrokenPipeError, OSError):
+            _log.warning('Could not reach cluster %s.', cluster_id)
+
+    def _read(self, cluster_id: int) -> None:
+        conn = self._connections[cluster_id]
+        try:
+            while conn.poll():
+                self._route(cluster_id, conn.recv())
+        except (EOFError, OSError):
+            _log.info('Cluster %s has disconnected.', cluster_id)
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+            del self._connections[cluster_id]
+
+    def _route(self, cluster_id: int, payload: Dict[str, Any]) -> None:
+        op = payload['op']
+        if op == _Op.identify:
+            asyncio.create_task(self._identify(cluster_id, payload))
+        elif op == _Op.request or op == _Op.response:
+            target = payload['target']
+            if op == _Op.request and target not in self._connections:
+                error = f'Cluster {target} is not running'
+                self._send(cluster_id, {'op': _Op.response, 'nonce': payload['nonce'], 'error': error})
+                return
+            self._send(target, payload)
+        elif op == _Op.broadcast:
+            for target in list(self._connections):
+                if target != cluster_id:
+                    self._send(target, payload)
+
+    async def _identify(self, cluster_id: int, payload: Dict[str, Any]) -> None:
+        await self._coordinator.acquire(payload['shard_id'], payload['max_concurrency'])
+        self._send(cluster_id, {'op': _Op.identify, 'nonce': payload['nonce']})
+
+    async def start(self) -> None:
+        """|coro|
+
+        Launches every cluster and routes messages between them until they all exit.
+        """
+        shard_count = self.shard_count or await self._fetch_shard_count()
+        self.assignments = assignments = self._assign(shard_count)
+
+        loop = asyncio.get_running_loop()
+        for cluster_id in range(self.clusters):
+            parent, child = self._context.Pipe()
+            process = self._context.Process(
+                target=_run_cluster,
+                args=(self.factory, self.token, cluster_id, assignments, shard_count, child),
+                name=f'pda-cluster-{cluster_id}',
+            )
+            process.start()
+            child.close()
+
+            _log.info('Launched cluster %s with shard IDs %s.', cluster_id, assignments[cluster_id])
+            self._processes.append(process)
+            self._connections[cluster_id] = parent
+            loop.add_reader(parent.fileno(), self._read, cluster_id)
+
+        try:
+            await asyncio.gather(*(loop.run_in_executor(None, process.join) for process in self._processes))
+        finally:
+            self.terminate()
+
+    def terminate(self) -> None:
+        """Terminates every cluster that is still running."""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+
+    def run(self) -> None:
+        """A blocking call that launches the clusters and waits until they all exit."""
+        try:
+            asyncio.run(self.start())
+        except KeyboardInterrupt:
+            _log.info('Received signal to terminate the clusters.')
+            self.terminate()
@@ -0,0 +1,264 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import sys
+from typing import Any, Callable, Coroutine, Deque, Dict, Mapping, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import Client
+
+__all__ = (
+    'EventPolicy',
+    'EventMetrics',
+)
+
+_log = logging.getLogger(__name__)
+
+# tasks that finish before their first suspension never touch the event loop
+_EAGER_START = sys.version_info >= (3, 12)
+
+_OVERFLOW = ('drop_newest', 'drop_oldest')
+
+
+class EventPolicy:
+    """Controls how the event handlers dispatched by :class:`Client` are executed.
+
+    By default every event handler runs in a new task as soon as its event is
+    dispatched. A policy bounds how many handlers run at once, queueing the
+    rest, and what to do once the queue is full.
+
+    Policies are passed to :class:`Client` through the ``event_policy`` and
+    ``event_policies`` parameters.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    max_concurrency: Optional[:class:`int`]
+        The maximum number of handlers running at once. ``None`` means there is
+        no limit, in which case nothing is ever queued.
+    max_queued: Optional[:class:`int`]
+        The maximum number of handlers waiting for a free slot. ``None`` means
+        the queue is unbounded.
+    overflow: :class:`str`
+        What to do with a handler dispatched while the queue is full, either
+        ``'drop_newest'`` (the default) to drop it, or ``'drop_oldest'`` to drop
+        the handler that has been waiting the longest and queue the new one.
+    inline: :class:`bool`
+        Whether to start handlers right away inside :meth:`Client.dispatch` rather
+        than on the next iteration of the event loop. Handlers that finish without
+        suspending then never become a scheduled task, which suits cheap handlers
+        such as counters. This requires Python 3.12 or newer and is ignored on
+        older versions.
+
+    Raises
+    -------
+    ValueError
+        An invalid limit or overflow strategy was passed.
+    """
+
+    __slots__ = ('max_concurrency', 'max_queued', 'overflow', 'inline')
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        overflow: str = 'drop_newest',
+        inline: bool = False,
+    ):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        if max_queued is not None and max_queued < 0:
+            raise ValueError('max_queued must not be negative')
+        if overflow not in _OVERFLOW:
+            raise ValueError(f"overflow must be 'drop_newest' or 'drop_oldest', not {overflow!r}")
+
+        self.max_concurrency: Optional[int] = max_concurrency
+        self.max_queued: Optional[int] = max_queued
+        self.overflow: str = overflow
+        self.inline: bool = inline
+
+    def __repr__(self) -> str:
+        return (
+            f'<EventPolicy max_concurrency={self.max_concurrency} max_queued={self.max_queued} '
+            f'overflow={self.overflow!r} inline={self.inline}>'
+        )
+
+
+class EventMetrics:
+    """The execution metrics of the handlers governed by an :class:`EventPolicy`.
+
+    These are returned by :attr:`Client.event_metrics`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    queued: :class:`int`
+        The number of handlers currently waiting for a free slot.
+    running: :class:`int`
+        The number of handlers currently running.
+    handled: :class:`int`
+        The number of handlers that finished running.
+    dropped: :class:`int`
+        The number of handlers dropped because the queue was full.
+    wait: :class:`float`
+        The total number of seconds finished handlers spent queued.
+    latency: :class:`float`
+        The total number of seconds finished handlers spent running.
+    max_latency: :class:`float`
+        The longest a single handler spent running, in seconds.
+    """
+
+    __slots__ = ('queued', 'running', 'handled', 'dropped', 'wait', 'latency', 'max_latency')
+
+    def __init__(self) -> None:
+        self.queued: int = 0
+        self.running: int = 0
+        self.handled: int = 0
+        self.dropped: int = 0
+        self.wait: float = 0.0
+        self.latency: float = 0.0
+        self.max_latency: float = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f'<EventMetrics queued={self.queued} running={self.running} handled={self.handled} '
+            f'dropped={self.dropped} average_latency={self.average_latency:.6f}>'
+        )
+
+    @property
+    def average_wait(self) -> float:
+        """:class:`float`: The average number of seconds a finished handler spent queued."""
+        return self.wait / self.handled if self.handled else 0.0
+
+    @property
+    def average_latency(self) -> float:
+        """:class:`float`: The average number of seconds a finished handler spent running."""
+        return self.latency / self.handled if self.handled else 0.0
+
+
+# (handler, event name, args, kwargs, time queued)
+_Pending = Tuple[Callable[..., Coroutine[Any, Any, Any]], str, Tuple[Any, ...], Dict[str, Any], float]
+
+
+class _EventLane:
+    __slots__ = ('client', 'policy', 'metrics', 'queue')
+
+    def __init__(self, client: Client, policy: EventPolicy) -> None:
+        self.client: Client = client
+        self.policy: EventPolicy = policy
+        self.metrics: EventMetrics = EventMetrics()
+        self.queue: Deque[_Pending] = collections.deque()
+
+    def submit(self, coro: Callable[..., Coroutine[Any, Any, Any]], event_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[asyncio.Task]:
+        policy = self.policy
+        metrics = self.metrics
+        now = self.client.loop.time()
+        if policy.max_concurrency is None or metrics.running < policy.max_concurrency:
+            return self._start(coro, event_name, args, kwargs, now, now)
+
+        queue = self.queue
+        if policy.max_queued is not None and len(queue) >= policy.max_queued:
+            metrics.dropped += 1
+            if policy.overflow == 'drop_newest' or not queue:
+                _log.debug('Dropping %s handler %s, the event queue is full.', event_name, coro)
+                return None
+
+            dropped = queue.popleft()
+            _log.debug('Dropping %s handler %s, the event queue is full.', dropped[1], dropped[0])
+
+        queue.append((coro, event_name, args, kwargs, now))
+        metrics.queued = len(queue)
+        return None
+
+    def _start(
+        self,
+        coro: Callable[..., Coroutine[Any, Any, Any]],
+        event_name: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        queued_at: float,
+        now: float,
+        *,
+        eager: bool = True,
+    ) -> asyncio.Task:
+        self.metrics.running += 1
+        self.metrics.wait += now - queued_at
+        wrapped = self._run(coro, event_name, args, kwargs)
+        name = f'pda.py: {event_name}'
+        if eager and _EAGER_START and self.policy.inline:
+            return asyncio.Task(wrapped, loop=self.client.loop, name=name, eager_start=True)  # type: ignore
+        return asyncio.create_task(wrapped, name=name)
+
+    async def _run(self, coro: Callable[..., Coroutine[Any, Any, Any]], event_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        loop = self.client.loop
+        start = loop.time()
+        try:
+            await self.client._run_event(coro, event_name, *args, **kwargs)
+        finally:
+            now = loop.time()
+            elapsed = now - start
+            metrics = self.metrics
+            metrics.running -= 1
+            metrics.handled += 1
+            metrics.latency += elapsed
+            if elapsed > metrics.max_latency:
+                metrics.max_latency = elapsed
+
+            # hand the freed slot to the handler that has been waiting the longest
+            queue = self.queue
+            if queue:
+                coro, event_name, args, kwargs, queued_at = queue.popleft()
+                metrics.queued = len(queue)
+                # not eagerly, a backlog of inline handlers would otherwise recurse
+                self._start(coro, event_name, args, kwargs, queued_at, now, eager=False)
+
+
+class EventDispatcher:
+    # Runs the handlers scheduled by Client._schedule_event according to the
+    # configured policies, one lane per policy.
+
+    __slots__ = ('default', 'lanes')
+
+    def __init__(self, client: Client, default: Optional[EventPolicy], policies: Mapping[str, EventPolicy]) -> None:
+        self.default: _EventLane = _EventLane(client, default or EventPolicy())
+        # event name without the on_ prefix -> lane
+        self.lanes: Dict[str, _EventLane] = {event: _EventLane(client, policy) for event, policy in policies.items()}
+
+    def schedule(self, coro: Callable[..., Coroutine[Any, Any, Any]], event_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[asyncio.Task]:
+        event = event_name[3:] if event_name.startswith('on_') else event_name
+        lane = self.lanes.get(event, self.default)
+        return lane.submit(coro, event_name, args, kwargs)
+
+    def metrics(self) -> Dict[Optional[str], EventMetrics]:
+        metrics: Dict[Optional[str], EventMetrics] = {event: lane.metrics for event, lane in self.lanes.items()}
+        metrics[None] = self.default.metrics
+        return metrics
@@ -0,0 +1,279 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable, Dict, List, Tuple
+
+# An encoder and decoder for the subset of the Erlang External Term Format
+# that the gateway uses with ``encoding=etf``. Binaries are decoded to str and
+# the nil, true and false atoms to None, True and False, so that the payloads
+# look the same as with JSON, except that snowflakes arrive as ints already.
+
+__all__ = ()
+
+VERSION = 131
+
+NEW_FLOAT_EXT = 70
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+SMALL_ATOM_EXT = 115
+MAP_EXT = 116
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+_ATOMS: Dict[str, Any] = {'nil': None, 'null': None, 'true': True, 'false': False}
+
+_unpack_int = struct.Struct('>i').unpack_from
+_unpack_uint = struct.Struct('>I').unpack_from
+_unpack_ushort = struct.Struct('>H').unpack_from
+_unpack_double = struct.Struct('>d').unpack_from
+_pack_int = struct.Struct('>i').pack
+_pack_uint = struct.Struct('>I').pack
+_pack_double = struct.Struct('>d').pack
+
+
+def _decode_small_int(data: bytes, pos: int) -> Tuple[Any, int]:
+    return data[pos], pos + 1
+
+
+def _decode_int(data: bytes, pos: int) -> Tuple[Any, int]:
+    return _unpack_int(data, pos)[0], pos + 4
+
+
+def _decode_new_float(data: bytes, pos: int) -> Tuple[Any, int]:
+    return _unpack_double(data, pos)[0], pos + 8
+
+
+def _decode_float(data: bytes, pos: int) -> Tuple[Any, int]:
+    return float(data[pos : pos + 31].rstrip(b'\x00')), pos + 31
+
+
+def _atom(name: str) -> Any:
+    return _ATOMS.get(name, name)
+
+
+def _decode_atom(data: bytes, pos: int) -> Tuple[Any, int]:
+    length = _unpack_ushort(data, pos)[0]
+    pos += 2
+    return _atom(data[pos : pos + length].decode('utf-8')), pos + length
+
+
+def _decode_small_atom(data: bytes, pos: int) -> Tuple[Any, int]:
+    length = data[pos]
+    pos += 1
+    return _atom(data[pos : pos + length].decode('utf-8')), pos + length
+
+
+def _decode_binary(data: bytes, pos: int) -> Tuple[Any, int]:
+    length = _unpack_uint(data, pos)[0]
+    pos += 4
+    return data[pos : pos + length].decode('utf-8'), pos + length
+
+
+def _decode_string(data: bytes, pos: int) -> Tuple[Any, int]:
+    # a list of small integers, not text
+    length = _unpack_ushort(data, pos)[0]
+    pos += 2
+    return list(data[pos : pos + length]), pos + length
+
+
+def _decode_nil(data: bytes, pos: int) -> Tuple[Any, int]:
+    return [], pos
+
+
+def _decode_items(data: bytes, pos: int, length: int) -> Tuple[List[Any], int]:
+    items = []
+    append = items.append
+    for _ in range(length):
+        decoder = _DECODERS[data[pos]]
+        value, pos = decoder(data, pos + 1)
+        append(value)
+    return items, pos
+
+
+def _decode_list(data: bytes, pos: int) -> Tuple[Any, int]:
+    items, pos = _decode_items(data, pos + 4, _unpack_uint(data, pos)[0])
+    # the tail of a proper list is NIL_EXT
+    tail, pos = _DECODERS[data[pos]](data, pos + 1)
+    if tail != []:
+        items.append(tail)
+    return items, pos
+
+
+def _decode_small_tuple(data: bytes, pos: int) -> Tuple[Any, int]:
+    return _decode_items(data, pos + 1, data[pos])
+
+
+def _decode_large_tuple(data: bytes, pos: int) -> Tuple[Any, int]:
+    return _decode_items(data, pos + 4, _unpack_uint(data, pos)[0])
+
+
+def _decode_map(data: bytes, pos: int) -> Tuple[Any, int]:
+    length = _unpack_uint(data, pos)[0]
+    pos += 4
+    result = {}
+    for _ in range(length):
+        key, pos = _DECODERS[data[pos]](data, pos + 1)
+        value, pos = _DECODERS[data[pos]](data, pos + 1)
+        result[key] = value
+    return result, pos
+
+
+def _decode_big(data: bytes, pos: int, length: int) -> Tuple[Any, int]:
+    sign = data[pos]
+    pos += 1
+    value = int.from_bytes(data[pos : pos + length], 'little')
+    return (-value if sign else value), pos + length
+
+
+def _decode_small_big(data: bytes, pos: int) -> Tuple[Any, int]:
+    return _decode_big(data, pos + 1, data[pos])
+
+
+def _decode_large_big(data: bytes, pos: int) -> Tuple[Any, int]:
+    return _decode_big(data, pos + 4, _unpack_uint(data, pos)[0])
+
+
+def _decode_compressed(data: bytes, pos: int) -> Tuple[Any, int]:
+    import zlib
+
+    size = _unpack_uint(data, pos)[0]
+    obj = zlib.decompressobj()
+    inner = obj.decompress(data[pos + 4 :], size)
+    value, _ = _DECODERS[inner[0]](inner, 1)
+    return value, len(data) - len(obj.unused_data)
+
+
+def _unknown_tag(data: bytes, pos: int) -> Tuple[Any, int]:
+    raise ValueError(f'unsupported ETF tag {data[pos - 1]} at offset {pos - 1}')
+
+
+_DECODERS: List[Callable[[bytes, int], Tuple[Any, int]]] = [_unknown_tag] * 256
+_DECODERS[NEW_FLOAT_EXT] = _decode_new_float
+_DECODERS[COMPRESSED] = _decode_compressed
+_DECODERS[SMALL_INTEGER_EXT] = _decode_small_int
+_DECODERS[INTEGER_EXT] = _decode_int
+_DECODERS[FLOAT_EXT] = _decode_float
+_DECODERS[ATOM_EXT] = _decode_atom
+_DECODERS[SMALL_TUPLE_EXT] = _decode_small_tuple
+_DECODERS[LARGE_TUPLE_EXT] = _decode_large_tuple
+_DECODERS[NIL_EXT] = _decode_nil
+_DECODERS[STRING_EXT] = _decode_string
+_DECODERS[LIST_EXT] = _decode_list
+_DECODERS[BINARY_EXT] = _decode_binary
+_DECODERS[SMALL_BIG_EXT] = _decode_small_big
+_DECODERS[LARGE_BIG_EXT] = _decode_large_big
+_DECODERS[SMALL_ATOM_EXT] = _decode_small_atom
+_DECODERS[MAP_EXT] = _decode_map
+_DECODERS[ATOM_UTF8_EXT] = _decode_atom
+_DECODERS[SMALL_ATOM_UTF8_EXT] = _decode_small_atom
+
+
+def loads(data: bytes) -> Any:
+    """Decodes an ETF term, such as a gateway payload."""
+    if not data or data[0] != VERSION:
+        raise ValueError('not an ETF term')
+
+    value, _ = _DECODERS[data[1]](data, 2)
+    return value
+
+
+def _encode_atom(name: bytes, buf: bytearray) -> None:
+    buf.append(SMALL_ATOM_UTF8_EXT)
+    buf.append(len(name))
+    buf += name
+
+
+def _encode(obj: Any, buf: bytearray) -> None:
+    if obj is None:
+        _encode_atom(b'nil', buf)
+    elif obj is True:
+        _encode_atom(b'true', buf)
+    elif obj is False:
+        _encode_atom(b'false', buf)
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        buf.append(BINARY_EXT)
+        buf += _pack_uint(len(data))
+        buf += data
+    elif isinstance(obj, int):
+        if 0 <= obj <= 255:
+            buf.append(SMALL_INTEGER_EXT)
+            buf.append(obj)
+        elif -(2**31) <= obj < 2**31:
+            buf.append(INTEGER_EXT)
+            buf += _pack_int(obj)
+        else:
+            magnitude = abs(obj)
+            data = magnitude.to_bytes((magnitude.bit_length() + 7) // 8, 'little')
+            if len(data) > 255:
+                raise ValueError('integer is too large to encode')
+            buf.append(SMALL_BIG_EXT)
+            buf.append(len(data))
+            buf.append(obj < 0)
+            buf += data
+    elif isinstance(obj, float):
+        buf.append(NEW_FLOAT_EXT)
+        buf += _pack_double(obj)
+    elif isinstance(obj, dict):
+        buf.append(MAP_EXT)
+        buf += _pack_uint(len(obj))
+        for key, value in obj.items():
+            _encode(key, buf)
+            _encode(value, buf)
+    elif isinstance(obj, (list, tuple)):
+        if obj:
+            buf.append(LIST_EXT)
+            buf += _pack_uint(len(obj))
+            for value in obj:
+                _encode(value, buf)
+        buf.append(NIL_EXT)
+    elif isinstance(obj, (bytes, bytearray)):
+        buf.append(BINARY_EXT)
+        buf += _pack_uint(len(obj))
+        buf += obj
+    else:
+        raise TypeError(f'cannot encode {obj.__class__.__name__!r} objects as ETF')
+
+
+def dumps(obj: Any) -> bytes:
+    """Encodes an object as an ETF term, such as a gateway payload."""
+    buf = bytearray()
+    buf.append(VERSION)
+    _encode(obj, buf)
+    return bytes(buf)
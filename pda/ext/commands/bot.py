@@ -244,6 +244,10 @@ class BotBase(GroupMixin):
 
     # internal helpers
 
+    def _has_listeners(self, event: str) -> bool:
+        # super() will resolve to Client
+        return super()._has_listeners(event) or bool(self.extra_events.get("on_" + event))  # type: ignore
+
     def dispatch(self, event_name: str, *args: Any, **kwargs: Any) -> None:
         # super() will resolve to Client
         super().dispatch(event_name, *args, **kwargs)  # type: ignore
@@ -298,7 +302,7 @@ class BotBase(GroupMixin):
             )
 
     @pda.utils.copy_doc(pda.Client.close)
-    async def close(self) -> None:
+    async def close(self, *, resumable: bool = False) -> None:
         for extension in tuple(self.__extensions):
             try:
                 self.unload_extension(extension)
@@ -311,7 +315,7 @@ class BotBase(GroupMixin):
             except Exception:
                 pass
 
-        await super().close()  # type: ignore
+        await super().close(resumable=resumable)  # type: ignore
 
     async def on_command_error(
         self, context: Context, exception: errors.CommandError
@@ -599,6 +603,8 @@ class BotBase(GroupMixin):
         else:
             self.extra_events[name] = [func]
 
+        self._connection._update_lazy_parsers()
+
     def remove_listener(self, func: CoroFunc, name: str = MISSING) -> None:
         """Removes a listener from the pool of listeners.
 
@@ -618,6 +624,8 @@ class BotBase(GroupMixin):
                 self.extra_events[name].remove(func)
             except ValueError:
                 pass
+            else:
+                self._connection._update_lazy_parsers()
 
     def listen(self, name: str = MISSING) -> Callable[[CFT], CFT]:
         """A decorator that registers another function as an external
@@ -783,6 +791,8 @@ class BotBase(GroupMixin):
             for index in reversed(remove):
                 del event_list[index]
 
+        self._connection._update_lazy_parsers()
+
     def _call_module_finalizers(self, lib: types.ModuleType, key: str) -> None:
         try:
             func = getattr(lib, "teardown")
@@ -1189,7 +1199,7 @@ class BotBase(GroupMixin):
         ctx = await self.get_context(message)
         await self.invoke(ctx)
         
-    async def invoke_slash_command(self, interaction: pda.Interaction):
+    async def invoke_slash_command(self, interaction: pda.Interaction, *, cls: Type[CXT] = Context):
         interaction.data = cast(ApplicationCommandInteractionData, interaction.data)
         command_name, command_options = _unwrap_slash_groups(interaction.data)
 
@@ -1210,8 +1220,23 @@ class BotBase(GroupMixin):
             interaction.channel = channel # type: ignore
         del channel
 
-        # Fetch a valid prefix, so process_commands can function
         message = _FakeSlashMessage.from_interaction(interaction)
+        if command._slash_native:
+            # The options already carry typed and resolved values, so they are
+            # mapped straight onto the parameters. Only the subcommand names go
+            # through the view, for the groups to find their subcommand.
+            root, _, subcommands = command_name.partition(' ')
+            message.content = f'/{command_name}'
+            view = StringView(subcommands)
+            ctx = cls(prefix='/', view=view, bot=self, message=message, interaction=interaction)
+            ctx.invoked_with = root
+            ctx.command = self.all_commands.get(root)
+            ctx._slash_command = command
+            ctx._slash_options = command_options  # type: ignore
+            await self.invoke(ctx)
+            return
+
+        # Fetch a valid prefix, so process_commands can function
         prefix = await self.get_prefix(message)
         if isinstance(prefix, list):
             prefix = prefix[0]
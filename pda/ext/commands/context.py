@@ -38,6 +38,7 @@ if TYPE_CHECKING:
 
     from pda.abc import MessageableChannel
     from pda.guild import Guild
+    from pda.interactions import Interaction
     from pda.member import Member
     from pda.state import ConnectionState
     from pda.user import ClientUser, User
@@ -120,6 +121,11 @@ class Context(pda.abc.Messageable, Generic[BotT]):
     command_failed: :class:`bool`
         A boolean that indicates if the command failed to be parsed, checked,
         or invoked.
+    interaction: Optional[:class:`~pda.Interaction`]
+        The interaction that triggered the command, if it was invoked
+        as a slash command.
+
+        .. versionadded:: 2.0
     """
 
     def __init__(self,
@@ -137,6 +143,7 @@ class Context(pda.abc.Messageable, Generic[BotT]):
         subcommand_passed: Optional[str] = None,
         command_failed: bool = False,
         current_parameter: Optional[inspect.Parameter] = None,
+        interaction: Optional[Interaction] = None,
     ):
         self.message: Message = message
         self.bot: BotT = bot
@@ -151,6 +158,10 @@ class Context(pda.abc.Messageable, Generic[BotT]):
         self.subcommand_passed: Optional[str] = subcommand_passed
         self.command_failed: bool = command_failed
         self.current_parameter: Optional[inspect.Parameter] = current_parameter
+        self.interaction: Optional[Interaction] = interaction
+        # the options of the interaction, for the command they map onto directly
+        self._slash_command: Optional[Command] = None
+        self._slash_options: List[Dict[str, Any]] = []
         self._state: ConnectionState = self.message._state
 
     async def invoke(self, command: Command[CogT, P, T], /, *args: P.args, **kwargs: P.kwargs) -> T:
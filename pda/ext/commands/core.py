@@ -128,6 +128,44 @@ if TYPE_CHECKING:
 else:
     P = TypeVar('P')
 
+def _resolve_slash_option(ctx: Context, option_type: int, value: Any, resolved: Dict[str, Any]) -> Any:
+    # snowflake options are looked up in the cache first, then in the
+    # objects the interaction resolved, without ever fetching them
+    if option_type not in (6, 7, 8, 9):
+        return value
+
+    snowflake = int(value)
+    guild = ctx.guild
+    state = ctx._state
+    if option_type in (6, 9):
+        member = guild.get_member(snowflake) if guild is not None else None
+        if member is not None:
+            return member
+        user = resolved.get('users', {}).get(value)
+        if user is not None:
+            member = resolved.get('members', {}).get(value)
+            if guild is not None and member is not None:
+                return pda.Member(data={**member, 'user': user}, guild=guild, state=state)
+            return state.store_user(user)
+
+    if option_type in (8, 9) and guild is not None:
+        role = guild.get_role(snowflake)
+        if role is not None:
+            return role
+        data = resolved.get('roles', {}).get(value)
+        if data is not None:
+            return pda.Role(guild=guild, state=state, data=data)
+
+    if option_type == 7:
+        if guild is not None:
+            channel = guild.get_channel_or_thread(snowflake)
+        else:
+            channel = ctx.bot.get_channel(snowflake)
+        if channel is not None:
+            return channel
+
+    return value
+
 def unwrap_function(function: Callable[..., Any]) -> Callable[..., Any]:
     partial = functools.partial
     while True:
@@ -722,6 +760,9 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
         return self.qualified_name
 
     async def _parse_arguments(self, ctx: Context) -> None:
+        if ctx._slash_command is self:
+            return await self._parse_slash_arguments(ctx)
+
         ctx.args = [ctx] if self.cog is None else [self.cog, ctx]
         ctx.kwargs = {}
         args = ctx.args
@@ -771,6 +812,67 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
         if not self.ignore_extra and not view.eof:
             raise TooManyArguments('Too many arguments passed to ' + self.qualified_name)
 
+    @property
+    def _slash_native(self) -> bool:
+        # greedy, variadic and flag parameters can span several words,
+        # so only the text parser knows how to fill them
+        if self.rest_is_raw:
+            return False
+
+        for param in self.clean_params.values():
+            if param.kind == param.VAR_POSITIONAL:
+                return False
+            converter = get_converter(param)
+            if isinstance(converter, Greedy) or hasattr(converter, '__commands_is_flag__'):
+                return False
+        return True
+
+    async def _parse_slash_arguments(self, ctx: Context) -> None:
+        ctx.args = [ctx] if self.cog is None else [self.cog, ctx]
+        ctx.kwargs = {}
+
+        resolved = ctx.interaction.data.get('resolved', {})  # type: ignore
+        options = {option['name']: option for option in ctx._slash_options}
+        for name, param in self.clean_params.items():
+            ctx.current_parameter = param
+            option = options.get(name)
+            if option is None:
+                if param.default is not param.empty:
+                    value = param.default
+                elif self._is_typing_optional(param.annotation):
+                    value = None
+                else:
+                    raise MissingRequiredArgument(param)
+            else:
+                value = await self._convert_slash_option(ctx, param, option, resolved)
+
+            if param.kind == param.KEYWORD_ONLY:
+                ctx.kwargs[name] = value
+            else:
+                ctx.args.append(value)
+
+    async def _convert_slash_option(self, ctx: Context, param: inspect.Parameter, option: Dict[str, Any], resolved: Dict[str, Any]) -> Any:
+        converter = get_converter(param)
+        value = option.get('value')
+        obj = _resolve_slash_option(ctx, option['type'], value, resolved)
+
+        if getattr(converter, '__origin__', None) is Union:
+            targets = converter.__args__
+        else:
+            targets = (converter,)
+
+        for target in targets:
+            target = REVERSED_CONVERTER_MAPPING.get(target, target)
+            try:
+                if target is not type(None) and isinstance(obj, target):
+                    return obj
+            except TypeError:
+                # not a class, e.g. Literal or a converter instance
+                continue
+
+        # the value is not of the annotated type, so convert it like the text would be
+        return await run_converters(ctx, converter, str(value), param)
+
     async def call_before_hooks(self, ctx: Context) -> None:
         # now that we're done preparing we can call the pre-command hooks
         # first, call the command local hook:
@@ -8,6 +8,8 @@ from __future__ import annotations
 import sys
 from warnings import warn
 import asyncio
+import hashlib
+import json
 import logging
 from functools import partial
 from inspect import signature
@@ -158,6 +160,12 @@ class Context(pda.Object, _AsyncInit):
         self.client = client
         self.command = cmd
         self.id = int(event["id"])
+        # fetches that would not finish within this budget are skipped
+        # in favor of the partial objects, so that there is still time
+        # left to respond to the interaction
+        self._deadline = self.client.loop.time() + self.client.resolve_timeout
+        # everything else may need the guild, so it goes first;
+        # this only costs a round trip if it has to be fetched
         if event.get("guild_id", None):
             self.guild = await self._try_get(
                 pda.Object(event["guild_id"]),
@@ -167,51 +175,57 @@ class Context(pda.Object, _AsyncInit):
             )
         else:
             self.guild = None
-        self.channel = await self._try_get(
-            pda.Object(event["channel_id"]),
-            self.client.get_channel,
-            self.client.fetch_channel,
-            "channel",
-        )
-        if event.get("member", None):
-            author = PartialMember(
-                data=event["member"], guild=self.guild, state=self.client._connection
-            )
-            self.author = await self._try_get(
-                author, self._get_member, self._fetch_member, "author-member"
-            )
-        else:
-            self.author = None
         self.token = event["token"]
-        # construct options into function-friendly form
-        await self._kwargs_from_options(
-            event["data"].get("options", []),
-            event["data"].get(
-                "resolved", {"members": {}, "users": {}, "channels": {}, "roles": {}}
+        self.webhook = None
+        self.channel, self.author, self.me, _ = await asyncio.gather(
+            self._try_get(
+                pda.Object(event["channel_id"]),
+                self.client.get_channel,
+                self.client.fetch_channel,
+                "channel",
+            ),
+            self._try_get_author(event.get("member", None)),
+            self._try_get(
+                pda.Object(self.client.user.id),
+                self._get_member,
+                self._fetch_member,
+                "me-member",
+            ),
+            # construct options into function-friendly form
+            self._kwargs_from_options(
+                event["data"].get("options", []),
+                event["data"].get(
+                    "resolved",
+                    {"members": {}, "users": {}, "channels": {}, "roles": {}},
+                ),
             ),
         )
-        self.me = await self._try_get(
-            pda.Object(self.client.user.id),
-            self._get_member,
-            self._fetch_member,
-            "me-member",
+
+    async def _try_get_author(self, member: Optional[dict]):
+        if not member:
+            return None
+        author = PartialMember(
+            data=member, guild=self.guild, state=self.client._connection
+        )
+        return await self._try_get(
+            author, self._get_member, self._fetch_member, "author-member"
         )
-        self.webhook = None
 
     async def _kwargs_from_options(self, options, resolved):
         self.cog = self.command.cog
         kwargs = {}
+        # option name -> coroutine function resolving its value,
+        # all of which are run concurrently once the command is known
+        pending = {}
         for opt in options:
             if "value" in opt:
                 value = opt["value"]
-                for k, v in self.command.options.items():
-                    if v.name == opt["name"]:
-                        opt["name"] = k
-                        break
-                else:
+                try:
+                    opt["name"] = self.command._option_params[opt["name"]]
+                except KeyError:
                     raise commands.CommandInvokeError(
                         f'No such option: {opt["name"]!r}'
-                    )
+                    ) from None
                 opttype = self.command.options[opt["name"]].type
                 try:
                     opttype = ApplicationCommandOptionType(opttype)
@@ -225,17 +239,17 @@ class Context(pda.Object, _AsyncInit):
                 }:
                     value = pda.Object(value)
                 if opttype == ApplicationCommandOptionType.USER:
-                    value = await self._try_get_user(value, resolved)
+                    pending[opt["name"]] = partial(self._try_get_user, value, resolved)
                 elif opttype == ApplicationCommandOptionType.CHANNEL:
-                    value = await self._try_get_channel(value, resolved)
+                    pending[opt["name"]] = partial(
+                        self._try_get_channel, value, resolved
+                    )
                 elif opttype == ApplicationCommandOptionType.ROLE:
-                    value = await self._try_get_role(value, resolved)
+                    pending[opt["name"]] = partial(self._try_get_role, value, resolved)
                 elif opttype == ApplicationCommandOptionType.MENTIONABLE:
-                    # mention less people by default, though no two objects
-                    # should have the same snowflake ID anyway
-                    value = await self._try_get_user(value, resolved, False)
-                    if type(value) is pda.Object:
-                        value = await self._try_get_role(value, resolved)
+                    pending[opt["name"]] = partial(
+                        self._try_get_mentionable, value, resolved
+                    )
                 kwargs[opt["name"]] = value
             elif "options" in opt:
                 self.command = self.command.slash[opt["name"]]
@@ -245,6 +259,8 @@ class Context(pda.Object, _AsyncInit):
             self.command = self.command.slash[opt["name"]]
             await self._kwargs_from_options(opt.get("options", []), resolved)
         elif isinstance(self.command, Command):
+            values = await asyncio.gather(*(func() for func in pending.values()))
+            kwargs.update(zip(pending.keys(), values))
             kwargs[self.command._ctx_arg] = self
             self.options = kwargs
 
@@ -274,7 +290,7 @@ class Context(pda.Object, _AsyncInit):
                         default.id,
                         self.id,
                     )
-                    obj = await fetch_method(default.id)
+                    obj = await self._fetch(fetch_method, default.id)
                 elif not fng:
                     raise ValueError
                 else:
@@ -282,7 +298,7 @@ class Context(pda.Object, _AsyncInit):
                         "Got %s %s for interaction %s", typename, obj.id, self.id
                     )
                     return obj
-            except pda.HTTPException:
+            except (pda.HTTPException, asyncio.TimeoutError):
                 logger.debug(
                     "Fetching %s %s for interaction %s failed%s",
                     typename,
@@ -404,6 +420,20 @@ class Context(pda.Object, _AsyncInit):
             resolved=resolved,
         )
 
+    async def _try_get_mentionable(self, value: pda.Object, resolved: dict):
+        # mention less people by default, though no two objects
+        # should have the same snowflake ID anyway
+        value = await self._try_get_user(value, resolved, False)
+        if type(value) is pda.Object:
+            value = await self._try_get_role(value, resolved)
+        return value
+
+    async def _fetch(self, fetch_method, oid):
+        remaining = self._deadline - self.client.loop.time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        return await asyncio.wait_for(fetch_method(oid), remaining)
+
     def _get_member(self, mid):
         return self.guild.get_member(mid)
 
@@ -490,7 +520,7 @@ class Context(pda.Object, _AsyncInit):
             if mentions is not None:
                 data["data"]["allowed_mentions"] = mentions.to_dict()
             if ephemeral:
-                flags = (flags or 0) | MessageFlags.EPHEMERAL
+                flags = (flags or 0) | CallbackFlags.EPHEMERAL
             if flags:
                 data.setdefault("data", {})["flags"] = int(flags)
             path = f"/interactions/{self.id}/{self.token}/callback"
@@ -779,6 +809,8 @@ class Command(pda.Object):
                     typ.name = param.name
         if self._ctx_arg is None:
             raise ValueError("One argument must be type-hinted slash.Context")
+        # API option name -> parameter name, for resolving invocations
+        self._option_params = {opt.name: param for param, opt in self.options.items()}
         self.coro = coro
 
         async def check(*args, **kwargs):
@@ -1019,6 +1051,12 @@ def group(**kwargs):
     return decorator
 
 
+def _command_hash(cmd: Command) -> str:
+    """Content hash of what registering ``cmd`` sends to the API."""
+    data = json.dumps(cmd.to_dict(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
 def permit(
     target: Union[pda.Role, pda.abc.User, pda.Object],
     perm: bool,
@@ -1053,6 +1091,22 @@ class SlashBot(commands.Bot):
     :param bool fetch_if_not_get:
         If :const:`False` (the default), pda objects passed in arguments
         will not be fetched from the API if retrieving them from cache fails.
+    :param float resolve_timeout:
+        How many seconds (1.5 by default) fetching the objects for a
+        :class:`Context` may take in total. Objects that could not be
+        fetched in time fall back to their resolved or partial versions,
+        leaving time to respond before the interaction expires.
+    :param str command_cache:
+        Path to a file remembering the content hash and ID of every
+        registered command. Scopes (global or a guild) whose commands
+        are unchanged since they were last registered are then not
+        requested from the API at all on startup. Commands changed by
+        other means than this bot are not noticed while this is used.
+    .. attribute:: bulk_overwrite_threshold
+        :type: int
+        :value: 2
+        When at least this many commands change in one scope, they are
+        registered with a single bulk overwrite instead of a request each.
     .. attribute:: app_info
         :type: pda.AppInfo
         Cached output of :meth:`application_info`.
@@ -1070,13 +1124,22 @@ class SlashBot(commands.Bot):
     """
 
     slash: Set[Command]
+    bulk_overwrite_threshold: int = 2
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.debug_guild = int(kwargs.pop("debug_guild", 0) or 0) or None
         self.resolve_not_fetch = bool(kwargs.pop("resolve_not_fetch", True))
         self.fetch_if_not_get = bool(kwargs.pop("fetch_if_not_get", False))
+        self.resolve_timeout = float(kwargs.pop("resolve_timeout", 1.5))
+        self.command_cache = kwargs.pop("command_cache", None)
         self.slash = set()
+        # scope -> command name -> (content hash, ID) as last registered
+        self._command_hashes: Dict[Optional[int], Dict[str, Tuple[str, int]]] = {}
+        # indexes of self.slash used to look up invoked commands
+        self._slash_by_id: Dict[int, Command] = {}
+        self._slash_by_key: Dict[Tuple[str, Optional[int]], Command] = {}
+        self._slash_by_name: Dict[str, Command] = {}
 
         @self.listen()
         async def on_ready():
@@ -1094,10 +1157,57 @@ class SlashBot(commands.Bot):
                 asyncio.create_task(self.close())
                 raise
 
+    def _index_command(self, cmd: Command):
+        self._slash_by_key[cmd.name, cmd.guild_id] = cmd
+        self._slash_by_name.setdefault(cmd.name, cmd)
+        if cmd.id is not None:
+            self._slash_by_id[cmd.id] = cmd
+
+    def _reindex_commands(self):
+        self._slash_by_id.clear()
+        self._slash_by_key.clear()
+        self._slash_by_name.clear()
+        for cmd in self.slash:
+            self._index_command(cmd)
+
+    def _set_command_id(self, cmd: Command, cid: int):
+        if cmd.id is not None and self._slash_by_id.get(cmd.id) is cmd:
+            del self._slash_by_id[cmd.id]
+        cmd.id = cid
+        self._slash_by_id[cid] = cmd
+
+    def _find_command(self, data: dict, guild_id: Optional[int]):
+        cmd = self._slash_by_id.get(int(data["id"]))
+        if cmd is not None:
+            return cmd
+        if len(self._slash_by_key) != len(self.slash):
+            # commands were added to self.slash directly
+            self._reindex_commands()
+            cmd = self._slash_by_id.get(int(data["id"]))
+            if cmd is not None:
+                return cmd
+        warn(
+            f'No command {data["name"]!r} found '
+            f'by ID {data["id"]}, falling back to '
+            "name + guild search",
+            SlashWarning,
+        )
+        cmd = self._slash_by_key.get((data["name"], guild_id))
+        if cmd is None:
+            warn(
+                f'No command {data["name"]!r} found '
+                f"by name and guild ID {guild_id!r}, "
+                "falling back to name-only search",
+                SlashWarning,
+            )
+            cmd = self._slash_by_name.get(data["name"])
+        return cmd
+
     def slash_cmd(self, **kwargs):
         def decorator(func):
             cmd = Command(func, **kwargs)
             self.slash.add(cmd)
+            self._index_command(cmd)
             return cmd
 
         return decorator
@@ -1110,6 +1220,7 @@ class SlashBot(commands.Bot):
         def decorator(func):
             group = Group(func, **kwargs)
             self.slash.add(group)
+            self._index_command(group)
             return group
 
         return decorator
@@ -1129,6 +1240,7 @@ class SlashBot(commands.Bot):
                 obj.cog = cog
                 if obj.parent is None:
                     self.slash.add(obj)
+                    self._index_command(obj)
 
     async def application_info(self):
         """Equivalent to :meth:`pda.Client.application_info`, but
@@ -1144,27 +1256,9 @@ class SlashBot(commands.Bot):
                 ", please open an issue for this: "
                 "https://github.com/Kenny2github/pda-ext-slash/issues/new"
             )
-        cmd = pda.utils.get(self.slash, id=int(event["data"]["id"]))
-        if cmd is None:
-            warn(
-                f'No command {event["data"]["name"]!r} found '
-                f'by ID {event["data"]["id"]}, falling back to '
-                "name + guild search",
-                SlashWarning,
-            )
-            cmd = pda.utils.get(
-                self.slash,
-                name=event["data"]["name"],
-                guild_id=int(event["guild_id"] or 0) or None,
-            )
-        if cmd is None:
-            warn(
-                f'No command {event["data"]["name"]!r} found '
-                f'by name and guild ID {event["guild_id"]!r}, '
-                "falling back to name-only search",
-                SlashWarning,
-            )
-            cmd = pda.utils.get(self.slash, name=event["data"]["name"])
+        cmd = self._find_command(
+            event["data"], int(event.get("guild_id") or 0) or None
+        )
         if cmd is None:
             raise commands.CommandNotFound(
                 f'No command {event["data"]["name"]!r} found by any critera'
@@ -1187,6 +1281,7 @@ class SlashBot(commands.Bot):
 
     async def register_commands(self, guild_id: int = None):
         """Update commands on the API.
+        Every scope (global or a guild) is synced concurrently.
         :param int guild_id:
             Only update commands specific to this guild.
         """
@@ -1199,34 +1294,98 @@ class SlashBot(commands.Bot):
             if guild_id and cmd.guild_id != guild_id:
                 continue
             guilds.setdefault(cmd.guild_id, {})[cmd.name] = cmd
+        # the debug guild may have changed the guild IDs
+        self._reindex_commands()
+        if self.command_cache is not None and not self._command_hashes:
+            self._load_command_cache()
+        await asyncio.gather(
+            *(
+                self._register_scope(
+                    gid,
+                    todo,
+                    global_path if gid is None else guild_path.format(gid),
+                )
+                for gid, todo in guilds.items()
+            )
+        )
+        if self.command_cache is not None:
+            self._save_command_cache()
+
+    async def _register_scope(self, guild_id, todo, path):
+        hashes = {name: _command_hash(cmd) for name, cmd in todo.items()}
+        cached = self._command_hashes.get(guild_id)
+        if cached is not None and {n: h for n, (h, _) in cached.items()} == hashes:
+            logger.debug("Commands in guild\t%s\tare unchanged", guild_id)
+            for name, cmd in todo.items():
+                self._set_command_id(cmd, cached[name][1])
+            return
+        done = await self.http.request(_Route("GET", path))
         state = {"POST": {}, "PATCH": {}, "DELETE": {}}
-        route = _Route("GET", global_path)
-        if None in guilds:
-            global_cmds = await self.http.request(route)
-            await self.sync_cmds(state, guilds[None], global_cmds, None)
-        for guild_id, guild in guilds.items():
-            if guild_id is None:
-                continue
-            route = _Route("GET", guild_path.format(guild_id))
-            guild_cmds = await self.http.request(route)
-            await self.sync_cmds(state, guild, guild_cmds, guild_id)
-        del guilds
-        tasks: List[asyncio.Task] = []
-        for method, guilds in state.items():
-            for guild_id, guild in guilds.items():
-                for name, kwargs in guild.items():
-                    if guild_id is None:
-                        path = global_path
-                    else:
-                        path = guild_path.format(guild_id)
+        await self.sync_cmds(state, todo, done, guild_id)
+        changes = {
+            method: guilds.get(guild_id, {}) for method, guilds in state.items()
+        }
+        if sum(map(len, changes.values())) >= self.bulk_overwrite_threshold:
+            ok = await self._bulk_overwrite(guild_id, todo, path)
+        else:
+            tasks = []
+            for method, cmds in changes.items():
+                for name, kwargs in cmds.items():
+                    cmd_path = path
                     if "id" in kwargs:
-                        path += f'/{kwargs.pop("id")}'
-                    route = _Route(method, path)
-                    task = asyncio.create_task(
-                        self.process_command(name, guild_id, route, kwargs)
-                    )
-                    tasks.append(task)
-        await asyncio.gather(*tasks)
+                        cmd_path += f'/{kwargs.pop("id")}'
+                    route = _Route(method, cmd_path)
+                    tasks.append(self.process_command(name, guild_id, route, kwargs))
+            ok = all(await asyncio.gather(*tasks))
+        if ok:
+            self._command_hashes[guild_id] = {
+                name: (hashes[name], cmd.id) for name, cmd in todo.items()
+            }
+        else:
+            self._command_hashes.pop(guild_id, None)
+
+    async def _bulk_overwrite(self, guild_id, todo, path):
+        route = _Route("PUT", path)
+        try:
+            data = await self.http.request(
+                route, json=[cmd.to_dict() for cmd in todo.values()]
+            )
+        except pda.HTTPException:
+            logger.exception("Error when overwriting commands in guild %s:", guild_id)
+            return False
+        logger.debug("PUT\t%s commands\tin guild\t%s", len(todo), guild_id)
+        for cmd_data in data:
+            cmd = todo.get(cmd_data["name"])
+            if cmd is not None:
+                self._set_command_id(cmd, int(cmd_data["id"]))
+        return True
+
+    def _load_command_cache(self):
+        try:
+            with open(self.command_cache, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.exception("Could not read the command cache")
+            return
+        self._command_hashes = {
+            (None if scope == "global" else int(scope)): {
+                name: (h, int(cid)) for name, (h, cid) in cmds.items()
+            }
+            for scope, cmds in data.items()
+        }
+
+    def _save_command_cache(self):
+        data = {
+            ("global" if scope is None else str(scope)): cmds
+            for scope, cmds in self._command_hashes.items()
+        }
+        try:
+            with open(self.command_cache, "w") as f:
+                json.dump(data, f)
+        except OSError:
+            logger.exception("Could not write the command cache")
 
     async def sync_cmds(self, state, todo, done, guild_id):
         # todo - registered in code
@@ -1251,7 +1410,7 @@ class SlashBot(commands.Bot):
             )
             if up_to_date:
                 logger.debug("GET\t%s\tin guild\t%s", name, guild_id)
-                todo[name].id = int(done[name]["id"])
+                self._set_command_id(todo[name], int(done[name]["id"]))
             else:
                 cmd_dict.pop("name")  # can't pass this to PATCH
                 state["PATCH"].setdefault(guild_id, {})[name] = {
@@ -1270,11 +1429,12 @@ class SlashBot(commands.Bot):
             data = await self.http.request(route, **kwargs)
         except pda.HTTPException:
             logger.exception("Error when processing command %s:", name)
-            return
+            return False
         finally:
             logger.debug("%s\t%s\tin guild\t%s", route.method, name, guild_id)
         if cmd is not None:
-            cmd.id = int(data["id"])
+            self._set_command_id(cmd, int(data["id"]))
+        return True
 
     async def register_permissions(self, guild_id: int = None):
         """Update command permissions on the API.
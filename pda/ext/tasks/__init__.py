@@ -26,6 +26,8 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import heapq
+import time as _time
 from typing import (
     Any,
     Awaitable,
@@ -50,6 +52,7 @@ from pda.utils import MISSING
 
 __all__ = (
     'loop',
+    'Scheduler',
 )
 
 T = TypeVar('T')
@@ -84,6 +87,125 @@ class SleepHandle:
         self.future.cancel()
 
 
+class _ScheduledSleep:
+    __slots__ = ('scheduler', 'loop', 'future', 'entry')
+
+    def __init__(self, scheduler: Scheduler, dt: datetime.datetime, *, loop: asyncio.AbstractEventLoop) -> None:
+        self.scheduler = scheduler
+        self.loop = loop
+        self.future = loop.create_future()
+        self.entry: Optional[List[Any]] = None
+        scheduler._push(self, dt.timestamp(), self.loop)
+
+    def recalculate(self, dt: datetime.datetime) -> None:
+        self.scheduler._discard(self)
+        self.scheduler._push(self, dt.timestamp(), self.loop)
+
+    def wait(self) -> asyncio.Future[Any]:
+        return self.future
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self) -> None:
+        self.scheduler._discard(self)
+        self.future.cancel()
+
+
+class _Unlimited:
+    async def __aenter__(self) -> None:
+        pass
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class Scheduler:
+    r"""A shared timer for many :class:`Loop`\s.
+
+    Loops created with a scheduler do not each arm their own timer for
+    their sleeps. Their wake up times are kept in a single heap instead,
+    and every loop that is due is woken up at once by one timer. This
+    keeps bots with a loop per guild or per user cheap to run.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    max_concurrency: Optional[:class:`int`]
+        How many iterations of the loops using this scheduler may run at
+        the same time. Iterations over the limit wait for a free slot,
+        which shows up in their :attr:`Loop.drift`. ``None`` means no limit.
+    """
+
+    def __init__(self, *, max_concurrency: Optional[int] = None) -> None:
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError('max_concurrency must be greater than 0 or None.')
+
+        self.max_concurrency: Optional[int] = max_concurrency
+        # [timestamp, sequence, sleep], the sleep is None once discarded
+        self._heap: List[List[Any]] = []
+        self._sequence: int = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_when: Optional[float] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def __repr__(self) -> str:
+        return f'<Scheduler pending={self.pending} max_concurrency={self.max_concurrency}>'
+
+    @property
+    def pending(self) -> int:
+        """:class:`int`: The number of loops currently waiting for their next iteration."""
+        return sum(1 for entry in self._heap if entry[2] is not None)
+
+    def _slot(self) -> Union[asyncio.Semaphore, _Unlimited]:
+        if self.max_concurrency is None:
+            return _Unlimited()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _push(self, sleep: _ScheduledSleep, when: float, loop: asyncio.AbstractEventLoop) -> None:
+        self._sequence += 1
+        sleep.entry = entry = [when, self._sequence, sleep]
+        heapq.heappush(self._heap, entry)
+        if self._timer_when is None or when < self._timer_when:
+            self._arm(loop)
+
+    def _discard(self, sleep: _ScheduledSleep) -> None:
+        # entries are dropped lazily once they reach the top of the heap
+        if sleep.entry is not None:
+            sleep.entry[2] = None
+            sleep.entry = None
+
+    def _arm(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = self._timer_when = None
+
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        if not heap:
+            return
+
+        when = heap[0][0]
+        self._timer_when = when
+        self._timer = loop.call_later(max(when - _time.time(), 0), self._fire, loop)
+
+    def _fire(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._timer = self._timer_when = None
+        now = _time.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, sleep = heapq.heappop(heap)
+            if sleep is not None:
+                sleep.entry = None
+                if not sleep.future.done():
+                    sleep.future.set_result(True)
+        self._arm(loop)
+
+
 class Loop(Generic[LF]):
     """A background task helper that abstracts the loop and reconnection logic for you.
 
@@ -100,13 +222,16 @@ class Loop(Generic[LF]):
         count: Optional[int],
         reconnect: bool,
         loop: asyncio.AbstractEventLoop,
+        scheduler: Optional[Scheduler] = None,
     ) -> None:
         self.coro: LF = coro
         self.reconnect: bool = reconnect
         self.loop: asyncio.AbstractEventLoop = loop
+        self.scheduler: Optional[Scheduler] = scheduler
         self.count: Optional[int] = count
         self._current_loop = 0
-        self._handle: SleepHandle = MISSING
+        self._drift: Optional[float] = None
+        self._handle: Union[SleepHandle, _ScheduledSleep] = MISSING
         self._task: asyncio.Task[None] = MISSING
         self._injected = None
         self._valid_exception = (
@@ -145,9 +270,19 @@ class Loop(Generic[LF]):
             await coro(*args, **kwargs)
 
     def _try_sleep_until(self, dt: datetime.datetime):
-        self._handle = SleepHandle(dt=dt, loop=self.loop)
+        if self.scheduler is not None:
+            self._handle = _ScheduledSleep(self.scheduler, dt, loop=self.loop)
+        else:
+            self._handle = SleepHandle(dt=dt, loop=self.loop)
         return self._handle.wait()
 
+    async def _run_iteration(self, *args: Any, **kwargs: Any) -> None:
+        slot = self.scheduler._slot() if self.scheduler is not None else _Unlimited()
+        async with slot:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            self._drift = max((now - self._last_iteration).total_seconds(), 0.0)
+            await self.coro(*args, **kwargs)
+
     async def _loop(self, *args: Any, **kwargs: Any) -> None:
         backoff = ExponentialBackoff()
         await self._call_loop_function('before_loop')
@@ -165,7 +300,7 @@ class Loop(Generic[LF]):
                     self._last_iteration = self._next_iteration
                     self._next_iteration = self._get_next_sleep_time()
                 try:
-                    await self.coro(*args, **kwargs)
+                    await self._run_iteration(*args, **kwargs)
                     self._last_iteration_failed = False
                 except self._valid_exception:
                     self._last_iteration_failed = True
@@ -216,6 +351,7 @@ class Loop(Generic[LF]):
             count=self.count,
             reconnect=self.reconnect,
             loop=self.loop,
+            scheduler=self.scheduler,
         )
         copy._injected = obj
         copy._before_loop = self._before_loop
@@ -264,6 +400,15 @@ class Loop(Generic[LF]):
         if self._time is not MISSING:
             return self._time.copy()
 
+    @property
+    def drift(self) -> Optional[float]:
+        """Optional[:class:`float`]: How many seconds after it was due the latest
+        iteration started. ``None`` if the loop has not run yet.
+
+        .. versionadded:: 2.0
+        """
+        return self._drift
+
     @property
     def current_loop(self) -> int:
         """:class:`int`: The current iteration of the loop."""
@@ -696,6 +841,7 @@ def loop(
     count: Optional[int] = None,
     reconnect: bool = True,
     loop: asyncio.AbstractEventLoop = MISSING,
+    scheduler: Optional[Scheduler] = None,
 ) -> Callable[[LF], Loop[LF]]:
     """A decorator that schedules a task in the background for you with
     optional reconnect logic. The decorator returns a :class:`Loop`.
@@ -731,6 +877,11 @@ def loop(
     loop: :class:`asyncio.AbstractEventLoop`
         The loop to use to register the task, if not given
         defaults to :func:`asyncio.get_event_loop`.
+    scheduler: Optional[:class:`Scheduler`]
+        The scheduler to share the timer of, and to take the concurrency
+        limit from. If not given the loop arms its own timer.
+
+        .. versionadded:: 2.0
 
     Raises
     --------
@@ -751,6 +902,7 @@ def loop(
             time=time,
             reconnect=reconnect,
             loop=loop,
+            scheduler=scheduler,
         )
 
     return decorator
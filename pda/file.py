@@ -23,15 +23,113 @@ DEALINGS IN THE SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import Optional, TYPE_CHECKING, Union
+from collections.abc import AsyncIterable
+from typing import Any, AsyncIterator, Optional, TYPE_CHECKING, Union
 
 import os
 import io
+import mmap
+import tempfile
+
+from aiohttp import payload
 
 __all__ = (
     'File',
 )
 
+# the size of the chunks file bodies are written to the connection in
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class _MmapPayload(payload.Payload):
+    # Writes slices of the mapping straight to the connection
+    # instead of reading the file into new buffers.
+
+    def __init__(self, value: mmap.mmap, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault('content_type', 'application/octet-stream')
+        super().__init__(value, *args, **kwargs)
+        self._start: int = value.tell()
+        self._size = len(value) - self._start
+
+    async def write(self, writer: Any) -> None:
+        view = memoryview(self._value)
+        for start in range(self._start, len(view), UPLOAD_CHUNK_SIZE):
+            await writer.write(view[start : start + UPLOAD_CHUNK_SIZE])
+
+
+payload.PAYLOAD_REGISTRY.register(_MmapPayload, mmap.mmap)
+
+
+class _AsyncSource:
+    # An async iterable upload body that can be sent more than once.
+    #
+    # The first attempt streams the source while spooling it to a temporary
+    # file. Retries finish spooling anything the failed attempt did not get
+    # to and then replay the spool through a memory map, so the source is
+    # only ever iterated once and the body is never held in memory.
+
+    __slots__ = ('_source', '_spool', '_map', '_started', '_exhausted', 'sent')
+
+    def __init__(self, source: AsyncIterable[bytes]) -> None:
+        self._source: AsyncIterator[bytes] = source.__aiter__()
+        self._spool: Optional[Any] = None
+        self._map: Optional[mmap.mmap] = None
+        self._started: bool = False
+        self._exhausted: bool = False
+        # bytes yielded by the current attempt
+        self.sent: int = 0
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        self.sent = 0
+        if self._started:
+            return self._replay()
+        self._started = True
+        return self._stream()
+
+    async def _stream(self) -> AsyncIterator[bytes]:
+        spool = self._spool = tempfile.TemporaryFile()
+        async for chunk in self._source:
+            spool.write(chunk)
+            self.sent += len(chunk)
+            yield chunk
+        self._exhausted = True
+
+    async def _replay(self) -> AsyncIterator[bytes]:
+        if self._map is None:
+            spool = self._spool
+            if spool is None:
+                # the first attempt never started iterating
+                spool = self._spool = tempfile.TemporaryFile()
+            if not self._exhausted:
+                spool.seek(0, io.SEEK_END)
+                async for chunk in self._source:
+                    spool.write(chunk)
+                self._exhausted = True
+
+            spool.flush()
+            if spool.tell() == 0:
+                # empty files cannot be mapped
+                return
+            self._map = mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._map)
+        for start in range(0, len(view), UPLOAD_CHUNK_SIZE):
+            chunk = view[start : start + UPLOAD_CHUNK_SIZE]
+            self.sent += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # a chunk is still referenced, the map is freed along with it
+                pass
+            self._map = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
 
 class File:
     r"""A parameter object used for :meth:`abc.Messageable.send`
@@ -42,13 +140,28 @@ class File:
         File objects are single use and are not meant to be reused in
         multiple :meth:`abc.Messageable.send`\s.
 
+    File bodies are streamed to Discord rather than read into memory first.
+
     Attributes
     -----------
-    fp: Union[:class:`os.PathLike`, :class:`io.BufferedIOBase`]
+    fp: Union[:class:`os.PathLike`, :class:`io.BufferedIOBase`, :class:`mmap.mmap`, AsyncIterable[:class:`bytes`]]
         A file-like object opened in binary mode and read mode
         or a filename representing a file in the hard drive to
         open.
 
+        A :class:`mmap.mmap` is sent straight from the mapping, from its
+        current position to its end, without copying it into new buffers.
+
+        An asynchronous iterable of :class:`bytes` is uploaded as it is
+        iterated, which allows sending data that is still being produced,
+        such as a download. It is spooled to a temporary file on disk as it
+        is sent, so that the upload can be retried after a rate limit
+        without iterating it again. Asynchronous iterables cannot be used
+        for stickers or with :class:`SyncWebhook`.
+
+        .. versionchanged:: 2.0
+            Added support for :class:`mmap.mmap` and asynchronous iterables.
+
         .. note::
 
             If the file-like object passed is opened via ``open`` then the
@@ -67,34 +180,46 @@ class File:
     __slots__ = ('fp', 'filename', 'spoiler', '_original_pos', '_owner', '_closer')
 
     if TYPE_CHECKING:
-        fp: io.BufferedIOBase
+        fp: Any
         filename: Optional[str]
         spoiler: bool
 
     def __init__(
         self,
-        fp: Union[str, bytes, os.PathLike, io.BufferedIOBase],
+        fp: Union[str, bytes, os.PathLike, io.BufferedIOBase, mmap.mmap, AsyncIterable[bytes]],
         filename: Optional[str] = None,
         *,
         spoiler: bool = False,
     ):
+        self._closer = None
         if isinstance(fp, io.IOBase):
             if not (fp.seekable() and fp.readable()):
                 raise ValueError(f'File buffer {fp!r} must be seekable and readable')
             self.fp = fp
             self._original_pos = fp.tell()
             self._owner = False
+        elif isinstance(fp, mmap.mmap):
+            # the payload never closes the mapping, so it does not need stubbing
+            self.fp = fp
+            self._original_pos = fp.tell()
+            self._owner = False
+        elif isinstance(fp, AsyncIterable):
+            self.fp = _AsyncSource(fp)
+            self._original_pos = 0
+            self._owner = True
+            self._closer = self.fp.close
         else:
             self.fp = open(fp, 'rb')
             self._original_pos = 0
             self._owner = True
 
-        # aiohttp only uses two methods from IOBase
-        # read and close, since I want to control when the files
-        # close, I need to stub it so it doesn't close unless
-        # I tell it to
-        self._closer = self.fp.close
-        self.fp.close = lambda: None
+        if self._closer is None and not isinstance(self.fp, mmap.mmap):
+            # aiohttp only uses two methods from IOBase
+            # read and close, since I want to control when the files
+            # close, I need to stub it so it doesn't close unless
+            # I tell it to
+            self._closer = self.fp.close
+            self.fp.close = lambda: None
 
         if filename is None:
             if isinstance(fp, str):
@@ -118,10 +243,22 @@ class File:
         # is 0, and thus false, then this prevents an
         # unnecessary seek since it's the first request
         # done.
-        if seek:
+        if seek and not isinstance(self.fp, _AsyncSource):
             self.fp.seek(self._original_pos)
 
+    def _uploaded(self) -> int:
+        # the number of bytes the last attempt sent
+        fp = self.fp
+        if isinstance(fp, _AsyncSource):
+            return fp.sent
+        elif isinstance(fp, mmap.mmap):
+            return len(fp) - self._original_pos
+        return fp.tell() - self._original_pos
+
     def close(self) -> None:
-        self.fp.close = self._closer
+        if self._closer is None:
+            return
+        if not isinstance(self.fp, _AsyncSource):
+            self.fp.close = self._closer
         if self._owner:
             self._closer()
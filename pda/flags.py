@@ -884,7 +884,7 @@ class MemberCacheFlags(BaseFlags):
     To construct an object you can pass keyword arguments denoting the flags
     to enable or disable.
 
-    The default value is all flags enabled.
+    The default value is all flags enabled except :attr:`compact`.
 
     .. versionadded:: 1.5
 
@@ -914,20 +914,24 @@ class MemberCacheFlags(BaseFlags):
     __slots__ = ()
 
     def __init__(self, **kwargs: bool):
-        bits = max(self.VALID_FLAGS.values()).bit_length()
-        self.value = (1 << bits) - 1
+        self.value = self._all_value()
         for key, value in kwargs.items():
             if key not in self.VALID_FLAGS:
                 raise TypeError(f'{key!r} is not a valid flag name.')
             setattr(self, key, value)
 
     @classmethod
-    def all(cls: Type[MemberCacheFlags]) -> MemberCacheFlags:
-        """A factory method that creates a :class:`MemberCacheFlags` with everything enabled."""
+    def _all_value(cls) -> int:
+        # compact changes how members are stored rather than which are, so it is opt-in
         bits = max(cls.VALID_FLAGS.values()).bit_length()
-        value = (1 << bits) - 1
+        return ((1 << bits) - 1) & ~cls.VALID_FLAGS['compact']
+
+    @classmethod
+    def all(cls: Type[MemberCacheFlags]) -> MemberCacheFlags:
+        """A factory method that creates a :class:`MemberCacheFlags` with everything enabled
+        except :attr:`compact`."""
         self = cls.__new__(cls)
-        self.value = value
+        self.value = cls._all_value()
         return self
 
     @classmethod
@@ -939,7 +943,7 @@ class MemberCacheFlags(BaseFlags):
 
     @property
     def _empty(self):
-        return self.value == self.DEFAULT_VALUE
+        return self.value & ~self.VALID_FLAGS['compact'] == self.DEFAULT_VALUE
 
     @flag_value
     def voice(self):
@@ -962,6 +966,29 @@ class MemberCacheFlags(BaseFlags):
         """
         return 2
 
+    @flag_value
+    def compact(self):
+        """:class:`bool`: Whether to store members in a compact, array backed
+        store instead of keeping a :class:`Member` object around for each one.
+
+        This trades some CPU time for a large reduction in memory usage
+        for bots with millions of cached members. :class:`Member` objects
+        are created when they are accessed, e.g. through :meth:`Guild.get_member`
+        or :attr:`Guild.members`, so the same member is not guaranteed to be
+        the same object unless it is still referenced elsewhere.
+
+        Presences are not stored and are lost once a member is no longer referenced.
+
+        Members' users are still kept in the user cache, so this is best combined
+        with a bounded ``'users'`` store passed to the ``cache_backends`` parameter
+        of :class:`Client`, such as an :class:`LRUCacheStore`.
+
+        This is not enabled by :meth:`all` or the default constructor.
+
+        .. versionadded:: 2.0
+        """
+        return 4
+
     @classmethod
     def from_intents(cls: Type[MemberCacheFlags], intents: Intents) -> MemberCacheFlags:
         """A factory method that creates a :class:`MemberCacheFlags` based on
@@ -995,7 +1022,7 @@ class MemberCacheFlags(BaseFlags):
 
     @property
     def _voice_only(self):
-        return self.value == 1
+        return self.value & ~self.VALID_FLAGS['compact'] == 1
 
 
 @fill_with_flags()
@@ -1074,5 +1101,3 @@ class CallbackFlags(IntFlag):
         Only the user receiving the message can see it
     """
     EPHEMERAL = 1 << 6
-    
-MessageFlags = CallbackFlags
\ No newline at end of file
@@ -35,7 +35,7 @@ import zlib
 
 import aiohttp
 
-from . import utils
+from . import etf, utils
 from .activity import BaseActivity
 from .enums import SpeakingState
 from .errors import ConnectionClosed, InvalidArgument
@@ -48,8 +48,13 @@ __all__ = (
     'VoiceKeepAliveHandler',
     'DiscordVoiceWebSocket',
     'ReconnectWebSocket',
+    'ResumeState',
+    'GatewayTraffic',
 )
 
+# every zlib-stream message ends with a Z_SYNC_FLUSH
+ZLIB_SUFFIX = b'\x00\x00\xff\xff'
+
 class ReconnectWebSocket(Exception):
     """Signals to safely reconnect the websocket."""
     def __init__(self, shard_id, *, resume=True):
@@ -57,6 +62,88 @@ class ReconnectWebSocket(Exception):
         self.resume = resume
         self.op = 'RESUME' if resume else 'IDENTIFY'
 
+class ResumeState:
+    """Represents the state needed to RESUME a shard's gateway session.
+
+    These are returned by :meth:`Client.export_resume_states` and can be passed
+    to :meth:`Client.connect` after a restart so the shards RESUME their previous
+    sessions instead of IDENTIFYing again.
+
+    Use :meth:`to_dict` and :meth:`from_dict` to persist these as JSON.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    shard_id: Optional[:class:`int`]
+        The shard ID the session belongs to.
+    session_id: :class:`str`
+        The ID of the session.
+    sequence: Optional[:class:`int`]
+        The sequence number of the last event received.
+    gateway: Optional[:class:`str`]
+        The gateway URL to RESUME the session on.
+    """
+
+    __slots__ = ('shard_id', 'session_id', 'sequence', 'gateway')
+
+    def __init__(self, *, shard_id, session_id, sequence, gateway=None):
+        self.shard_id = shard_id
+        self.session_id = session_id
+        self.sequence = sequence
+        self.gateway = gateway
+
+    def __repr__(self):
+        return f'<ResumeState shard_id={self.shard_id} session_id={self.session_id!r} sequence={self.sequence}>'
+
+    def __eq__(self, other):
+        return isinstance(other, ResumeState) and all(getattr(self, attr) == getattr(other, attr) for attr in self.__slots__)
+
+    def to_dict(self):
+        """Converts this state into a JSON serialisable :class:`dict`."""
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Creates a state from a :class:`dict` returned by :meth:`to_dict`."""
+        return cls(
+            shard_id=data.get('shard_id'),
+            session_id=data['session_id'],
+            sequence=data.get('sequence'),
+            gateway=data.get('gateway'),
+        )
+
+class GatewayTraffic:
+    """Counts the bytes a shard received from the gateway.
+
+    These are returned by :attr:`Client.gateway_traffic` and
+    :attr:`ShardInfo.gateway_traffic`. The counts carry over reconnects.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    received: :class:`int`
+        The number of bytes received over the wire, compressed if
+        the connection is compressed.
+    decompressed: :class:`int`
+        The number of bytes the received messages decompressed to.
+    """
+
+    __slots__ = ('received', 'decompressed')
+
+    def __init__(self, *, received=0, decompressed=0):
+        self.received = received
+        self.decompressed = decompressed
+
+    def __repr__(self):
+        return f'<GatewayTraffic received={self.received} decompressed={self.decompressed}>'
+
+    @property
+    def ratio(self):
+        """:class:`float`: How many times smaller the compressed messages were, or ``nan`` if nothing was received."""
+        return self.decompressed / self.received if self.received else float('nan')
+
 class WebSocketClosure(Exception):
     """An exception to make up for the fact that aiohttp doesn't signal closure."""
     pass
@@ -248,6 +335,8 @@ class DiscordWebSocket:
         Send only. Requests a guild sync.
     gateway
         The gateway we are currently connected to.
+    resume_gateway
+        The gateway to RESUME the current session on, if known.
     token
         The authentication token for pda.
     """
@@ -272,8 +361,8 @@ class DiscordWebSocket:
 
         # an empty dispatcher to prevent crashes
         self._dispatch = lambda *args: None
-        # generic event listeners
-        self._dispatch_listeners = []
+        # generic event listeners, by event name
+        self._dispatch_listeners = {}
         # the keep alive
         self._keep_alive = None
         self.thread_id = threading.get_ident()
@@ -281,8 +370,14 @@ class DiscordWebSocket:
         # ws related stuff
         self.session_id = None
         self.sequence = None
+        self.resume_gateway = None
+        self._restored = False
         self._zlib = zlib.decompressobj()
         self._buffer = bytearray()
+        self._traffic = GatewayTraffic()
+        self.encoding = 'json'
+        self._encode = utils._to_json
+        self._decode = utils._from_json
         self._close_code = None
         self._rate_limiter = GatewayRatelimiter()
 
@@ -294,20 +389,28 @@ class DiscordWebSocket:
         return self._rate_limiter.is_ratelimited()
 
     def debug_log_receive(self, data, /):
+        if self.encoding == 'json' and not isinstance(data, str):
+            data = data.decode('utf-8')
         self._dispatch('socket_raw_receive', data)
 
     def log_receive(self, _, /):
         pass
 
     @classmethod
-    async def from_client(cls, client, *, initial=False, gateway=None, shard_id=None, session=None, sequence=None, resume=False):
+    async def from_client(cls, client, *, initial=False, gateway=None, shard_id=None, session=None, sequence=None, resume=False, restored=False, encoding=None):
         """Creates a main websocket for Discord from a :class:`Client`.
 
         This is for internal use only.
         """
-        gateway = gateway or await client.http.get_gateway()
+        encoding = encoding or client._gateway_encoding
+        gateway = gateway or await client.http.get_gateway(encoding=encoding)
         socket = await client.http.ws_connect(gateway)
         ws = cls(socket, loop=client.loop)
+        if encoding == 'etf':
+            # snowflakes come in as ints, everything else looks the same as JSON
+            ws.encoding = encoding
+            ws._encode = etf.dumps
+            ws._decode = etf.loads
 
         # dynamically add attributes needed
         ws.token = client.http.token
@@ -322,6 +425,10 @@ class DiscordWebSocket:
         ws.shard_count = client._connection.shard_count
         ws.session_id = session
         ws.sequence = sequence
+        ws._restored = restored
+        ws._traffic = client._gateway_traffic.setdefault(shard_id, GatewayTraffic())
+        if resume:
+            ws.resume_gateway = gateway
         ws._max_heartbeat_timeout = client._connection.heartbeat_timeout
 
         if client._enable_debug_events:
@@ -364,7 +471,7 @@ class DiscordWebSocket:
 
         future = self.loop.create_future()
         entry = EventListener(event=event, predicate=predicate, result=result, future=future)
-        self._dispatch_listeners.append(entry)
+        self._dispatch_listeners.setdefault(event, []).append(entry)
         return future
 
     async def identify(self):
@@ -420,17 +527,31 @@ class DiscordWebSocket:
         _log.info('Shard ID %s has sent the RESUME payload.', self.shard_id)
 
     async def received_message(self, msg, /):
+        traffic = self._traffic
         if type(msg) is bytes:
-            self._buffer.extend(msg)
-
-            if len(msg) < 4 or msg[-4:] != b'\x00\x00\xff\xff':
+            traffic.received += len(msg)
+            if not msg.endswith(ZLIB_SUFFIX):
+                self._buffer.extend(msg)
                 return
-            msg = self._zlib.decompress(self._buffer)
-            msg = msg.decode('utf-8')
-            self._buffer = bytearray()
+
+            # Messages almost always fit in a single frame, which is then
+            # decompressed as is. Only split messages are joined in the buffer.
+            # The JSON decoder takes the bytes directly, without a str in between.
+            if self._buffer:
+                self._buffer.extend(msg)
+                msg = self._zlib.decompress(self._buffer)
+                del self._buffer[:]
+            else:
+                msg = self._zlib.decompress(msg)
+            traffic.decompressed += len(msg)
+        else:
+            # text frames are counted in UTF-8 bytes, as they are sent
+            size = len(msg) if msg.isascii() else len(msg.encode('utf-8'))
+            traffic.received += size
+            traffic.decompressed += size
 
         self.log_receive(msg)
-        msg = utils._from_json(msg)
+        msg = self._decode(msg)
 
         _log.debug('For Shard ID %s: WebSocket Event: %s', self.shard_id, msg)
         event = msg.get('t')
@@ -492,6 +613,7 @@ class DiscordWebSocket:
             self._trace = trace = data.get('_trace', [])
             self.sequence = msg['s']
             self.session_id = data['session_id']
+            self.resume_gateway = self._resume_url(data.get('resume_gateway_url'))
             # pass back shard ID to ready handler
             data['__shard_id__'] = self.shard_id
             _log.info('Shard ID %s has connected to Gateway: %s (Session ID: %s).',
@@ -501,6 +623,9 @@ class DiscordWebSocket:
             self._trace = trace = data.get('_trace', [])
             # pass back the shard ID to the resumed handler
             data['__shard_id__'] = self.shard_id
+            # sessions restored from a ResumeState never received READY in this process
+            data['__restored__'] = self._restored
+            self._restored = False
             _log.info('Shard ID %s has successfully RESUMED session %s under trace %s.',
                      self.shard_id, self.session_id, ', '.join(trace))
 
@@ -511,12 +636,13 @@ class DiscordWebSocket:
         else:
             func(data)
 
+        listeners = self._dispatch_listeners.get(event)
+        if not listeners:
+            return
+
         # remove the dispatched listeners
         removed = []
-        for index, entry in enumerate(self._dispatch_listeners):
-            if entry.event != event:
-                continue
-
+        for index, entry in enumerate(listeners):
             future = entry.future
             if future.cancelled():
                 removed.append(index)
@@ -533,8 +659,31 @@ class DiscordWebSocket:
                     future.set_result(ret)
                     removed.append(index)
 
-        for index in reversed(removed):
-            del self._dispatch_listeners[index]
+        if len(removed) == len(listeners):
+            del self._dispatch_listeners[event]
+        else:
+            for index in reversed(removed):
+                del listeners[index]
+
+    def _resume_url(self, url):
+        if not url:
+            return None
+
+        # the resume URL does not carry the encoding and compression parameters
+        _, _, query = self.gateway.partition('?')
+        return f'{url.rstrip("/")}/?{query}' if query else url
+
+    def resume_state(self):
+        """Returns the :class:`ResumeState` of this session, or ``None`` if there is no session."""
+        if self.session_id is None:
+            return None
+
+        return ResumeState(
+            shard_id=self.shard_id,
+            session_id=self.session_id,
+            sequence=self.sequence,
+            gateway=self.resume_gateway or self.gateway,
+        )
 
     @property
     def latency(self):
@@ -584,18 +733,24 @@ class DiscordWebSocket:
                 _log.info('Websocket closed with %s, cannot reconnect.', code)
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id, code=code) from None
 
+    async def _send_raw(self, data):
+        if isinstance(data, str):
+            await self.socket.send_str(data)
+        else:
+            await self.socket.send_bytes(data)
+
     async def debug_send(self, data, /):
         await self._rate_limiter.block()
         self._dispatch('socket_raw_send', data)
-        await self.socket.send_str(data)
+        await self._send_raw(data)
 
     async def send(self, data, /):
         await self._rate_limiter.block()
-        await self.socket.send_str(data)
+        await self._send_raw(data)
 
     async def send_as_json(self, data):
         try:
-            await self.send(utils._to_json(data))
+            await self.send(self._encode(data))
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
@@ -603,7 +758,7 @@ class DiscordWebSocket:
     async def send_heartbeat(self, data):
         # This bypasses the rate limit handling code since it has a higher priority
         try:
-            await self.socket.send_str(utils._to_json(data))
+            await self._send_raw(self._encode(data))
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
@@ -629,9 +784,8 @@ class DiscordWebSocket:
             }
         }
 
-        sent = utils._to_json(payload)
-        _log.debug('Sending "%s" to change status', sent)
-        await self.send(sent)
+        _log.debug('Sending "%s" to change status', payload)
+        await self.send(self._encode(payload))
 
     async def request_chunks(self, guild_id, query=None, *, limit, user_ids=None, presences=False, nonce=None):
         payload = {
@@ -44,7 +44,7 @@ from typing import (
 
 from . import utils, abc
 from .role import Role
-from .member import Member, VoiceState
+from .member import CompactMemberStore, Member, VoiceState
 from .emoji import Emoji
 from .errors import InvalidData
 from .permissions import PermissionOverwrite
@@ -286,7 +286,7 @@ class Guild(Hashable):
 
     def __init__(self, *, data: GuildPayload, state: ConnectionState):
         self._channels: Dict[int, GuildChannel] = {}
-        self._members: Dict[int, Member] = {}
+        self._members: Dict[int, Member] = CompactMemberStore(self) if state.member_cache_flags.compact else {}  # type: ignore
         self._voice_states: Dict[int, VoiceState] = {}
         self._threads: Dict[int, Thread] = {}
         self._state: ConnectionState = state
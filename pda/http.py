@@ -25,13 +25,17 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 import json
 import logging
 import sys
+import time
 from typing import (
     Any,
+    AsyncIterator,
     ClassVar,
     Coroutine,
+    Deque,
     Dict,
     Iterable,
     List,
@@ -39,12 +43,10 @@ from typing import (
     Sequence,
     TYPE_CHECKING,
     Tuple,
-    Type,
     TypeVar,
     Union,
 )
-from urllib.parse import quote as _uriquote
-import weakref
+from urllib.parse import quote as _uriquote, urlencode as _urlencode
 
 import aiohttp
 
@@ -56,6 +58,7 @@ from .utils import MISSING
 _log = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from .cache import AssetCache
     from .file import File
     from .enums import (
         AuditLogAction,
@@ -69,6 +72,7 @@ if TYPE_CHECKING:
         components,
         emoji,
         embed,
+        gateway,
         guild,
         integration,
         interactions,
@@ -87,11 +91,7 @@ if TYPE_CHECKING:
     )
     from .types.snowflake import Snowflake, SnowflakeList
 
-    from types import TracebackType
-
     T = TypeVar('T')
-    BE = TypeVar('BE', bound=BaseException)
-    MU = TypeVar('MU', bound='MaybeUnlock')
     Response = Coroutine[Any, Any, T]
 
 
@@ -123,32 +123,313 @@ class Route:
         self.guild_id: Optional[Snowflake] = parameters.get('guild_id')
         self.webhook_id: Optional[Snowflake] = parameters.get('webhook_id')
         self.webhook_token: Optional[str] = parameters.get('webhook_token')
+        # every interaction is ratelimited on its own
+        self.interaction_id: Optional[Snowflake] = parameters.get('interaction_id')
+        self.interaction_token: Optional[str] = parameters.get('interaction_token')
 
     @property
     def bucket(self) -> str:
         # the bucket is just method + path w/ major parameters
         return f'{self.channel_id}:{self.guild_id}:{self.path}'
 
+    @property
+    def key(self) -> str:
+        # the route without its parameters, which is what Discord maps to a bucket hash
+        return f'{self.method} {self.path}'
 
-class MaybeUnlock:
-    def __init__(self, lock: asyncio.Lock) -> None:
-        self.lock: asyncio.Lock = lock
-        self._unlock: bool = True
+    @property
+    def major_parameters(self) -> str:
+        return (
+            f'{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.webhook_token}:'
+            f'{self.interaction_id}:{self.interaction_token}'
+        )
 
-    def __enter__(self: MU) -> MU:
-        return self
 
-    def defer(self) -> None:
-        self._unlock = False
+class RatelimitBucket:
+    """Tracks a single Discord ratelimit bucket.
+
+    Until the first response comes back the limit is unknown, so only
+    a single request is let through to discover it. Afterwards up to
+    ``remaining`` requests may be in flight at once and further requests
+    wait for the bucket to reset instead of running into a 429.
+    """
+
+    __slots__ = (
+        'loop',
+        'limit',
+        'remaining',
+        'reset_at',
+        'outgoing',
+        'last_used',
+        'unlimited',
+        'merged_into',
+        '_previous_reset',
+        '_waiters',
+    )
 
-    def __exit__(
-        self,
-        exc_type: Optional[Type[BE]],
-        exc: Optional[BE],
-        traceback: Optional[TracebackType],
-    ) -> None:
-        if self._unlock:
-            self.lock.release()
+    # responses whose reset times are this close are considered part of the same window
+    WINDOW_TOLERANCE: ClassVar[float] = 0.1
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.limit: int = 1
+        self.remaining: int = 1
+        # monotonic time the current window resets at, None if not known
+        self.reset_at: Optional[float] = None
+        self.outgoing: int = 0
+        self.last_used: float = time.monotonic()
+        # routes that do not send ratelimit headers are not ratelimited per bucket
+        self.unlimited: bool = False
+        # set once this bucket turned out to be the same as another one
+        self.merged_into: Optional[RatelimitBucket] = None
+        self._previous_reset: Optional[float] = None
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+    def __repr__(self) -> str:
+        return (
+            f'<RatelimitBucket limit={self.limit} remaining={self.remaining} '
+            f'outgoing={self.outgoing} reset_at={self.reset_at}>'
+        )
+
+    def is_idle(self, now: float, max_idle: float) -> bool:
+        if self.outgoing or self._waiters:
+            return False
+        if self.reset_at is not None and self.reset_at > now:
+            return False
+        return now - self.last_used >= max_idle
+
+    async def acquire(self) -> RatelimitBucket:
+        while True:
+            if self.merged_into is not None:
+                return await self.merged_into.acquire()
+
+            now = time.monotonic()
+            self.last_used = now
+            if self.unlimited:
+                self.outgoing += 1
+                return self
+
+            if self.reset_at is not None and self.reset_at <= now:
+                # the window has passed, requests still in flight may land in the new one
+                self._previous_reset = self.reset_at
+                self.reset_at = None
+                self.remaining = max(self.limit - self.outgoing, 0)
+
+            if self.remaining > 0:
+                self.remaining -= 1
+                self.outgoing += 1
+                return self
+
+            if self.reset_at is not None:
+                # exhausted, sleep until the reset rather than hitting a 429
+                _log.debug('Ratelimit bucket exhausted, waiting %.2f seconds ahead of time.', self.reset_at - now)
+                await asyncio.sleep(self.reset_at - now)
+            else:
+                # waiting for an in flight request to tell us the limits
+                future = self.loop.create_future()
+                self._waiters.append(future)
+                try:
+                    await future
+                finally:
+                    try:
+                        self._waiters.remove(future)
+                    except ValueError:
+                        pass
+
+    def release(self) -> None:
+        self.outgoing -= 1
+        if self.reset_at is None and not self.unlimited:
+            if self._previous_reset is None:
+                # the request never told us anything, let the next one try
+                self.remaining = max(self.remaining, 1)
+            elif self.outgoing == 0:
+                # every request of the passed window came back without one
+                # from the new window, which nothing has been sent in yet
+                self.remaining = max(self.limit, 1)
+        self._wake()
+
+    def update(self, response: aiohttp.ClientResponse, *, use_clock: bool = False) -> None:
+        headers = response.headers
+        if 'X-Ratelimit-Remaining' not in headers:
+            if response.status != 429:
+                self.unlimited = True
+                self._wake()
+            return
+
+        self.unlimited = False
+        self.limit = int(headers.get('X-Ratelimit-Limit', 1))
+        remaining = int(headers['X-Ratelimit-Remaining'])
+        reset_at = time.monotonic() + utils._parse_ratelimit_header(response, use_clock=use_clock)
+        tolerance = self.WINDOW_TOLERANCE
+
+        if self.reset_at is not None:
+            if reset_at > self.reset_at + tolerance:
+                # the server moved on to a new window before we noticed
+                self.remaining = max(remaining - (self.outgoing - 1), 0)
+                self.reset_at = reset_at
+            elif reset_at >= self.reset_at - tolerance:
+                self.remaining = min(self.remaining, remaining)
+            else:
+                # a late response from a window that has already passed
+                return
+        elif self._previous_reset is not None:
+            if reset_at <= self._previous_reset + tolerance:
+                return
+            # first response of the window we already started using locally
+            self.remaining = min(self.remaining, remaining)
+            self.reset_at = reset_at
+        else:
+            self.remaining = max(remaining - (self.outgoing - 1), 0)
+            self.reset_at = reset_at
+
+        self._wake()
+
+    def exhaust(self, retry_after: float) -> None:
+        self.remaining = 0
+        reset_at = time.monotonic() + retry_after
+        if self.reset_at is None or reset_at > self.reset_at:
+            self.reset_at = reset_at
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+
+
+class Ratelimiter:
+    """Maps routes to the ratelimit buckets Discord reports for them.
+
+    Discord groups routes into buckets identified by the ``X-RateLimit-Bucket``
+    header, with a separate bucket per major parameter. The mapping from a
+    route to its bucket hash is kept for the lifetime of the client while
+    the buckets themselves are evicted once idle.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, *, use_clock: bool = False, max_idle: float = 300.0) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.use_clock: bool = use_clock
+        self.max_idle: float = max_idle
+        # route key -> bucket hash
+        self._hashes: Dict[str, str] = {}
+        # bucket hash + major parameters -> bucket
+        self._buckets: Dict[str, RatelimitBucket] = {}
+        self._last_sweep: float = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _key_for(self, route: Route) -> str:
+        bucket_hash = self._hashes.get(route.key, route.key)
+        return f'{bucket_hash}:{route.major_parameters}'
+
+    def get_bucket(self, route: Route) -> RatelimitBucket:
+        now = time.monotonic()
+        if now - self._last_sweep >= self.max_idle:
+            self._sweep(now)
+
+        key = self._key_for(route)
+        try:
+            return self._buckets[key]
+        except KeyError:
+            bucket = self._buckets[key] = RatelimitBucket(self.loop)
+            return bucket
+
+    def update(self, route: Route, bucket: RatelimitBucket, response: aiohttp.ClientResponse) -> None:
+        bucket.update(response, use_clock=self.use_clock)
+
+        bucket_hash = response.headers.get('X-Ratelimit-Bucket')
+        if bucket_hash is None or self._hashes.get(route.key) == bucket_hash:
+            return
+
+        # we've learned the real bucket for this route, move it there
+        old_key = self._key_for(route)
+        self._hashes[route.key] = bucket_hash
+        new_key = self._key_for(route)
+        if self._buckets.get(old_key) is bucket:
+            del self._buckets[old_key]
+
+        existing = self._buckets.get(new_key)
+        if existing is None:
+            self._buckets[new_key] = bucket
+        elif existing is not bucket:
+            existing.update(response, use_clock=self.use_clock)
+            # anything still waiting on this bucket should wait on the real one instead
+            bucket.merged_into = existing
+            bucket._wake()
+
+        _log.debug('Route %s is part of ratelimit bucket %s.', route.key, bucket_hash)
+
+    def _sweep(self, now: float) -> None:
+        self._last_sweep = now
+        idle = [key for key, bucket in self._buckets.items() if bucket.is_idle(now, self.max_idle)]
+        for key in idle:
+            del self._buckets[key]
+
+        if idle:
+            _log.debug('Evicted %d idle ratelimit buckets.', len(idle))
+
+
+class RequestStats:
+    """Counts what the requests of a :class:`HTTPClient` went through."""
+
+    __slots__ = ('requests', 'ratelimited', 'global_ratelimited', 'ratelimit_wait', 'uploaded', 'upload_time')
+
+    def __init__(self) -> None:
+        # every attempt counts, including the retries
+        self.requests: int = 0
+        # 429s received, including the global ones
+        self.ratelimited: int = 0
+        self.global_ratelimited: int = 0
+        # seconds spent waiting for the global ratelimit and ratelimit buckets
+        self.ratelimit_wait: float = 0.0
+        # file bytes sent, including the retries, and the seconds spent sending them
+        self.uploaded: int = 0
+        self.upload_time: float = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f'<RequestStats requests={self.requests} ratelimited={self.ratelimited} '
+            f'global_ratelimited={self.global_ratelimited} ratelimit_wait={self.ratelimit_wait:.3f} '
+            f'upload_rate={self.upload_rate:.0f}>'
+        )
+
+    @property
+    def upload_rate(self) -> float:
+        # bytes per second, measured from sending a request until its response arrives
+        if not self.upload_time:
+            return 0.0
+        return self.uploaded / self.upload_time
+
+
+# the size of the chunks CDN downloads are streamed in
+CDN_CHUNK_SIZE = 64 * 1024
+
+# the GET routes whose cached responses are invalidated by gateway events
+CACHEABLE_ROUTES = frozenset({
+    '/guilds/{guild_id}/members/{member_id}',
+    '/users/{user_id}',
+    '/channels/{channel_id}',
+    '/channels/{channel_id}/messages/{message_id}',
+})
+
+
+def _copy_json(data: Any) -> Any:
+    # coalesced and cached responses are shared, so each caller gets its own copy
+    if isinstance(data, (dict, list)):
+        return utils._from_json(utils._to_json(data))
+    return data
+
+
+class _InFlight:
+    __slots__ = ('future', 'waiters', 'stale')
+
+    def __init__(self, future: asyncio.Future[Any]) -> None:
+        self.future: asyncio.Future[Any] = future
+        self.waiters: int = 0
+        # set when what is being fetched changed after the request was sent
+        self.stale: bool = False
 
 
 # For some reason, the Discord voice websocket expects this header to be
@@ -167,13 +448,25 @@ class HTTPClient:
         proxy_auth: Optional[aiohttp.BasicAuth] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         unsync_clock: bool = True,
+        cache_ttl: Optional[Dict[str, float]] = None,
+        asset_cache: Optional[AssetCache] = None,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
         self.connector = connector
         self.__session: aiohttp.ClientSession = MISSING  # filled in static_login
-        self._locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._ratelimiter: Ratelimiter = Ratelimiter(self.loop, use_clock=not unsync_clock)
         self._global_over: asyncio.Event = asyncio.Event()
         self._global_over.set()
+        self.stats: RequestStats = RequestStats()
+        # url -> the GET request in flight for it
+        self._in_flight: Dict[str, _InFlight] = {}
+        # route path -> seconds its GET responses are cached for
+        self.cache_ttl: Dict[str, float] = dict(cache_ttl or {})
+        for path in self.cache_ttl.keys() - CACHEABLE_ROUTES:
+            raise ValueError(f'responses of {path} cannot be cached')
+        # url -> (monotonic expiry, response)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self.asset_cache: Optional[AssetCache] = asset_cache
         self.token: Optional[str] = None
         self.bot_token: bool = False
         self.proxy: Optional[str] = proxy
@@ -204,6 +497,9 @@ class HTTPClient:
 
         return await self.__session.ws_connect(url, **kwargs)
 
+    # maximum number of cached responses before expired ones are swept
+    MAX_CACHED: ClassVar[int] = 4096
+
     async def request(
         self,
         route: Route,
@@ -212,16 +508,112 @@ class HTTPClient:
         form: Optional[Iterable[Dict[str, Any]]] = None,
         **kwargs: Any,
     ) -> Any:
-        bucket = route.bucket
+        if route.method == 'GET':
+            if not files and not form and kwargs.keys() <= {'params'}:
+                return await self._coalesced_get(route, kwargs.get('params'))
+        else:
+            # whatever this changes is no longer what was cached or is being fetched
+            self._forget(route.url)
+
+        return await self._request(route, files=files, form=form, **kwargs)
+
+    async def _coalesced_get(self, route: Route, params: Optional[Dict[str, Any]]) -> Any:
+        key = route.url
+        if params:
+            key = f'{key}?{_urlencode(sorted(params.items()))}'
+
+        ttl = self.cache_ttl.get(route.path)
+        if ttl is not None:
+            try:
+                expires, data = self._cache[key]
+            except KeyError:
+                pass
+            else:
+                if expires > time.monotonic():
+                    return _copy_json(data)
+                del self._cache[key]
+
+        while True:
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+
+            # an identical request is already on its way, share its response
+            in_flight.waiters += 1
+            try:
+                data = await asyncio.shield(in_flight.future)
+            except asyncio.CancelledError:
+                if not in_flight.future.cancelled():
+                    raise
+                # the request was cancelled rather than us, send our own
+                continue
+            return _copy_json(data)
+
+        future = self.loop.create_future()
+        in_flight = self._in_flight[key] = _InFlight(future)
+        try:
+            if params:
+                data = await self._request(route, params=params)
+            else:
+                data = await self._request(route)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            if in_flight.waiters:
+                future.set_exception(exc)
+            else:
+                future.cancel()
+            raise
+        finally:
+            if self._in_flight.get(key) is in_flight:
+                del self._in_flight[key]
+
+        future.set_result(data)
+        if ttl is not None and not in_flight.stale:
+            self._store(key, data, ttl)
+        elif not in_flight.waiters:
+            return data
+
+        # the waiters copy the response once they run, which is after we returned it
+        return _copy_json(data)
+
+    def _store(self, key: str, data: Any, ttl: float) -> None:
+        cache = self._cache
+        now = time.monotonic()
+        if len(cache) >= self.MAX_CACHED:
+            for expired in [k for k, (expires, _) in cache.items() if expires <= now]:
+                del cache[expired]
+            if len(cache) >= self.MAX_CACHED:
+                # still full, evict the oldest entry
+                del cache[next(iter(cache))]
+        cache[key] = (now + ttl, data)
+
+    def invalidate(self, path: str, **parameters: Any) -> None:
+        """Drops the cached GET response of a route, e.g. when the gateway reports a change."""
+        self._forget(Route('GET', path, **parameters).url)
+
+    def _forget(self, url: str) -> None:
+        if self._cache:
+            self._cache.pop(url, None)
+
+        # A response already on its way may predate the change, so it is not
+        # cached and requests from now on do not share it.
+        in_flight = self._in_flight.pop(url, None)
+        if in_flight is not None:
+            in_flight.stale = True
+
+    async def _request(
+        self,
+        route: Route,
+        *,
+        files: Optional[Sequence[File]] = None,
+        form: Optional[Iterable[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> Any:
         method = route.method
         url = route.url
 
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            if bucket is not None:
-                self._locks[bucket] = lock
-
         # header creation
         headers: Dict[str, str] = {
             'User-Agent': self.user_agent,
@@ -250,106 +642,172 @@ class HTTPClient:
         if self.proxy_auth is not None:
             kwargs['proxy_auth'] = self.proxy_auth
 
-        if not self._global_over.is_set():
-            # wait until the global lock is complete
-            await self._global_over.wait()
-
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
-        await lock.acquire()
-        with MaybeUnlock(lock) as maybe_lock:
-            for tries in range(5):
-                if files:
-                    for f in files:
-                        f.reset(seek=tries)
-
-                if form:
-                    form_data = aiohttp.FormData()
-                    for params in form:
-                        form_data.add_field(**params)
-                    kwargs['data'] = form_data
+        for tries in range(5):
+            if files:
+                for f in files:
+                    f.reset(seek=tries)
+
+            if form:
+                form_data = aiohttp.FormData()
+                for params in form:
+                    form_data.add_field(**params)
+                kwargs['data'] = form_data
+
+            stats = self.stats
+            waiting_since = time.perf_counter()
+            if not self._global_over.is_set():
+                # wait until the global lock is complete
+                await self._global_over.wait()
+
+            # this is resolved on every try as the bucket may have been learned in the meantime
+            bucket = await self._ratelimiter.get_bucket(route).acquire()
+            stats.ratelimit_wait += time.perf_counter() - waiting_since
+            stats.requests += 1
+            sending_since = time.perf_counter()
+            try:
+                async with self.__session.request(method, url, **kwargs) as response:
+                    if files:
+                        stats.upload_time += time.perf_counter() - sending_since
+                        stats.uploaded += sum(f._uploaded() for f in files)
+
+                    _log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), response.status)
+
+                    # even errors have text involved in them so this is safe to call
+                    data = await json_or_text(response)
+
+                    # update the bucket with the rate limit header information
+                    self._ratelimiter.update(route, bucket, response)
+
+                    # the request was successful so just return the text/json
+                    if 300 > response.status >= 200:
+                        _log.debug('%s %s has received %s', method, url, data)
+                        return data
+
+                    # we are being rate limited
+                    if response.status == 429:
+                        if not response.headers.get('Via') or isinstance(data, str):
+                            # Banned by Cloudflare more than likely.
+                            raise HTTPException(response, data)
 
-                try:
-                    async with self.__session.request(method, url, **kwargs) as response:
-                        _log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), response.status)
-
-                        # even errors have text involved in them so this is safe to call
-                        data = await json_or_text(response)
-
-                        # check if we have rate limit header information
-                        remaining = response.headers.get('X-Ratelimit-Remaining')
-                        if remaining == '0' and response.status != 429:
-                            # we've depleted our current bucket
-                            delta = utils._parse_ratelimit_header(response, use_clock=self.use_clock)
-                            _log.debug('A rate limit bucket has been exhausted (bucket: %s, retry: %s).', bucket, delta)
-                            maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
-
-                        # the request was successful so just return the text/json
-                        if 300 > response.status >= 200:
-                            _log.debug('%s %s has received %s', method, url, data)
-                            return data
-
-                        # we are being rate limited
-                        if response.status == 429:
-                            if not response.headers.get('Via') or isinstance(data, str):
-                                # Banned by Cloudflare more than likely.
-                                raise HTTPException(response, data)
-
-                            fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
-
-                            # sleep a bit
-                            retry_after: float = data['retry_after']
-                            _log.warning(fmt, retry_after, bucket)
-
-                            # check if it's a global rate limit
-                            is_global = data.get('global', False)
-                            if is_global:
-                                _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
-                                self._global_over.clear()
+                        fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
+                        stats.ratelimited += 1
 
+                        # sleep a bit
+                        retry_after: float = data['retry_after']
+                        _log.warning(fmt, retry_after, route.key)
+
+                        # check if it's a global rate limit
+                        is_global = data.get('global', False)
+                        if is_global:
+                            stats.global_ratelimited += 1
+                            _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
+                            self._global_over.clear()
                             await asyncio.sleep(retry_after)
+                            stats.ratelimit_wait += retry_after
                             _log.debug('Done sleeping for the rate limit. Retrying...')
 
                             # release the global lock now that the
                             # global rate limit has passed
-                            if is_global:
-                                self._global_over.set()
-                                _log.debug('Global rate limit is now over.')
-
-                            continue
-
-                        # we've received a 500, 502, or 504, unconditional retry
-                        if response.status in {500, 502, 504}:
-                            await asyncio.sleep(1 + tries * 2)
-                            continue
-
-                        # the usual error cases
-                        if response.status == 403:
-                            raise Forbidden(response, data)
-                        elif response.status == 404:
-                            raise NotFound(response, data)
-                        elif response.status >= 500:
-                            raise DiscordServerError(response, data)
+                            self._global_over.set()
+                            _log.debug('Global rate limit is now over.')
                         else:
-                            raise HTTPException(response, data)
+                            # the next acquire will wait for the bucket to reset
+                            bucket.exhaust(retry_after)
 
-                # This is handling exceptions from the request
-                except OSError as e:
-                    # Connection reset by peer
-                    if tries < 4 and e.errno in (54, 10054):
-                        await asyncio.sleep(1 + tries * 2)
                         continue
-                    raise
 
-            if response is not None:
-                # We've run out of retries, raise.
-                if response.status >= 500:
-                    raise DiscordServerError(response, data)
+                    # we've received a 500, 502, or 504, unconditional retry
+                    if response.status in {500, 502, 504}:
+                        await asyncio.sleep(1 + tries * 2)
+                        continue
 
-                raise HTTPException(response, data)
+                    # the usual error cases
+                    if response.status == 403:
+                        raise Forbidden(response, data)
+                    elif response.status == 404:
+                        raise NotFound(response, data)
+                    elif response.status >= 500:
+                        raise DiscordServerError(response, data)
+                    else:
+                        raise HTTPException(response, data)
+
+            # This is handling exceptions from the request
+            except OSError as e:
+                # Connection reset by peer
+                if tries < 4 and e.errno in (54, 10054):
+                    await asyncio.sleep(1 + tries * 2)
+                    continue
+                raise
+            finally:
+                bucket.release()
+
+        if response is not None:
+            # We've run out of retries, raise.
+            if response.status >= 500:
+                raise DiscordServerError(response, data)
+
+            raise HTTPException(response, data)
+
+        raise RuntimeError('Unreachable code in HTTP handling')
+
+    async def stream_from_cdn(self, url: str, *, chunk_size: int = CDN_CHUNK_SIZE, offset: int = 0) -> AsyncIterator[bytes]:
+        headers = {'Range': f'bytes={offset}-'} if offset else None
+        async with self.__session.get(url, headers=headers) as resp:
+            if resp.status == 416 and offset:
+                # the range starts at the end, there is nothing left to download
+                return
+            elif resp.status == 404:
+                raise NotFound(resp, 'asset not found')
+            elif resp.status == 403:
+                raise Forbidden(resp, 'cannot retrieve asset')
+            elif resp.status not in (200, 206):
+                raise HTTPException(resp, 'failed to get asset')
 
-            raise RuntimeError('Unreachable code in HTTP handling')
+            # a 200 means the range was ignored, so the start is skipped here
+            skip = offset if resp.status == 200 else 0
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                if skip:
+                    if len(chunk) <= skip:
+                        skip -= len(chunk)
+                        continue
+                    chunk = chunk[skip:]
+                    skip = 0
+                yield chunk
+
+    async def get_asset_from_cdn(self, url: str) -> bytes:
+        # Only assets go through the asset cache, attachments can be far
+        # too large and are rarely downloaded more than once.
+        cache = self.asset_cache
+        if cache is None:
+            return await self.get_from_cdn(url)
+
+        cached = await cache.get(url)
+        if cached is not None and cache._is_fresh(cached):
+            cache.hits += 1
+            return cached.data
+
+        headers = None
+        if cached is not None and cached.etag is not None:
+            headers = {'If-None-Match': cached.etag}
+
+        async with self.__session.get(url, headers=headers) as resp:
+            if resp.status == 304 and cached is not None:
+                cache.hits += 1
+                await cache.revalidated(url, cached)
+                return cached.data
+            elif resp.status == 200:
+                cache.misses += 1
+                data = await resp.read()
+                await cache.put(url, data, resp.headers.get('ETag'))
+                return data
+            elif resp.status == 404:
+                raise NotFound(resp, 'asset not found')
+            elif resp.status == 403:
+                raise Forbidden(resp, 'cannot retrieve asset')
+            else:
+                raise HTTPException(resp, 'failed to get asset')
 
     async def get_from_cdn(self, url: str) -> bytes:
         async with self.__session.get(url) as resp:
@@ -1908,7 +2366,7 @@ class HTTPClient:
             value = '{0}?encoding={1}&v=9'
         return value.format(data['url'], encoding)
 
-    async def get_bot_gateway(self, *, encoding: str = 'json', zlib: bool = True) -> Tuple[int, str]:
+    async def get_bot_gateway(self, *, encoding: str = 'json', zlib: bool = True) -> Tuple[int, str, gateway.SessionStartLimit]:
         try:
             data = await self.request(Route('GET', '/gateway/bot'))
         except HTTPException as exc:
@@ -1918,7 +2376,7 @@ class HTTPClient:
             value = '{0}?encoding={1}&v=9&compress=zlib-stream'
         else:
             value = '{0}?encoding={1}&v=9'
-        return data['shards'], value.format(data['url'], encoding)
+        return data['shards'], value.format(data['url'], encoding), data['session_start_limit']
 
     def get_user(self, user_id: Snowflake) -> Response[user.User]:
         return self.request(Route('GET', '/users/{user_id}', user_id=user_id))
@@ -24,12 +24,15 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import array
 import datetime
 import inspect
 import itertools
+import math
 import sys
+import weakref
 from operator import attrgetter
-from typing import Any, Dict, List, Literal, Optional, TYPE_CHECKING, Tuple, Type, TypeVar, Union, overload
+from typing import Any, Dict, Iterator, List, Literal, Optional, TYPE_CHECKING, Tuple, Type, TypeVar, Union, overload
 
 import pda.abc
 
@@ -265,6 +268,7 @@ class Member(pda.abc.Messageable, _UserTag):
         '_user',
         '_state',
         '_avatar',
+        '__weakref__',
     )
 
     if TYPE_CHECKING:
@@ -906,3 +910,205 @@ class Member(pda.abc.Messageable, _UserTag):
             The role or ``None`` if not found in the member's roles.
         """
         return self.guild.get_role(role_id) if self._roles.has(role_id) else None
+
+
+class CompactMemberStore:
+    """The member store of a :class:`Guild` when :attr:`MemberCacheFlags.compact` is enabled.
+
+    Rather than keeping a :class:`Member` around for every member, the member
+    data is kept in typed arrays indexed by row. Role lists are deduplicated
+    into a shared pool and names and nicknames are interned. :class:`Member`
+    objects are created when they are accessed and are reused for as long as
+    they are referenced elsewhere.
+
+    Presences are not stored, so members that are created again start out offline.
+    """
+
+    __slots__ = (
+        'guild',
+        '_index',
+        '_free',
+        '_joined_at',
+        '_premium_since',
+        '_flags',
+        '_roles',
+        '_role_pool',
+        '_role_lookup',
+        '_discriminators',
+        '_public_flags',
+        '_names',
+        '_avatars',
+        '_nicks',
+        '_guild_avatars',
+        '_views',
+    )
+
+    PENDING = 1 << 0
+    BOT = 1 << 1
+    SYSTEM = 1 << 2
+
+    def __init__(self, guild: Guild) -> None:
+        self.guild: Guild = guild
+        # member ID -> row
+        self._index: Dict[int, int] = {}
+        # rows of removed members, reused by new ones
+        self._free: List[int] = []
+        # timestamps are stored as POSIX timestamps, NaN meaning None
+        self._joined_at: array.array[float] = array.array('d')
+        self._premium_since: array.array[float] = array.array('d')
+        self._flags: array.array[int] = array.array('B')
+        # index into the role pool, members with the same roles share a list
+        self._roles: array.array[int] = array.array('L')
+        self._role_pool: List[utils.SnowflakeList] = []
+        self._role_lookup: Dict[Tuple[int, ...], int] = {}
+        self._discriminators: array.array[int] = array.array('H')
+        self._public_flags: array.array[int] = array.array('L')
+        self._names: List[str] = []
+        self._avatars: List[Optional[str]] = []
+        # row -> value, most members have neither
+        self._nicks: Dict[int, str] = {}
+        self._guild_avatars: Dict[int, str] = {}
+        self._views: weakref.WeakValueDictionary[int, Member] = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, member_id: Any) -> bool:
+        return member_id in self._index
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._index)
+
+    def __setitem__(self, member_id: int, member: Member) -> None:
+        row = self._index.get(member_id)
+        if row is None:
+            row = self._allocate()
+            self._index[member_id] = row
+
+        user = member._user
+        flags = 0
+        if member.pending:
+            flags |= self.PENDING
+        if user.bot:
+            flags |= self.BOT
+        if user.system:
+            flags |= self.SYSTEM
+
+        self._joined_at[row] = self._to_timestamp(member.joined_at)
+        self._premium_since[row] = self._to_timestamp(member.premium_since)
+        self._flags[row] = flags
+        self._roles[row] = self._pool_roles(member._roles)
+        self._discriminators[row] = int(user.discriminator)
+        self._public_flags[row] = user._public_flags
+        self._names[row] = sys.intern(user.name)
+        self._avatars[row] = user._avatar
+
+        if member.nick is None:
+            self._nicks.pop(row, None)
+        else:
+            self._nicks[row] = sys.intern(member.nick)
+
+        if member._avatar is None:
+            self._guild_avatars.pop(row, None)
+        else:
+            self._guild_avatars[row] = member._avatar
+
+        # only replace live views, members that are not referenced elsewhere can be dropped
+        if member_id in self._views:
+            self._views[member_id] = member
+
+    def get(self, member_id: Optional[int], default: Any = None) -> Optional[Member]:
+        row = self._index.get(member_id)  # type: ignore
+        if row is None:
+            return default
+        return self._view(member_id, row)  # type: ignore
+
+    def pop(self, member_id: int, default: Any = None) -> Optional[Member]:
+        row = self._index.pop(member_id, None)
+        if row is None:
+            return default
+
+        member = self._views.pop(member_id, None) or self._create(member_id, row)
+        self._nicks.pop(row, None)
+        self._guild_avatars.pop(row, None)
+        self._names[row] = ''
+        self._avatars[row] = None
+        self._free.append(row)
+        return member
+
+    def values(self) -> Iterator[Member]:
+        view = self._view
+        return (view(member_id, row) for member_id, row in list(self._index.items()))
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+
+        row = len(self._names)
+        self._joined_at.append(0.0)
+        self._premium_since.append(0.0)
+        self._flags.append(0)
+        self._roles.append(0)
+        self._discriminators.append(0)
+        self._public_flags.append(0)
+        self._names.append('')
+        self._avatars.append(None)
+        return row
+
+    def _pool_roles(self, roles: utils.SnowflakeList) -> int:
+        key = tuple(roles)
+        try:
+            return self._role_lookup[key]
+        except KeyError:
+            index = self._role_lookup[key] = len(self._role_pool)
+            self._role_pool.append(utils.SnowflakeList(key, is_sorted=True))
+            return index
+
+    @staticmethod
+    def _to_timestamp(dt: Optional[datetime.datetime]) -> float:
+        return math.nan if dt is None else dt.timestamp()
+
+    @staticmethod
+    def _from_timestamp(timestamp: float) -> Optional[datetime.datetime]:
+        if math.isnan(timestamp):
+            return None
+        return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+
+    def _view(self, member_id: int, row: int) -> Member:
+        member = self._views.get(member_id)
+        if member is None:
+            member = self._views[member_id] = self._create(member_id, row)
+        return member
+
+    def _create(self, member_id: int, row: int) -> Member:
+        state = self.guild._state
+        flags = self._flags[row]
+        user = state.get_user(member_id)
+        if user is None:
+            user = User(
+                state=state,
+                data={
+                    'id': member_id,  # type: ignore
+                    'username': self._names[row],
+                    'discriminator': f'{self._discriminators[row]:04}',
+                    'avatar': self._avatars[row],
+                    'public_flags': self._public_flags[row],
+                    'bot': bool(flags & self.BOT),
+                    'system': bool(flags & self.SYSTEM),
+                },
+            )
+
+        member = Member.__new__(Member)  # bypass __init__
+        member._state = state
+        member._user = user
+        member.guild = self.guild
+        member.joined_at = self._from_timestamp(self._joined_at[row])
+        member.premium_since = self._from_timestamp(self._premium_since[row])
+        # copied so that role changes on the member do not leak into the shared pool
+        member._roles = utils.SnowflakeList(self._role_pool[self._roles[row]], is_sorted=True)
+        member._client_status = {None: 'offline'}
+        member.activities = ()
+        member.nick = self._nicks.get(row)
+        member.pending = bool(flags & self.PENDING)
+        member._avatar = self._guild_avatars.get(row)
+        return member
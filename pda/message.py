@@ -29,7 +29,7 @@ import datetime
 import re
 import io
 from os import PathLike
-from typing import Dict, TYPE_CHECKING, Union, List, Optional, Any, Callable, Tuple, ClassVar, Optional, overload, TypeVar, Type
+from typing import AsyncIterator, Dict, TYPE_CHECKING, Union, List, Optional, Any, Callable, Tuple, ClassVar, Optional, overload, TypeVar, Type
 
 from . import utils
 from .reaction import Reaction
@@ -178,21 +178,26 @@ class Attachment(Hashable):
 
     async def save(
         self,
-        fp: Union[io.BufferedIOBase, PathLike],
+        fp: Union[io.BufferedIOBase, PathLike, int],
         *,
         seek_begin: bool = True,
         use_cached: bool = False,
+        chunk_size: Optional[int] = None,
+        resume: bool = False,
     ) -> int:
         """|coro|
 
         Saves this attachment into a file-like object.
 
+        .. versionchanged:: 2.0
+            Added ``chunk_size`` and ``resume`` and support for file descriptors.
+
         Parameters
         -----------
-        fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
-            The file-like object to save this attachment to or the filename
-            to use. If a filename is passed then a file is created with that
-            filename and used instead.
+        fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`, :class:`int`]
+            The file-like object to save this attachment to, the filename
+            to use or a file descriptor. If a filename is passed then a file
+            is created with that filename and used instead.
         seek_begin: :class:`bool`
             Whether to seek to the beginning of the file after saving is
             successfully done.
@@ -203,6 +208,12 @@ class Attachment(Hashable):
             after the message is deleted. Note that this can still fail to download
             deleted attachments if too much time has passed and it does not work
             on some types of attachments.
+        chunk_size: Optional[:class:`int`]
+            If given, the attachment is streamed into ``fp`` in chunks of this size
+            instead of being read into memory first. See :meth:`stream`.
+        resume: :class:`bool`
+            Whether to keep what ``fp`` already holds and only download the rest,
+            e.g. after an interrupted download. This streams the attachment.
 
         Raises
         --------
@@ -216,6 +227,11 @@ class Attachment(Hashable):
         :class:`int`
             The number of bytes written.
         """
+        if chunk_size is not None or resume or isinstance(fp, int):
+            chunk_size = chunk_size or 65536
+            stream = lambda offset: self.stream(use_cached=use_cached, chunk_size=chunk_size, offset=offset)
+            return await utils._save_stream(fp, stream, seek_begin=seek_begin, resume=resume)
+
         data = await self.read(use_cached=use_cached)
         if isinstance(fp, io.BufferedIOBase):
             written = fp.write(data)
@@ -261,6 +277,49 @@ class Attachment(Hashable):
         data = await self._http.get_from_cdn(url)
         return data
 
+    def stream(self, *, use_cached: bool = False, chunk_size: int = 65536, offset: int = 0) -> AsyncIterator[bytes]:
+        """Downloads the content of this attachment in chunks, without keeping
+        all of it in memory.
+
+        .. versionadded:: 2.0
+
+        Example
+        --------
+
+        .. code-block:: python3
+
+            with open(attachment.filename, 'wb') as fp:
+                async for chunk in attachment.stream():
+                    fp.write(chunk)
+
+        Parameters
+        -----------
+        use_cached: :class:`bool`
+            Whether to use :attr:`proxy_url` rather than :attr:`url` when downloading
+            the attachment. See :meth:`read`.
+        chunk_size: :class:`int`
+            The maximum size of each chunk in bytes.
+        offset: :class:`int`
+            The byte to start downloading from, to resume a partial download.
+            If the offset is at or past the end, nothing is downloaded.
+
+        Raises
+        ------
+        HTTPException
+            Downloading the attachment failed.
+        Forbidden
+            You do not have permissions to access this attachment
+        NotFound
+            The attachment was deleted.
+
+        Yields
+        -------
+        :class:`bytes`
+            A chunk of the contents of the attachment.
+        """
+        url = self.proxy_url if use_cached else self.url
+        return self._http.stream_from_cdn(url, chunk_size=chunk_size, offset=offset)
+
     async def to_file(self, *, use_cached: bool = False, spoiler: bool = False) -> File:
         """|coro|
 
@@ -24,7 +24,7 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, TYPE_CHECKING, Type, TypeVar, Union
+from typing import Any, AsyncIterator, Dict, Optional, TYPE_CHECKING, Type, TypeVar, Union
 import re
 
 from .asset import Asset, AssetMixin
@@ -230,3 +230,9 @@ class PartialEmoji(_EmojiTag, AssetMixin):
             raise InvalidArgument('PartialEmoji is not a custom emoji')
 
         return await super().read()
+
+    def stream(self, *, chunk_size: int = 65536, offset: int = 0) -> AsyncIterator[bytes]:
+        if self.is_unicode_emoji():
+            raise InvalidArgument('PartialEmoji is not a custom emoji')
+
+        return super().stream(chunk_size=chunk_size, offset=offset)
@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 
 import aiohttp
 
@@ -42,19 +43,23 @@ from .errors import (
 )
 
 from .enums import Status
+from . import utils
 
-from typing import TYPE_CHECKING, Any, Callable, Tuple, Type, Optional, List, Dict, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Tuple, Type, Optional, List, Dict, TypeVar
 
 if TYPE_CHECKING:
     from .gateway import DiscordWebSocket
     from .activity import BaseActivity
     from .enums import Status
+    from .cluster import Cluster
 
     EI = TypeVar('EI', bound='EventItem')
 
 __all__ = (
     'AutoShardedClient',
     'ShardInfo',
+    'IdentifyCoordinator',
+    'LocalIdentifyCoordinator',
 )
 
 _log = logging.getLogger(__name__)
@@ -123,9 +128,9 @@ class Shard:
         if self._task is not None and not self._task.done():
             self._task.cancel()
 
-    async def close(self) -> None:
+    async def close(self, code: int = 1000) -> None:
         self._cancel_task()
-        await self.ws.close(code=1000)
+        await self.ws.close(code=code)
 
     async def disconnect(self) -> None:
         await self.close()
@@ -189,6 +194,7 @@ class Shard:
                 shard_id=self.id,
                 session=self.ws.session_id,
                 sequence=self.ws.sequence,
+                gateway=self.ws.resume_gateway if exc.resume else None,
             )
             self.ws = await asyncio.wait_for(coro, timeout=60.0)
         except self._handled_exceptions as e:
@@ -279,6 +285,15 @@ class ShardInfo:
         """:class:`float`: Measures latency between a HEARTBEAT and a HEARTBEAT_ACK in seconds for this shard."""
         return self._parent.ws.latency
 
+    @property
+    def gateway_traffic(self) -> GatewayTraffic:
+        """:class:`GatewayTraffic`: The number of bytes this shard received from the gateway,
+        both as received and decompressed.
+
+        .. versionadded:: 2.0
+        """
+        return self._parent._client._gateway_traffic.setdefault(self.id, GatewayTraffic())
+
     def is_ws_ratelimited(self) -> bool:
         """:class:`bool`: Whether the websocket is currently rate limited.
 
@@ -290,6 +305,71 @@ class ShardInfo:
         return self._parent.ws.is_ratelimited()
 
 
+class IdentifyCoordinator:
+    """An interface that coordinates when shards are allowed to IDENTIFY.
+
+    Discord allows ``max_concurrency`` shards to IDENTIFY every 5 seconds,
+    with each shard belonging to the rate limit bucket ``shard_id % max_concurrency``.
+
+    The default implementation, :class:`LocalIdentifyCoordinator`, only knows
+    about the shards in the current process. If multiple processes share the
+    same bot token, subclass this to share the limit between them, e.g. through
+    a lock held in an external store.
+
+    .. versionadded:: 2.0
+    """
+
+    async def acquire(self, shard_id: int, max_concurrency: int) -> None:
+        """|coro|
+
+        Waits until the given shard is allowed to send its IDENTIFY.
+
+        Parameters
+        ------------
+        shard_id: :class:`int`
+            The shard ID that is about to IDENTIFY.
+        max_concurrency: :class:`int`
+            The number of shards that may IDENTIFY concurrently, as given
+            by the ``session_start_limit`` Discord sent.
+        """
+        raise NotImplementedError
+
+
+class LocalIdentifyCoordinator(IdentifyCoordinator):
+    """An :class:`IdentifyCoordinator` for shards running in a single process.
+
+    Every rate limit bucket lets one shard IDENTIFY every ``per`` seconds
+    while shards in different buckets IDENTIFY in parallel.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    per: :class:`float`
+        The number of seconds between IDENTIFYs in the same bucket.
+        Defaults to ``5.0``.
+    """
+
+    def __init__(self, *, per: float = 5.0) -> None:
+        self.per: float = per
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._next_identify: Dict[int, float] = {}
+
+    async def acquire(self, shard_id: int, max_concurrency: int) -> None:
+        key = shard_id % max_concurrency
+        try:
+            lock = self._locks[key]
+        except KeyError:
+            lock = self._locks[key] = asyncio.Lock()
+
+        async with lock:
+            delay = self._next_identify.get(key, 0.0) - time.monotonic()
+            if delay > 0:
+                _log.debug('Shard ID %s is waiting %.2fs to IDENTIFY in bucket %s.', shard_id, delay, key)
+                await asyncio.sleep(delay)
+            self._next_identify[key] = time.monotonic() + self.per
+
+
 class AutoShardedClient(Client):
     """A client similar to :class:`Client` except it handles the complications
     of sharding for the user into a more manageable and transparent single
@@ -311,10 +391,30 @@ class AutoShardedClient(Client):
     if this is used. By default, when omitted, the client will launch shards from
     0 to ``shard_count - 1``.
 
+    Shards are launched in parallel according to the ``max_concurrency`` Discord
+    allows for the bot, with the IDENTIFYs being coordinated by the ``identify_coordinator``
+    parameter. By default this is a :class:`LocalIdentifyCoordinator`.
+
+    .. versionchanged:: 2.0
+        Shards are launched concurrently, honouring ``max_concurrency``.
+
     Attributes
     ------------
     shard_ids: Optional[List[:class:`int`]]
         An optional list of shard_ids to launch the shards with.
+    identify_coordinator: :class:`IdentifyCoordinator`
+        The coordinator deciding when shards may IDENTIFY.
+
+        .. versionadded:: 2.0
+    max_concurrency: :class:`int`
+        The number of shards that may IDENTIFY concurrently. This is ``1``
+        until the shards have been launched.
+
+        .. versionadded:: 2.0
+    cluster: Optional[:class:`Cluster`]
+        The cluster this client runs in when launched by a :class:`ClusterLauncher`.
+
+        .. versionadded:: 2.0
     """
 
     if TYPE_CHECKING:
@@ -323,8 +423,14 @@ class AutoShardedClient(Client):
     def __init__(self, *args: Any, loop: Optional[asyncio.AbstractEventLoop] = None, **kwargs: Any) -> None:
         kwargs.pop('shard_id', None)
         self.shard_ids: Optional[List[int]] = kwargs.pop('shard_ids', None)
+        self.identify_coordinator: IdentifyCoordinator = kwargs.pop('identify_coordinator', None) or LocalIdentifyCoordinator()
+        self.max_concurrency: int = 1
+        self.cluster: Optional[Cluster] = None
         super().__init__(*args, loop=loop, **kwargs)
 
+        if not isinstance(self.identify_coordinator, IdentifyCoordinator):
+            raise ClientException('identify_coordinator parameter must derive from IdentifyCoordinator.')
+
         if self.shard_ids is not None:
             if self.shard_count is None:
                 raise ClientException('When passing manual shard_ids, you must provide a shard_count.')
@@ -388,9 +494,33 @@ class AutoShardedClient(Client):
         """Mapping[int, :class:`ShardInfo`]: Returns a mapping of shard IDs to their respective info object."""
         return {shard_id: ShardInfo(parent, self.shard_count) for shard_id, parent in self.__shards.items()}
 
-    async def launch_shard(self, gateway: str, shard_id: int, *, initial: bool = False) -> None:
+    @utils.copy_doc(Client.export_resume_states)
+    def export_resume_states(self) -> List[ResumeState]:
+        states = [shard.ws.resume_state() for shard in self.__shards.values()]
+        return [state for state in states if state is not None]
+
+    async def launch_shard(
+        self,
+        gateway: str,
+        shard_id: int,
+        *,
+        initial: bool = False,
+        resume_state: Optional[ResumeState] = None,
+    ) -> None:
         try:
-            coro = DiscordWebSocket.from_client(self, initial=initial, gateway=gateway, shard_id=shard_id)
+            if resume_state is None:
+                coro = DiscordWebSocket.from_client(self, initial=initial, gateway=gateway, shard_id=shard_id)
+            else:
+                coro = DiscordWebSocket.from_client(
+                    self,
+                    initial=initial,
+                    gateway=resume_state.gateway or gateway,
+                    shard_id=shard_id,
+                    session=resume_state.session_id,
+                    sequence=resume_state.sequence,
+                    resume=True,
+                    restored=True,
+                )
             ws = await asyncio.wait_for(coro, timeout=180.0)
         except Exception:
             _log.exception('Failed to connect for shard_id: %s. Retrying...', shard_id)
@@ -401,26 +531,69 @@ class AutoShardedClient(Client):
         self.__shards[shard_id] = ret = Shard(ws, self, self.__queue.put_nowait)
         ret.launch()
 
-    async def launch_shards(self) -> None:
+    async def before_identify_hook(self, shard_id: Optional[int], *, initial: bool = False) -> None:
+        """|coro|
+
+        A hook that is called before IDENTIFYing a session. This is useful
+        if you wish to have more control over the synchronization of multiple
+        IDENTIFYing clients.
+
+        The default implementation waits on :attr:`identify_coordinator`.
+
+        .. versionadded:: 1.4
+
+        .. versionchanged:: 2.0
+            Waits on :attr:`identify_coordinator` instead of sleeping for 5 seconds.
+
+        Parameters
+        ------------
+        shard_id: :class:`int`
+            The shard ID that requested being IDENTIFY'd
+        initial: :class:`bool`
+            Whether this IDENTIFY is the first initial IDENTIFY.
+        """
+
+        # shard_id is never None for an AutoShardedClient
+        await self.identify_coordinator.acquire(shard_id, self.max_concurrency)  # type: ignore
+
+    async def _launch_bucket(self, gateway: str, shard_ids: List[int], initial_id: int) -> None:
+        for shard_id in shard_ids:
+            await self.launch_shard(gateway, shard_id, initial=shard_id == initial_id)
+
+    async def launch_shards(self, resume_states: Optional[Iterable[ResumeState]] = None) -> None:
+        shard_count, gateway, session_start_limit = await self.http.get_bot_gateway(encoding=self._gateway_encoding)
         if self.shard_count is None:
-            self.shard_count, gateway = await self.http.get_bot_gateway()
-        else:
-            gateway = await self.http.get_gateway()
+            self.shard_count = shard_count
 
+        self.max_concurrency = max(session_start_limit.get('max_concurrency', 1), 1)
         self._connection.shard_count = self.shard_count
 
         shard_ids = self.shard_ids or range(self.shard_count)
         self._connection.shard_ids = shard_ids
 
+        # restored sessions RESUME, which is not limited like IDENTIFY is
+        restored = {state.shard_id: state for state in resume_states or () if state.shard_id in shard_ids}
+        if restored:
+            _log.info('Restoring the sessions of shard IDs %s.', ', '.join(map(str, restored)))
+            await asyncio.gather(
+                *(self.launch_shard(gateway, shard_id, resume_state=state) for shard_id, state in restored.items())
+            )
+
+        # shards in different identify buckets can connect at the same time
+        buckets: Dict[int, List[int]] = {}
         for shard_id in shard_ids:
-            initial = shard_id == shard_ids[0]
-            await self.launch_shard(gateway, shard_id, initial=initial)
+            if shard_id in restored:
+                continue
+            buckets.setdefault(shard_id % self.max_concurrency, []).append(shard_id)
+
+        _log.info('Launching %d shards with a max_concurrency of %d.', len(shard_ids), self.max_concurrency)
+        await asyncio.gather(*(self._launch_bucket(gateway, ids, shard_ids[0]) for ids in buckets.values()))
 
         self._connection.shards_launched.set()
 
-    async def connect(self, *, reconnect: bool = True) -> None:
+    async def connect(self, *, reconnect: bool = True, resume_states: Optional[Iterable[ResumeState]] = None) -> None:
         self._reconnect = reconnect
-        await self.launch_shards()
+        await self.launch_shards(resume_states)
 
         while not self.is_closed():
             item = await self.__queue.get()
@@ -442,10 +615,18 @@ class AutoShardedClient(Client):
             elif item.type == EventType.clean_close:
                 return
 
-    async def close(self) -> None:
+    async def close(self, *, resumable: bool = False) -> None:
         """|coro|
 
         Closes the connection to pda.
+
+        Parameters
+        -----------
+        resumable: :class:`bool`
+            Whether to keep the gateway sessions valid so that they can be
+            resumed by another process through :meth:`export_resume_states`.
+
+            .. versionadded:: 2.0
         """
         if self.is_closed():
             return
@@ -458,7 +639,8 @@ class AutoShardedClient(Client):
             except Exception:
                 pass
 
-        to_close = [asyncio.ensure_future(shard.close(), loop=self.loop) for shard in self.__shards.values()]
+        code = 4000 if resumable else 1000
+        to_close = [asyncio.ensure_future(shard.close(code), loop=self.loop) for shard in self.__shards.values()]
         if to_close:
             await asyncio.wait(to_close)
 
@@ -0,0 +1,215 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from . import utils
+
+if TYPE_CHECKING:
+    from .abc import GuildChannel
+    from .emoji import Emoji
+    from .guild import Guild
+    from .member import Member
+    from .role import Role
+    from .state import ConnectionState
+    from .user import BaseUser
+
+# The snapshot format is the magic header followed by zlib compressed JSON
+# of GUILD_CREATE shaped payloads, so loading it goes through the same code
+# paths as the gateway does.
+MAGIC = b'PDASNAP'
+VERSION = 1
+
+__all__ = ()
+
+# payload key -> attribute, for the channel attributes that not every channel type has
+_channel_attributes = (
+    ('topic', 'topic'),
+    ('nsfw', 'nsfw'),
+    ('rate_limit_per_user', 'slowmode_delay'),
+    ('default_auto_archive_duration', 'default_auto_archive_duration'),
+    ('bitrate', 'bitrate'),
+    ('user_limit', 'user_limit'),
+    ('rtc_region', 'rtc_region'),
+    ('video_quality_mode', 'video_quality_mode'),
+)
+
+
+def _value(obj: Any) -> Any:
+    # enums are serialised as their raw value
+    return getattr(obj, 'value', obj)
+
+
+def _snowflake(value: Optional[int]) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    return None if value is None else value.isoformat()
+
+
+def _user_payload(user: BaseUser) -> Dict[str, Any]:
+    payload = user._to_minimal_user_json()
+    payload['id'] = str(user.id)
+    payload['public_flags'] = user._public_flags
+    payload['system'] = user.system
+    return payload
+
+
+def _role_payload(role: Role) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        'id': str(role.id),
+        'name': role.name,
+        'permissions': str(role._permissions),
+        'position': role.position,
+        'color': role._colour,
+        'hoist': role.hoist,
+        'managed': role.managed,
+        'mentionable': role.mentionable,
+    }
+
+    tags = role.tags
+    if tags is not None:
+        payload['tags'] = tag_payload = {}
+        if tags.bot_id is not None:
+            tag_payload['bot_id'] = str(tags.bot_id)
+        if tags.integration_id is not None:
+            tag_payload['integration_id'] = str(tags.integration_id)
+        if tags.is_premium_subscriber():
+            tag_payload['premium_subscriber'] = None
+
+    return payload
+
+
+def _emoji_payload(emoji: Emoji) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        'id': str(emoji.id),
+        'name': emoji.name,
+        'require_colons': emoji.require_colons,
+        'managed': emoji.managed,
+        'animated': emoji.animated,
+        'available': emoji.available,
+        'roles': [str(role_id) for role_id in emoji._roles],
+    }
+    if emoji.user is not None:
+        payload['user'] = _user_payload(emoji.user)
+    return payload
+
+
+def _channel_payload(channel: GuildChannel) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        'id': str(channel.id),
+        'type': _value(channel.type),
+        'name': channel.name,
+        'position': channel.position,
+        'parent_id': _snowflake(channel.category_id),
+        'permission_overwrites': [overwrite._asdict() for overwrite in channel._overwrites],
+    }
+
+    for key, attr in _channel_attributes:
+        try:
+            value = getattr(channel, attr)
+        except AttributeError:
+            continue
+        payload[key] = _value(value)
+
+    last_message_id = getattr(channel, 'last_message_id', None)
+    if last_message_id is not None:
+        payload['last_message_id'] = str(last_message_id)
+
+    return payload
+
+
+def _member_payload(member: Member) -> Dict[str, Any]:
+    return {
+        'user': _user_payload(member._user),
+        'roles': [str(role_id) for role_id in member._roles],
+        'joined_at': _timestamp(member.joined_at),
+        'premium_since': _timestamp(member.premium_since),
+        'nick': member.nick,
+        'pending': member.pending,
+        'avatar': member._avatar,
+    }
+
+
+def _guild_payload(guild: Guild) -> Dict[str, Any]:
+    return {
+        'id': str(guild.id),
+        'name': guild.name,
+        'region': _value(guild.region),
+        'verification_level': _value(guild.verification_level),
+        'default_message_notifications': _value(guild.default_notifications),
+        'explicit_content_filter': _value(guild.explicit_content_filter),
+        'afk_timeout': guild.afk_timeout,
+        'afk_channel_id': _snowflake(guild.afk_channel and guild.afk_channel.id),
+        'icon': guild._icon,
+        'banner': guild._banner,
+        'splash': guild._splash,
+        'discovery_splash': guild._discovery_splash,
+        'mfa_level': _value(guild.mfa_level),
+        'features': guild.features,
+        'system_channel_id': _snowflake(guild._system_channel_id),
+        'system_channel_flags': guild._system_channel_flags,
+        'rules_channel_id': _snowflake(guild._rules_channel_id),
+        'public_updates_channel_id': _snowflake(guild._public_updates_channel_id),
+        'description': guild.description,
+        'max_presences': guild.max_presences,
+        'max_members': guild.max_members,
+        'max_video_channel_users': guild.max_video_channel_users,
+        'premium_tier': guild.premium_tier,
+        'premium_subscription_count': guild.premium_subscription_count,
+        'preferred_locale': guild.preferred_locale,
+        'nsfw_level': _value(guild.nsfw_level),
+        'owner_id': _snowflake(guild.owner_id),
+        'member_count': getattr(guild, '_member_count', None),
+        'large': guild._large,
+        'roles': [_role_payload(role) for role in guild._roles.values()],
+        'emojis': [_emoji_payload(emoji) for emoji in guild.emojis],
+        'channels': [_channel_payload(channel) for channel in guild._channels.values()],
+        'members': [_member_payload(member) for member in guild._members.values()],
+    }
+
+
+def dump(state: ConnectionState) -> bytes:
+    guilds = [_guild_payload(guild) for guild in state._guilds.values() if not guild.unavailable]
+    data = {
+        'version': VERSION,
+        'user_id': _snowflake(state.self_id),
+        'guilds': guilds,
+    }
+    return MAGIC + zlib.compress(utils._to_json(data).encode('utf-8'))
+
+
+def load(raw: bytes) -> Dict[str, Any]:
+    if not raw.startswith(MAGIC):
+        raise ValueError('not a cache snapshot')
+
+    data = utils._from_json(zlib.decompress(raw[len(MAGIC) :]))
+    if data.get('version') != VERSION:
+        raise ValueError(f'unsupported cache snapshot version {data.get("version")!r}')
+
+    return data
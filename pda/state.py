@@ -25,12 +25,11 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
-from collections import deque, OrderedDict
 import copy
 import datetime
 import itertools
 import logging
-from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, TypeVar, Coroutine, Sequence, Tuple, Deque
+from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, TypeVar, Coroutine, Sequence, Tuple, Set
 import inspect
 
 import os
@@ -45,7 +44,7 @@ from .message import Message
 from .channel import *
 from .channel import _channel_factory
 from .raw_models import *
-from .member import Member
+from .member import CompactMemberStore, Member
 from .role import Role
 from .enums import ChannelType, try_enum, Status
 from . import utils
@@ -58,6 +57,7 @@ from .ui.view import ViewStore, View
 from .stage_instance import StageInstance
 from .threads import Thread, ThreadMember
 from .sticker import GuildSticker
+from .cache import CacheFactory, CacheStore, DictCacheStore, LRUCacheStore, MessageCache
 
 if TYPE_CHECKING:
     from .abc import PrivateChannel
@@ -145,6 +145,22 @@ class ConnectionState:
         _get_client: Callable[..., Client]
         _parsers: Dict[str, Callable[[Dict[str, Any]], None]]
 
+    _cache_names: Tuple[str, ...] = ('users', 'guilds', 'emojis', 'stickers', 'private_channels', 'messages')
+
+    # Gateway events whose parsers can be skipped when lazy dispatch is enabled,
+    # mapped to the client events their parser dispatches.
+    _lazy_events: Dict[str, Tuple[str, ...]] = {
+        'PRESENCE_UPDATE': ('presence_update', 'user_update'),
+        'TYPING_START': ('typing',),
+        'INVITE_CREATE': ('invite_create',),
+        'INVITE_DELETE': ('invite_delete',),
+        'GUILD_INTEGRATIONS_UPDATE': ('guild_integrations_update',),
+        'INTEGRATION_CREATE': ('integration_create',),
+        'INTEGRATION_UPDATE': ('integration_update',),
+        'INTEGRATION_DELETE': ('raw_integration_delete',),
+        'WEBHOOKS_UPDATE': ('webhooks_update',),
+    }
+
     def __init__(
         self,
         *,
@@ -161,6 +177,19 @@ class ConnectionState:
         if self.max_messages is not None and self.max_messages <= 0:
             self.max_messages = 1000
 
+        self.max_messages_per_channel: Optional[int] = options.get('max_messages_per_channel', None)
+        if self.max_messages_per_channel is not None and self.max_messages_per_channel <= 0:
+            raise ValueError('max_messages_per_channel must be greater than 0')
+
+        cache_backends = options.get('cache_backends', None) or {}
+        for name, factory in cache_backends.items():
+            if name not in self._cache_names:
+                raise ValueError(f'cache_backends got an unknown cache {name!r}')
+            if not callable(factory):
+                raise TypeError(f'cache_backends[{name!r}] must be a callable returning a CacheStore not {factory!r}')
+
+        self._cache_backends: Dict[str, CacheFactory] = cache_backends
+
         self.dispatch: Callable = dispatch
         self.handlers: Dict[str, Callable] = handlers
         self.hooks: Dict[str, Callable] = hooks
@@ -233,6 +262,14 @@ class ConnectionState:
             if attr.startswith('parse_'):
                 parsers[attr[6:].upper()] = func
 
+        self._lazy_dispatch: bool = options.get('lazy_dispatch', False)
+        # the full parsers that lazy dispatch swaps in and out of self.parsers
+        self._full_parsers: Dict[str, Callable[[Dict[str, Any]], None]] = parsers.copy()
+
+        # IDs of the guilds loaded from a cache snapshot whose
+        # GUILD_CREATE has not been reconciled with them yet
+        self._snapshot: Set[int] = set()
+
         self.clear()
 
     def clear(self, *, views: bool = True) -> None:
@@ -249,23 +286,67 @@ class ConnectionState:
         # references now using a regular dictionary with eviction being done
         # using __del__. Testing this for memory leaks led to no discernable leaks,
         # though more testing will have to be done.
-        self._users: Dict[int, User] = {}
-        self._emojis: Dict[int, Emoji] = {}
-        self._stickers: Dict[int, GuildSticker] = {}
-        self._guilds: Dict[int, Guild] = {}
+        self._users: CacheStore[int, User] = self._create_cache('users', DictCacheStore)
+        self._emojis: CacheStore[int, Emoji] = self._create_cache('emojis', DictCacheStore)
+        self._stickers: CacheStore[int, GuildSticker] = self._create_cache('stickers', DictCacheStore)
+        self._guilds: CacheStore[int, Guild] = self._create_cache('guilds', DictCacheStore)
         if views:
             self._view_store: ViewStore = ViewStore(self)
 
         self._voice_clients: Dict[int, VoiceProtocol] = {}
 
-        # LRU of max size 128
-        self._private_channels: OrderedDict[int, PrivateChannel] = OrderedDict()
+        # LRU of max size 128 by default
+        self._private_channels: CacheStore[int, PrivateChannel] = self._create_cache(
+            'private_channels', lambda: LRUCacheStore(128)
+        )
         # extra dict to look up private channels by user id
         self._private_channels_by_user: Dict[int, DMChannel] = {}
         if self.max_messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(maxlen=self.max_messages)
+            default = lambda: MessageCache(self.max_messages, max_messages_per_channel=self.max_messages_per_channel)  # type: ignore
+            self._messages: Optional[CacheStore[int, Message]] = self._create_cache('messages', default)
         else:
-            self._messages: Optional[Deque[Message]] = None
+            self._messages: Optional[CacheStore[int, Message]] = None
+
+    def _create_cache(self, name: str, default: CacheFactory) -> CacheStore[Any, Any]:
+        factory = self._cache_backends.get(name, default)
+        store = factory()
+        if not isinstance(store, CacheStore):
+            raise TypeError(f'cache_backends[{name!r}] must return a CacheStore not {store.__class__!r}')
+        return store
+
+    def _update_lazy_parsers(self) -> None:
+        # Swapping entries in the parser table keeps the gateway's hot path
+        # free of any listener checks.
+        if not self._lazy_dispatch:
+            return
+
+        try:
+            client = self._get_client()
+        except AttributeError:
+            return
+
+        parsers = self.parsers
+        for event, dispatched in self._lazy_events.items():
+            if any(client._has_listeners(name) for name in dispatched):
+                parsers[event] = self._full_parsers[event]
+            elif event == 'PRESENCE_UPDATE' and not self.member_cache_flags._empty:
+                parsers[event] = self._cache_presence_update
+            else:
+                parsers[event] = self._skip_event
+
+    def _skip_event(self, data: Dict[str, Any]) -> None:
+        pass
+
+    def _cache_presence_update(self, data: Dict[str, Any]) -> None:
+        # Same as parse_presence_update without the copies needed for dispatching
+        guild = self._get_guild(utils._get_as_snowflake(data, 'guild_id'))
+        if guild is None:
+            return
+
+        user = data['user']
+        member = guild.get_member(int(user['id']))
+        if member is not None and member._presence_update(data=data, user=user):
+            guild._add_member(member)
 
     def process_chunk_requests(self, guild_id: int, nonce: Optional[str], members: List[Member], complete: bool) -> None:
         removed = []
@@ -326,17 +407,16 @@ class ConnectionState:
 
     def store_user(self, data: UserPayload) -> User:
         user_id = int(data['id'])
-        try:
-            return self._users[user_id]
-        except KeyError:
+        user = self._users.get(user_id)
+        if user is None:
             user = User(state=self, data=data)
             if user.discriminator != '0000':
-                self._users[user_id] = user
+                self._users.put(user_id, user)
                 user._stored = True
-            return user
+        return user
 
     def deref_user(self, user_id: int) -> None:
-        self._users.pop(user_id, None)
+        self._users.evict(user_id)
 
     def create_user(self, data: UserPayload) -> User:
         return User(state=self, data=data)
@@ -351,12 +431,14 @@ class ConnectionState:
     def store_emoji(self, guild: Guild, data: EmojiPayload) -> Emoji:
         # the id will be present here
         emoji_id = int(data['id'])  # type: ignore
-        self._emojis[emoji_id] = emoji = Emoji(guild=guild, state=self, data=data)
+        emoji = Emoji(guild=guild, state=self, data=data)
+        self._emojis.put(emoji_id, emoji)
         return emoji
 
     def store_sticker(self, guild: Guild, data: GuildStickerPayload) -> GuildSticker:
         sticker_id = int(data['id'])
-        self._stickers[sticker_id] = sticker = GuildSticker(state=self, data=data)
+        sticker = GuildSticker(state=self, data=data)
+        self._stickers.put(sticker_id, sticker)
         return sticker
 
     def store_view(self, view: View, message_id: Optional[int] = None) -> None:
@@ -378,16 +460,16 @@ class ConnectionState:
         return self._guilds.get(guild_id)  # type: ignore
 
     def _add_guild(self, guild: Guild) -> None:
-        self._guilds[guild.id] = guild
+        self._guilds.put(guild.id, guild)
 
     def _remove_guild(self, guild: Guild) -> None:
-        self._guilds.pop(guild.id, None)
+        self._guilds.evict(guild.id)
 
         for emoji in guild.emojis:
-            self._emojis.pop(emoji.id, None)
+            self._emojis.evict(emoji.id)
 
         for sticker in guild.stickers:
-            self._stickers.pop(sticker.id, None)
+            self._stickers.evict(sticker.id)
 
         del guild
 
@@ -412,30 +494,33 @@ class ConnectionState:
         return list(self._private_channels.values())
 
     def _get_private_channel(self, channel_id: Optional[int]) -> Optional[PrivateChannel]:
-        try:
-            # the keys of self._private_channels are ints
-            value = self._private_channels[channel_id]  # type: ignore
-        except KeyError:
-            return None
-        else:
-            self._private_channels.move_to_end(channel_id)  # type: ignore
-            return value
+        # the keys of self._private_channels are ints
+        return self._private_channels.get(channel_id)  # type: ignore
 
     def _get_private_channel_by_user(self, user_id: Optional[int]) -> Optional[DMChannel]:
         # the keys of self._private_channels are ints
-        return self._private_channels_by_user.get(user_id)  # type: ignore
+        channel = self._private_channels_by_user.get(user_id)  # type: ignore
+        if channel is None:
+            return None
 
-    def _add_private_channel(self, channel: PrivateChannel) -> None:
-        channel_id = channel.id
-        self._private_channels[channel_id] = channel
+        # the private channel store may have evicted this channel on its own
+        if self._private_channels.get(channel.id) is not channel:
+            del self._private_channels_by_user[user_id]  # type: ignore
+            return None
+        return channel
 
-        if len(self._private_channels) > 128:
-            _, to_remove = self._private_channels.popitem(last=False)
-            if isinstance(to_remove, DMChannel) and to_remove.recipient:
-                self._private_channels_by_user.pop(to_remove.recipient.id, None)
+    def _add_private_channel(self, channel: PrivateChannel) -> None:
+        self._private_channels.put(channel.id, channel)
 
         if isinstance(channel, DMChannel) and channel.recipient:
-            self._private_channels_by_user[channel.recipient.id] = channel
+            by_user = self._private_channels_by_user
+            by_user[channel.recipient.id] = channel
+
+            # drop entries for channels the store has since evicted
+            if len(by_user) > 2 * len(self._private_channels) + 128:
+                for user_id, dm in list(by_user.items()):
+                    if self._private_channels.get(dm.id) is not dm:
+                        del by_user[user_id]
 
     def add_dm_channel(self, data: DMChannelPayload) -> DMChannel:
         # self.user is *always* cached when this is called
@@ -444,14 +529,14 @@ class ConnectionState:
         return channel
 
     def _remove_private_channel(self, channel: PrivateChannel) -> None:
-        self._private_channels.pop(channel.id, None)
+        self._private_channels.evict(channel.id)
         if isinstance(channel, DMChannel):
             recipient = channel.recipient
             if recipient is not None:
                 self._private_channels_by_user.pop(recipient.id, None)
 
     def _get_message(self, msg_id: Optional[int]) -> Optional[Message]:
-        return utils.find(lambda m: m.id == msg_id, reversed(self._messages)) if self._messages else None
+        return self._messages.get(msg_id) if self._messages else None
 
     def _add_guild_from_data(self, data: GuildPayload) -> Guild:
         guild = Guild(data=data, state=self)
@@ -539,6 +624,7 @@ class ConnectionState:
         except asyncio.CancelledError:
             pass
         else:
+            self._drop_snapshot()
             # dispatch the event
             self.call_handlers('ready')
             self.dispatch('ready')
@@ -550,7 +636,12 @@ class ConnectionState:
             self._ready_task.cancel()
 
         self._ready_state = asyncio.Queue()
-        self.clear(views=False)
+        if self._snapshot:
+            # guilds loaded from a cache snapshot are reconciled rather than cleared
+            self._prune_snapshot(None, {int(g['id']) for g in data['guilds']})
+        else:
+            self.clear(views=False)
+        self._update_lazy_parsers()
         self.user = ClientUser(state=self, data=data['user'])
         self.store_user(data['user'])
 
@@ -564,14 +655,25 @@ class ConnectionState:
                 # flags will always be present here
                 self.application_flags = ApplicationFlags._from_value(application['flags'])  # type: ignore
 
-        for guild_data in data['guilds']:
-            self._add_guild_from_data(guild_data)
+        self._add_ready_guilds(data['guilds'])
 
         self.dispatch('connect')
         self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
         self.dispatch('resumed')
+        if data.get('__restored__'):
+            self._restore_ready()
+
+    def _restore_ready(self) -> None:
+        # A session restored from another process never receives READY
+        # so the client becomes ready once it has resumed instead.
+        if self.user is not None:
+            self._users.put(self.user.id, self.user)  # type: ignore
+
+        if self._ready_task is None:
+            self._ready_state = asyncio.Queue()
+            self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_message_create(self, data) -> None:
         channel, _ = self._get_guild_channel(data)
@@ -579,24 +681,28 @@ class ConnectionState:
         message = Message(channel=channel, data=data, state=self)  # type: ignore
         self.dispatch('message', message)
         if self._messages is not None:
-            self._messages.append(message)
+            self._messages.put(message.id, message)
         # we ensure that the channel is either a TextChannel or Thread
         if channel and channel.__class__ in (TextChannel, Thread):
             channel.last_message_id = message.id  # type: ignore
 
     def parse_message_delete(self, data) -> None:
         raw = RawMessageDeleteEvent(data)
+        self.http.invalidate('/channels/{channel_id}/messages/{message_id}', channel_id=raw.channel_id, message_id=raw.message_id)
         found = self._get_message(raw.message_id)
         raw.cached_message = found
         self.dispatch('raw_message_delete', raw)
         if self._messages is not None and found is not None:
             self.dispatch('message_delete', found)
-            self._messages.remove(found)
+            self._messages.evict(found.id)
 
     def parse_message_delete_bulk(self, data) -> None:
         raw = RawBulkMessageDeleteEvent(data)
+        for message_id in raw.message_ids:
+            self.http.invalidate('/channels/{channel_id}/messages/{message_id}', channel_id=raw.channel_id, message_id=message_id)
         if self._messages:
-            found_messages = [message for message in self._messages if message.id in raw.message_ids]
+            cache = self._messages
+            found_messages = [message for message in map(cache.get, sorted(raw.message_ids)) if message is not None]
         else:
             found_messages = []
         raw.cached_messages = found_messages
@@ -605,10 +711,11 @@ class ConnectionState:
             self.dispatch('bulk_message_delete', found_messages)
             for msg in found_messages:
                 # self._messages won't be None here
-                self._messages.remove(msg)  # type: ignore
+                self._messages.evict(msg.id)  # type: ignore
 
     def parse_message_update(self, data) -> None:
         raw = RawMessageUpdateEvent(data)
+        self.http.invalidate('/channels/{channel_id}/messages/{message_id}', channel_id=raw.channel_id, message_id=raw.message_id)
         message = self._get_message(raw.message_id)
         if message is not None:
             older_message = copy.copy(message)
@@ -725,6 +832,8 @@ class ConnectionState:
         old_member = Member._copy(member)
         user_update = member._presence_update(data=data, user=user)
         if user_update:
+            # compact member stores keep a copy of the user's data
+            guild._add_member(member)
             self.dispatch('user_update', user_update[0], user_update[1])
 
         self.dispatch('presence_update', old_member, member)
@@ -748,6 +857,7 @@ class ConnectionState:
     def parse_channel_delete(self, data) -> None:
         guild = self._get_guild(utils._get_as_snowflake(data, 'guild_id'))
         channel_id = int(data['id'])
+        self.http.invalidate('/channels/{channel_id}', channel_id=channel_id)
         if guild is not None:
             channel = guild.get_channel(channel_id)
             if channel is not None:
@@ -757,6 +867,7 @@ class ConnectionState:
     def parse_channel_update(self, data) -> None:
         channel_type = try_enum(ChannelType, data.get('type'))
         channel_id = int(data['id'])
+        self.http.invalidate('/channels/{channel_id}', channel_id=channel_id)
         if channel_type is ChannelType.group:
             channel = self._get_private_channel(channel_id)
             old_channel = copy.copy(channel)
@@ -831,6 +942,7 @@ class ConnectionState:
 
     def parse_thread_update(self, data) -> None:
         guild_id = int(data['guild_id'])
+        self.http.invalidate('/channels/{channel_id}', channel_id=data['id'])
         guild = self._get_guild(guild_id)
         if guild is None:
             _log.debug('THREAD_UPDATE referencing an unknown guild ID: %s. Discarding', guild_id)
@@ -849,6 +961,7 @@ class ConnectionState:
 
     def parse_thread_delete(self, data) -> None:
         guild_id = int(data['guild_id'])
+        self.http.invalidate('/channels/{channel_id}', channel_id=data['id'])
         guild = self._get_guild(guild_id)
         if guild is None:
             _log.debug('THREAD_DELETE referencing an unknown guild ID: %s. Discarding', guild_id)
@@ -962,6 +1075,7 @@ class ConnectionState:
         self.dispatch('member_join', member)
 
     def parse_guild_member_remove(self, data) -> None:
+        self._invalidate_member(data)
         guild = self._get_guild(int(data['guild_id']))
         if guild is not None:
             try:
@@ -977,7 +1091,13 @@ class ConnectionState:
         else:
             _log.debug('GUILD_MEMBER_REMOVE referencing an unknown guild ID: %s. Discarding.', data['guild_id'])
 
+    def _invalidate_member(self, data) -> None:
+        user_id = data['user']['id']
+        self.http.invalidate('/guilds/{guild_id}/members/{member_id}', guild_id=data['guild_id'], member_id=user_id)
+        self.http.invalidate('/users/{user_id}', user_id=user_id)
+
     def parse_guild_member_update(self, data) -> None:
+        self._invalidate_member(data)
         guild = self._get_guild(int(data['guild_id']))
         user = data['user']
         user_id = int(user['id'])
@@ -990,6 +1110,8 @@ class ConnectionState:
             old_member = Member._copy(member)
             member._update(data)
             user_update = member._update_inner_user(user)
+            # compact member stores keep a copy of the member's data
+            guild._add_member(member)
             if user_update:
                 self.dispatch('user_update', user_update[0], user_update[1])
 
@@ -1014,7 +1136,7 @@ class ConnectionState:
 
         before_emojis = guild.emojis
         for emoji in before_emojis:
-            self._emojis.pop(emoji.id, None)
+            self._emojis.evict(emoji.id)
         # guild won't be None here
         guild.emojis = tuple(map(lambda d: self.store_emoji(guild, d), data['emojis']))  # type: ignore
         self.dispatch('guild_emojis_update', guild, before_emojis, guild.emojis)
@@ -1027,12 +1149,74 @@ class ConnectionState:
 
         before_stickers = guild.stickers
         for emoji in before_stickers:
-            self._stickers.pop(emoji.id, None)
+            self._stickers.evict(emoji.id)
         # guild won't be None here
         guild.stickers = tuple(map(lambda d: self.store_sticker(guild, d), data['stickers']))  # type: ignore
         self.dispatch('guild_stickers_update', guild, before_stickers, guild.stickers)
 
+    def _load_snapshot(self, data: Dict[str, Any]) -> List[Guild]:
+        # only the IDs are kept, the payloads are not needed once the guilds are built
+        guilds = [self._add_guild_from_data(guild_data) for guild_data in data['guilds']]
+        self._snapshot.update(guild.id for guild in guilds)
+        return guilds
+
+    def _prune_snapshot(self, shard_id: Optional[int], guild_ids: Set[int]) -> None:
+        # guilds from the snapshot that this shard's READY no longer has
+        snapshot = self._snapshot
+        if shard_id is not None:
+            snapshot = {g for g in snapshot if (g >> 22) % self.shard_count == shard_id}  # type: ignore
+        for guild_id in list(snapshot):
+            if guild_id not in guild_ids:
+                self._snapshot.discard(guild_id)
+                guild = self._get_guild(guild_id)
+                if guild is not None:
+                    self._remove_guild(guild)
+
+    def _drop_snapshot(self) -> None:
+        # Loaded guilds whose GUILD_CREATE has not arrived by the time the client
+        # is ready are removed, so a late one is built from scratch rather than
+        # applied on top of what may have been deleted in the meantime.
+        for guild_id in self._snapshot:
+            guild = self._get_guild(guild_id)
+            if guild is not None:
+                self._remove_guild(guild)
+        self._snapshot.clear()
+
+    def _add_ready_guilds(self, guilds: List[GuildPayload]) -> None:
+        snapshot = self._snapshot
+        for guild_data in guilds:
+            guild_id = int(guild_data['id'])
+            guild = self._get_guild(guild_id) if guild_id in snapshot else None
+            if guild is not None:
+                # loaded guilds are kept until their GUILD_CREATE is reconciled with them
+                guild.unavailable = guild_data.get('unavailable', False)
+            else:
+                self._add_guild_from_data(guild_data)
+
+    def _reconcile_snapshot_guild(self, guild: Guild, data: GuildPayload) -> Guild:
+        # The snapshot's members are only trusted if the member count still matches,
+        # which also makes the guild count as chunked so it is not chunked again.
+        # Members sent with the GUILD_CREATE are newer and replace their snapshot
+        # counterparts, everything else is rebuilt from it.
+        member_count = getattr(guild, '_member_count', None)
+        if member_count is None or data.get('member_count') != member_count:
+            _log.debug('Guild ID %s changed since the cache snapshot, it will be chunked.', guild.id)
+            guild._members = CompactMemberStore(guild) if self.member_cache_flags.compact else {}  # type: ignore
+
+        guild._channels.clear()
+        guild._threads.clear()
+        guild._voice_states.clear()
+        guild._from_data(data)
+        return guild
+
     def _get_create_guild(self, data):
+        guild_id = int(data['id'])
+        if guild_id in self._snapshot:
+            self._snapshot.discard(guild_id)
+            guild = self._get_guild(guild_id)
+            if guild is not None:
+                return self._reconcile_snapshot_guild(guild, data)
+
         if data.get('unavailable') is False:
             # GUILD_CREATE with unavailable in the response
             # usually means that the guild has become available
@@ -1046,7 +1230,7 @@ class ConnectionState:
         return self._add_guild_from_data(data)
 
     def is_guild_evicted(self, guild) -> bool:
-        return guild.id not in self._guilds
+        return self._guilds.get(guild.id) is None
 
     async def chunk_guild(self, guild, *, wait=True, cache=None):
         cache = cache or self.member_cache_flags.joined
@@ -1122,9 +1306,8 @@ class ConnectionState:
 
         # do a cleanup of the messages cache
         if self._messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(
-                (msg for msg in self._messages if msg.guild != guild), maxlen=self.max_messages
-            )
+            for message in [msg for msg in self._messages.values() if msg.guild == guild]:
+                self._messages.evict(message.id)
 
         self._remove_guild(guild)
         self.dispatch('guild_remove', guild)
@@ -1364,19 +1547,16 @@ class ConnectionState:
         if not emoji_id:
             return data['name']
 
-        try:
-            return self._emojis[emoji_id]
-        except KeyError:
+        emoji = self._emojis.get(emoji_id)
+        if emoji is None:
             return PartialEmoji.with_state(self, animated=data.get('animated', False), id=emoji_id, name=data['name'])
+        return emoji
 
     def _upgrade_partial_emoji(self, emoji: PartialEmoji) -> Union[Emoji, PartialEmoji, str]:
         emoji_id = emoji.id
         if not emoji_id:
             return emoji.name
-        try:
-            return self._emojis[emoji_id]
-        except KeyError:
-            return emoji
+        return self._emojis.get(emoji_id, emoji)
 
     def get_channel(self, id: Optional[int]) -> Optional[Union[Channel, Thread]]:
         if id is None:
@@ -1405,7 +1585,7 @@ class AutoShardedConnectionState(ConnectionState):
 
     def _update_message_references(self) -> None:
         # self._messages won't be None when this is called
-        for msg in self._messages:  # type: ignore
+        for msg in self._messages.values():  # type: ignore
             if not msg.guild:
                 continue
 
@@ -1491,6 +1671,7 @@ class AutoShardedConnectionState(ConnectionState):
 
         # clear the current task
         self._ready_task = None
+        self._drop_snapshot()
 
         # dispatch the event
         self.call_handlers('ready')
@@ -1500,9 +1681,14 @@ class AutoShardedConnectionState(ConnectionState):
         if not hasattr(self, '_ready_state'):
             self._ready_state = asyncio.Queue()
 
+        self._update_lazy_parsers()
+
+        if self._snapshot:
+            self._prune_snapshot(data['__shard_id__'], {int(g['id']) for g in data['guilds']})
+
         self.user = user = ClientUser(state=self, data=data['user'])
-        # self._users is a list of Users, we're setting a ClientUser
-        self._users[user.id] = user  # type: ignore
+        # self._users is a store of Users, we're setting a ClientUser
+        self._users.put(user.id, user)  # type: ignore
 
         if self.application_id is None:
             try:
@@ -1513,8 +1699,7 @@ class AutoShardedConnectionState(ConnectionState):
                 self.application_id = utils._get_as_snowflake(application, 'id')
                 self.application_flags = ApplicationFlags._from_value(application['flags'])
 
-        for guild_data in data['guilds']:
-            self._add_guild_from_data(guild_data)
+        self._add_ready_guilds(data['guilds'])
 
         if self._messages:
             self._update_message_references()
@@ -1528,3 +1713,15 @@ class AutoShardedConnectionState(ConnectionState):
     def parse_resumed(self, data) -> None:
         self.dispatch('resumed')
         self.dispatch('shard_resumed', data['__shard_id__'])
+        if data.get('__restored__'):
+            self._restore_ready()
+
+    def _restore_ready(self) -> None:
+        if self.user is not None:
+            self._users.put(self.user.id, self.user)  # type: ignore
+
+        if not hasattr(self, '_ready_state'):
+            self._ready_state = asyncio.Queue()
+
+        if self._ready_task is None:
+            self._ready_task = asyncio.create_task(self._delay_ready())
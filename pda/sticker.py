@@ -23,7 +23,7 @@ DEALINGS IN THE SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import Literal, TYPE_CHECKING, List, Optional, Tuple, Type, Union
+from typing import AsyncIterator, Literal, TYPE_CHECKING, List, Optional, Tuple, Type, Union
 import unicodedata
 
 from .mixins import Hashable
@@ -165,6 +165,11 @@ class _StickerTag(Hashable, AssetMixin):
             raise TypeError('Cannot read stickers of format "lottie".')
         return await super().read()
 
+    def stream(self, *, chunk_size: int = 65536, offset: int = 0) -> AsyncIterator[bytes]:
+        if self.format is StickerFormatType.lottie:
+            raise TypeError('Cannot read stickers of format "lottie".')
+        return super().stream(chunk_size=chunk_size, offset=offset)
+
 
 class StickerItem(_StickerTag):
     """Represents a sticker item.
@@ -23,7 +23,7 @@ DEALINGS IN THE SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Sequence, TYPE_CHECKING, Tuple
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Sequence, Set, TYPE_CHECKING, Tuple
 from functools import partial
 from itertools import groupby
 
@@ -167,29 +167,11 @@ class View:
         self.id: str = os.urandom(16).hex()
         self.__cancel_callback: Optional[Callable[[View], None]] = None
         self.__timeout_expiry: Optional[float] = None
-        self.__timeout_task: Optional[asyncio.Task[None]] = None
         self.__stopped: asyncio.Future[bool] = loop.create_future()
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} timeout={self.timeout} children={len(self.children)}>'
 
-    async def __timeout_task_impl(self) -> None:
-        while True:
-            # Guard just in case someone changes the value of the timeout at runtime
-            if self.timeout is None:
-                return
-
-            if self.__timeout_expiry is None:
-                return self._dispatch_timeout()
-
-            # Check if we've elapsed our currently set timeout
-            now = time.monotonic()
-            if now >= self.__timeout_expiry:
-                return self._dispatch_timeout()
-
-            # Wait N seconds to see if timeout data has been refreshed
-            await asyncio.sleep(self.__timeout_expiry - now)
-
     def to_components(self) -> List[Dict[str, Any]]:
         def key(item: Item) -> int:
             return item._rendered_row or 0
@@ -365,12 +347,14 @@ class View:
     def _start_listening_from_store(self, store: ViewStore) -> None:
         self.__cancel_callback = partial(store.remove_view)
         if self.timeout:
-            loop = asyncio.get_running_loop()
-            if self.__timeout_task is not None:
-                self.__timeout_task.cancel()
-
             self.__timeout_expiry = time.monotonic() + self.timeout
-            self.__timeout_task = loop.create_task(self.__timeout_task_impl())
+            store._timeouts.schedule(self, self.__timeout_expiry)
+
+    def _timeout_expiry(self) -> Optional[float]:
+        # Guard just in case someone changes the value of the timeout at runtime
+        if self.timeout is None or self.__stopped.done():
+            return None
+        return self.__timeout_expiry
 
     def _dispatch_timeout(self):
         if self.__stopped.done():
@@ -415,9 +399,6 @@ class View:
             self.__stopped.set_result(False)
 
         self.__timeout_expiry = None
-        if self.__timeout_task is not None:
-            self.__timeout_task.cancel()
-            self.__timeout_task = None
 
         if self.__cancel_callback:
             self.__cancel_callback(self)
@@ -454,12 +435,103 @@ class View:
         return await self.__stopped
 
 
+class _TimerWheel:
+    # A hierarchical timing wheel: level n has SLOTS slots of SLOTS ** n ticks
+    # each, and the slots of a level are cascaded into the level below every
+    # time it wraps around. Scheduling and cancelling are O(1), and a single
+    # loop callback drives every timer no matter how many there are.
+
+    TICK = 0.5
+    BITS = 6
+    SLOTS = 1 << BITS
+    LEVELS = 4
+
+    def __init__(self, callback: Callable[[View], None]):
+        self._callback = callback
+        self._levels: List[List[Dict[View, int]]] = [[{} for _ in range(self.SLOTS)] for _ in range(self.LEVELS)]
+        # view: the slot it is in
+        self._timers: Dict[View, Dict[View, int]] = {}
+        self._tick: int = self._now()
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def _now(self) -> int:
+        return int(time.monotonic() / self.TICK)
+
+    def _insert(self, view: View, tick: int) -> None:
+        # anything further out is put as far out as possible, and
+        # rescheduled by the callback when it comes up early
+        tick = min(tick, self._tick + (1 << (self.BITS * self.LEVELS)) - 1)
+        delta = tick - self._tick
+        level = 0
+        while level < self.LEVELS - 1 and delta >= 1 << (self.BITS * (level + 1)):
+            level += 1
+
+        slot = self._levels[level][(tick >> (self.BITS * level)) & (self.SLOTS - 1)]
+        slot[view] = tick
+        self._timers[view] = slot
+
+    def schedule(self, view: View, when: float) -> None:
+        self.cancel(view)
+        if not self._timers:
+            # idle, so there are no ticks to catch up on
+            self._tick = self._now()
+
+        # timers fire on the first tick at or after their deadline
+        tick = max(-int(-when // self.TICK), self._tick + 1)
+        self._insert(view, tick)
+        if self._handle is None:
+            loop = asyncio.get_running_loop()
+            self._handle = loop.call_later(self.TICK, self._run)
+
+    def cancel(self, view: View) -> None:
+        slot = self._timers.pop(view, None)
+        if slot is not None:
+            del slot[view]
+
+    def _cascade(self) -> None:
+        for level in range(1, self.LEVELS):
+            shift = self.BITS * level
+            if self._tick & ((1 << shift) - 1):
+                break
+
+            slot = self._levels[level][(self._tick >> shift) & (self.SLOTS - 1)]
+            timers = list(slot.items())
+            slot.clear()
+            for view, tick in timers:
+                self._insert(view, tick)
+
+    def _run(self) -> None:
+        self._handle = None
+        now = self._now()
+        while self._tick < now and self._timers:
+            self._tick += 1
+            self._cascade()
+            slot = self._levels[0][self._tick & (self.SLOTS - 1)]
+            expired = list(slot)
+            slot.clear()
+            for view in expired:
+                del self._timers[view]
+                self._callback(view)
+
+        if self._timers and self._handle is None:
+            loop = asyncio.get_running_loop()
+            self._handle = loop.call_later(self.TICK, self._run)
+
+
 class ViewStore:
     def __init__(self, state: ConnectionState):
         # (component_type, message_id, custom_id): (View, Item)
         self._views: Dict[Tuple[int, Optional[int], str], Tuple[View, Item]] = {}
+        # view.id: the keys of its items in _views
+        self._view_keys: Dict[str, Set[Tuple[int, Optional[int], str]]] = {}
         # message_id: View
         self._synced_message_views: Dict[int, View] = {}
+        # view.id: the message_ids it is synced to, a view can be sent in more than one message
+        self._view_message_ids: Dict[str, Set[int]] = {}
+        self._timeouts: _TimerWheel = _TimerWheel(self._expire)
         self._state: ConnectionState = state
 
     @property
@@ -473,38 +545,45 @@ class ViewStore:
         # fmt: on
         return list(views.values())
 
-    def __verify_integrity(self):
-        to_remove: List[Tuple[int, Optional[int], str]] = []
-        for (k, (view, _)) in self._views.items():
-            if view.is_finished():
-                to_remove.append(k)
+    def _expire(self, view: View) -> None:
+        expiry = view._timeout_expiry()
+        if expiry is None:
+            return
+
+        # interactions push the expiry back without touching the wheel
+        if expiry > time.monotonic():
+            self._timeouts.schedule(view, expiry)
+            return
 
-        for k in to_remove:
-            del self._views[k]
+        view._dispatch_timeout()
+        self.remove_view(view)
 
     def add_view(self, view: View, message_id: Optional[int] = None):
-        self.__verify_integrity()
-
         view._start_listening_from_store(self)
+        keys = self._view_keys.setdefault(view.id, set())
         for item in view.children:
             if item.is_dispatchable():
-                self._views[(item.type.value, message_id, item.custom_id)] = (view, item)  # type: ignore
+                key = (item.type.value, message_id, item.custom_id)  # type: ignore
+                self._views[key] = (view, item)
+                keys.add(key)
 
         if message_id is not None:
             self._synced_message_views[message_id] = view
+            self._view_message_ids.setdefault(view.id, set()).add(message_id)
 
     def remove_view(self, view: View):
-        for item in view.children:
-            if item.is_dispatchable():
-                self._views.pop((item.type.value, item.custom_id), None)  # type: ignore
+        self._timeouts.cancel(view)
+        for key in self._view_keys.pop(view.id, ()):
+            # another view may have taken the key over since
+            value = self._views.get(key)
+            if value is not None and value[0] is view:
+                del self._views[key]
 
-        for key, value in self._synced_message_views.items():
-            if value.id == view.id:
-                del self._synced_message_views[key]
-                break
+        for message_id in self._view_message_ids.pop(view.id, ()):
+            if self._synced_message_views.get(message_id) is view:
+                del self._synced_message_views[message_id]
 
     def dispatch(self, component_type: int, custom_id: str, interaction: Interaction):
-        self.__verify_integrity()
         message_id: Optional[int] = interaction.message and interaction.message.id
         key = (component_type, message_id, custom_id)
         # Fallback to None message_id searches in case a persistent view
@@ -521,7 +600,14 @@ class ViewStore:
         return message_id in self._synced_message_views
 
     def remove_message_tracking(self, message_id: int) -> Optional[View]:
-        return self._synced_message_views.pop(message_id, None)
+        view = self._synced_message_views.pop(message_id, None)
+        if view is not None:
+            message_ids = self._view_message_ids.get(view.id)
+            if message_ids is not None:
+                message_ids.discard(message_id)
+                if not message_ids:
+                    del self._view_message_ids[view.id]
+        return view
 
     def update_from_message(self, message_id: int, components: List[ComponentPayload]):
         # pre-req: is_message_tracked == true
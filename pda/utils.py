@@ -53,6 +53,8 @@ from base64 import b64encode
 from bisect import bisect_left
 import datetime
 import functools
+import io
+import os
 from inspect import isawaitable as _isawaitable, signature as _signature
 from operator import attrgetter
 import json
@@ -508,6 +510,41 @@ def _parse_ratelimit_header(request: Any, *, use_clock: bool = False) -> float:
         return float(reset_after)
 
 
+async def _save_stream(
+    fp: Union[io.BufferedIOBase, os.PathLike, str, int],
+    stream: Callable[[int], AsyncIterator[bytes]],
+    *,
+    seek_begin: bool = True,
+    resume: bool = False,
+) -> int:
+    # Writes the chunks of stream(offset) to fp as they arrive. When resuming,
+    # the offset is the size of what fp already holds and the rest is appended.
+    written = 0
+    if isinstance(fp, int):
+        offset = os.lseek(fp, 0, os.SEEK_END) if resume else 0
+        async for chunk in stream(offset):
+            view = memoryview(chunk)
+            while view:
+                count = os.write(fp, view)
+                view = view[count:]
+                written += count
+        return written
+
+    if isinstance(fp, io.BufferedIOBase):
+        offset = fp.seek(0, io.SEEK_END) if resume else 0
+        async for chunk in stream(offset):
+            written += fp.write(chunk)
+        if seek_begin:
+            fp.seek(0)
+        return written
+
+    with open(fp, 'ab' if resume else 'wb') as f:
+        offset = f.seek(0, io.SEEK_END)
+        async for chunk in stream(offset):
+            written += f.write(chunk)
+    return written
+
+
 async def maybe_coroutine(f, *args, **kwargs):
     value = f(*args, **kwargs)
     if _isawaitable(value):
@@ -47,6 +47,7 @@ packages = [
     'pda.types',
     'pda.ui',
     'pda.webhook',
+    'pda.bench',
     'pda.ext.commands',
     'pda.ext.tasks',
 ]
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from multidict import CIMultiDict
+
+from pda.http import RatelimitBucket
+
+
+class FakeResponse:
+    def __init__(self, remaining: int, reset_after: float, limit: int = 4) -> None:
+        self.status = 200
+        self.headers = CIMultiDict(
+            {
+                'X-Ratelimit-Limit': str(limit),
+                'X-Ratelimit-Remaining': str(remaining),
+                'X-Ratelimit-Reset-After': str(reset_after),
+            }
+        )
+
+
+def test_window_passing_with_every_request_in_flight() -> None:
+    async def scenario() -> None:
+        bucket = RatelimitBucket(asyncio.get_running_loop())
+
+        # learn the limits from a first request
+        await bucket.acquire()
+        bucket.update(FakeResponse(3, 0.05))
+        bucket.release()
+
+        # use up the whole window and keep every request in flight past its reset
+        for _ in range(4):
+            await bucket.acquire()
+        await asyncio.sleep(0.1)
+
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        # the late responses all describe the window that already passed
+        passed = bucket._previous_reset
+        assert passed is not None
+        for remaining in range(3, -1, -1):
+            bucket.update(FakeResponse(remaining, passed - time.monotonic()))
+            bucket.release()
+
+        assert await asyncio.wait_for(waiter, 1) is bucket
+        assert bucket.outgoing == 1
+
+    asyncio.run(scenario())